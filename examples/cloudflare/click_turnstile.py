@@ -3,7 +3,7 @@ import logging
 
 from playwright.async_api import async_playwright
 
-from playwright_captcha import CaptchaType, ClickSolver, FrameworkType
+from playwright_captcha import CaptchaType, ClickSolver, FrameworkType, register_deep_selector_engine
 
 logging.basicConfig(
     level='INFO',
@@ -64,6 +64,9 @@ async def solve_turnstile() -> None:
 
     # usage with playwright (used in this example):
     async with async_playwright() as playwright:
+        # optional: lets the click solver use shadow-piercing Locators (with Playwright's auto-waiting)
+        await register_deep_selector_engine(playwright.selectors)
+
         browser = await playwright.chromium.launch(headless=False)
         page = await browser.new_page()
 
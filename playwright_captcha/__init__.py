@@ -11,6 +11,7 @@ from playwright_captcha.solvers.api.twocaptcha.twocaptcha_solver import TwoCaptc
 from playwright_captcha.solvers.base_solver import BaseSolver
 from .solvers.api.api_solver_base import ApiSolverBase
 from .solvers.click import ClickSolver
+from .solvers.click.common.selector_engine import register_deep_selector_engine
 from .types import CaptchaType, FrameworkType
 
 from .captchas import *  # register all components
@@ -21,5 +22,6 @@ __all__ = [
     'BaseSolver',
     'ClickSolver',
     'ApiSolverBase',
-    'TwoCaptchaSolver'
+    'TwoCaptchaSolver',
+    'register_deep_selector_engine'
 ]
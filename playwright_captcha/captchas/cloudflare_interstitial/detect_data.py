@@ -1,10 +1,11 @@
+import asyncio
 import logging
-import time
 from typing import Union
 
 from playwright.async_api import Page, Frame, ElementHandle
 
 from playwright_captcha.utils.exceptions import CaptchaAlreadySolvedException, CaptchaDataDetectionError
+from playwright_captcha.utils.intercepted_params import get_intercepted_params_watcher
 
 try:
     from patchright.async_api import Page as PatchrightPage
@@ -41,24 +42,43 @@ async def detect_interstitial_data(queryable: Union[Page, Frame, ElementHandle],
     intercepted_params = {}
     expected_content_selector = kwargs.get('expected_content_selector')
 
+    if getattr(page.add_init_script, 'is_camoufox_workaround', None) is True:
+        # use main world data for the add_init_script workaround (camoufox)
+        script = 'mw:window.cfParams'
+    else:
+        script = 'window.cfParams'
+
+    # the params are pushed by the intercept script the moment they exist (see utils/intercepted_params.py),
+    # window.cfParams is polled only if pushing is not available (patchright, or the solver wasn't prepared)
+    watcher = get_intercepted_params_watcher(page)
+    push_supported = watcher is not None and watcher.push_supported
+
     # wait for captcha to initialize (max 30 seconds)
     max_wait_time = 30
-    start_time = time.time()
-    while not intercepted_params and time.time() - start_time < max_wait_time:
+    check_interval = 1
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_wait_time
+    first_check = True
+    while not intercepted_params and loop.time() < deadline:
         # check if the challenge was already bypassed automatically
         if expected_content_selector and await page.locator(expected_content_selector).count() > 0:
             raise CaptchaAlreadySolvedException(
                 f'Challenge already bypassed — "{expected_content_selector}" is visible'
             )
 
-        if getattr(page.add_init_script, 'is_camoufox_workaround', None) is True:
-            # use main world data for the add_init_script workaround (camoufox)
-            script = 'mw:window.cfParams'
-        else:
-            script = 'window.cfParams'
-
-        intercepted_params = await page.evaluate(script)
-        await page.wait_for_timeout(1000)
+        # the page is read directly at least once, in case the params were intercepted before the watcher started
+        if watcher is not None:
+            intercepted_params = watcher.get_params()
+        if not intercepted_params and (first_check or not push_supported):
+            intercepted_params = await page.evaluate(script)
+        first_check = False
+
+        if not intercepted_params:
+            timeout = min(check_interval, max(deadline - loop.time(), 0))
+            if push_supported:
+                intercepted_params = await watcher.wait_params(timeout)
+            else:
+                await asyncio.sleep(timeout)
 
     if not intercepted_params:
         raise CaptchaDataDetectionError("Failed to detect Cloudflare interstitial data within the timeout period")
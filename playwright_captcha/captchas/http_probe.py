@@ -0,0 +1,131 @@
+import asyncio
+import logging
+import re
+from typing import Dict, List, Optional, Iterable, Mapping
+
+import httpx
+
+from playwright_captcha.captchas.recaptcha_v2.detect_data import RECAPTCHA_V2_SOURCE_PATTERNS
+from playwright_captcha.captchas.recaptcha_v3.detect_data import RECAPTCHA_V3_SOURCE_PATTERNS
+from playwright_captcha.solvers.click.cloudflare.utils.detection import CF_INTERSTITIAL_SOURCE_PATTERNS, \
+    CF_TURNSTILE_SOURCE_PATTERNS
+from playwright_captcha.types import CaptchaType
+from playwright_captcha.types.http_probe import HttpProbeResult
+from playwright_captcha.types.inventory import CAPTCHA_TYPES_PRIORITY
+from playwright_captcha.utils.challenge_monitor import classify_challenge_response
+
+logger = logging.getLogger(__name__)
+
+# raw HTML patterns of every captcha type (shared with the per-type detectors)
+CAPTCHA_SOURCE_PATTERNS: Dict[CaptchaType, List[str]] = {
+    CaptchaType.CLOUDFLARE_INTERSTITIAL: CF_INTERSTITIAL_SOURCE_PATTERNS,
+    CaptchaType.CLOUDFLARE_TURNSTILE: CF_TURNSTILE_SOURCE_PATTERNS,
+    CaptchaType.RECAPTCHA_V2: RECAPTCHA_V2_SOURCE_PATTERNS,
+    CaptchaType.RECAPTCHA_V3: RECAPTCHA_V3_SOURCE_PATTERNS,
+}
+
+# site keys in the widget containers and in the reCAPTCHA v3 script url
+SITE_KEY_PATTERNS = [
+    r'data-sitekey="([^"]+)"',
+    r'/recaptcha/(?:api|enterprise)\.js\?render=([\w-]{20,})',
+]
+
+# the markers are in the <head> or near the widgets, no need to download whole pages
+MAX_BODY_SIZE = 512 * 1024
+
+
+def analyze_http_response(url: str, status: int, headers: Mapping[str, str], body: str) -> HttpProbeResult:
+    """
+    Detect the captcha gating from the response status, headers and raw HTML
+
+    :param url: Requested URL
+    :param status: Response status code
+    :param headers: Response headers (case-insensitive mapping, e.g. httpx.Headers)
+    :param body: Response body (may be truncated)
+
+    :return: HttpProbeResult
+    """
+
+    result = HttpProbeResult(url=url, status=status, challenged=classify_challenge_response(status, headers))
+
+    detected = {captcha_type for captcha_type, patterns in CAPTCHA_SOURCE_PATTERNS.items()
+                if any(re.search(pattern, body) for pattern in patterns)}
+    if result.challenged:
+        detected.add(CaptchaType.CLOUDFLARE_INTERSTITIAL)
+    result.captcha_types = [captcha_type for captcha_type in CAPTCHA_TYPES_PRIORITY if captcha_type in detected]
+
+    for pattern in SITE_KEY_PATTERNS:
+        for site_key in re.findall(pattern, body):
+            if site_key not in result.site_keys:
+                result.site_keys.append(site_key)
+
+    return result
+
+
+async def probe_url(url: str, client: Optional[httpx.AsyncClient] = None, timeout: float = 10,
+                    headers: Optional[Dict[str, str]] = None) -> HttpProbeResult:
+    """
+    Fetch the URL without a browser and report whether Cloudflare or reCAPTCHA gating is present
+
+    :param url: URL to probe
+    :param client: httpx AsyncClient to reuse (a new one is created if not provided)
+    :param timeout: Request timeout in seconds
+    :param headers: Additional request headers (e.g. the User-Agent of the browsers used later)
+
+    :return: HttpProbeResult (with error set if the request failed)
+    """
+
+    if client is None:
+        async with httpx.AsyncClient(follow_redirects=True) as client:
+            return await probe_url(url, client, timeout, headers)
+
+    try:
+        async with client.stream('GET', url, headers=headers, timeout=timeout) as response:
+            body = b''
+            async for chunk in response.aiter_bytes():
+                body += chunk
+                if len(body) >= MAX_BODY_SIZE:
+                    break
+
+            text = body.decode(response.encoding or 'utf-8', errors='replace')
+            result = analyze_http_response(url, response.status_code, response.headers, text)
+    except httpx.HTTPError as e:
+        logger.debug(f'HTTP probe of {url} failed: {e}')
+        return HttpProbeResult(url=url, error=str(e) or type(e).__name__)
+
+    logger.debug(f'HTTP probe of {url}: status {result.status}, '
+                 f'captchas {[captcha_type.value for captcha_type in result.captcha_types] or "none"}')
+
+    return result
+
+
+async def probe_urls(urls: Iterable[str], concurrency: int = 10, client: Optional[httpx.AsyncClient] = None,
+                     timeout: float = 10, headers: Optional[Dict[str, str]] = None) -> List[HttpProbeResult]:
+    """
+    Probe a batch of URLs concurrently (at most `concurrency` requests at a time), so the browser pool
+    only gets the URLs that need it:
+
+        results = await probe_urls(urls)
+        browser_urls = [result.url for result in results if result.needs_browser]
+
+    :param urls: URLs to probe
+    :param concurrency: Maximum number of concurrent requests
+    :param client: httpx AsyncClient to reuse (a new one is created if not provided)
+    :param timeout: Request timeout in seconds
+    :param headers: Additional request headers (e.g. the User-Agent of the browsers used later)
+
+    :return: List of HttpProbeResult in the order of the URLs
+    """
+
+    if client is None:
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(follow_redirects=True, limits=limits) as client:
+            return await probe_urls(urls, concurrency, client, timeout, headers)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def probe(url: str) -> HttpProbeResult:
+        async with semaphore:
+            return await probe_url(url, client, timeout, headers)
+
+    return list(await asyncio.gather(*(probe(url) for url in urls)))
@@ -0,0 +1,110 @@
+import asyncio
+import logging
+from typing import Dict, List, Optional
+
+from playwright.async_api import Page, Frame
+
+from playwright_captcha.captchas.recaptcha_v2.detect_data import RECAPTCHA_V2_INDICATORS_SELECTORS, \
+    RECAPTCHA_V2_CONTAINER_SELECTORS
+from playwright_captcha.captchas.recaptcha_v3.detect_data import RECAPTCHA_V3_INDICATORS_SELECTORS
+from playwright_captcha.solvers.click.cloudflare.utils.detection import CF_INTERSTITIAL_INDICATORS_SELECTORS, \
+    CF_TURNSTILE_INDICATORS_SELECTORS, CF_TURNSTILE_CONTAINER_SELECTORS
+from playwright_captcha.types import CaptchaType
+from playwright_captcha.types.inventory import CaptchaInventory, DetectedCaptcha
+from playwright_captcha.utils.js_script import load_js_script
+
+logger = logging.getLogger(__name__)
+
+# indicator and widget container selectors of every captcha type (shared with the per-type detectors)
+CAPTCHA_INDICATORS: Dict[CaptchaType, Dict[str, List[str]]] = {
+    CaptchaType.CLOUDFLARE_INTERSTITIAL: {
+        'indicators': CF_INTERSTITIAL_INDICATORS_SELECTORS,
+        'containers': [],
+    },
+    CaptchaType.CLOUDFLARE_TURNSTILE: {
+        'indicators': CF_TURNSTILE_INDICATORS_SELECTORS,
+        'containers': CF_TURNSTILE_CONTAINER_SELECTORS,
+    },
+    CaptchaType.RECAPTCHA_V2: {
+        'indicators': RECAPTCHA_V2_INDICATORS_SELECTORS,
+        'containers': RECAPTCHA_V2_CONTAINER_SELECTORS,
+    },
+    CaptchaType.RECAPTCHA_V3: {
+        'indicators': RECAPTCHA_V3_INDICATORS_SELECTORS,
+        'containers': [],
+    },
+}
+
+# captcha types that can only occupy the whole page (probed in the main frame only)
+WHOLE_PAGE_CAPTCHA_TYPES = [CaptchaType.CLOUDFLARE_INTERSTITIAL]
+
+# frames of the captcha widgets themselves - their parent documents are probed instead
+WIDGET_FRAME_URL_MARKERS = [
+    'challenges.cloudflare.com/',
+    '/recaptcha/api2/',
+    '/recaptcha/enterprise/',
+]
+
+
+async def _probe_frame(frame: Frame, probe_script: str, captcha_types: List[CaptchaType]) -> List[DetectedCaptcha]:
+    """
+    Run the inventory probe in a single frame (one protocol round-trip)
+
+    :param frame: Frame to probe
+    :param probe_script: JavaScript probe
+    :param captcha_types: Captcha types to look for
+
+    :return: List of captchas detected in the frame
+    """
+
+    indicators = {captcha_type.value: CAPTCHA_INDICATORS[captcha_type] for captcha_type in captcha_types}
+
+    try:
+        found = await frame.evaluate(probe_script, indicators)
+    except Exception as e:
+        # e.g. the frame navigated or detached while probing
+        logger.debug(f'Failed to probe frame {frame.url} for captchas: {e}')
+        return []
+
+    return [
+        DetectedCaptcha(
+            captcha_type=CaptchaType(item['captchaType']),
+            frame=frame,
+            container=frame.locator(item['selector']).nth(item['index']) if item['selector'] else None,
+            site_key=item['siteKey'],
+            action=item['action'],
+        )
+        for item in found
+    ]
+
+
+async def detect_captchas(page: Page, captcha_types: Optional[List[CaptchaType]] = None) -> CaptchaInventory:
+    """
+    Build the inventory of the captchas present on the page: runs one probe per frame, concurrently in all frames
+
+    :param page: Playwright Page
+    :param captcha_types: Captcha types to look for (all supported types by default)
+
+    :return: CaptchaInventory, which is falsy if no captcha was found
+    """
+
+    captcha_types = captcha_types or list(CAPTCHA_INDICATORS)
+    probe_script = await load_js_script('probes/captchaInventory.js')
+
+    tasks = []
+    for frame in page.frames:
+        if frame.is_detached() or any(marker in frame.url for marker in WIDGET_FRAME_URL_MARKERS):
+            continue
+
+        frame_captcha_types = captcha_types if frame == page.main_frame else \
+            [captcha_type for captcha_type in captcha_types if captcha_type not in WHOLE_PAGE_CAPTCHA_TYPES]
+        if frame_captcha_types:
+            tasks.append(_probe_frame(frame, probe_script, frame_captcha_types))
+
+    inventory = CaptchaInventory()
+    for frame_captchas in await asyncio.gather(*tasks):
+        inventory.captchas.extend(frame_captchas)
+
+    logger.debug(f'Detected captchas: {[captcha_type.value for captcha_type in inventory.types] or "none"}')
+
+    return inventory
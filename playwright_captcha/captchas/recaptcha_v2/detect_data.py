@@ -8,6 +8,23 @@ from playwright_captcha.utils.regex_helpers import search_content_by_regex
 
 logger = logging.getLogger(__name__)
 
+# selectors for detecting reCAPTCHA v2 (checkbox widget)
+RECAPTCHA_V2_INDICATORS_SELECTORS = [
+    'iframe[src*="/recaptcha/api2/anchor"]:not([src*="size=invisible"])',
+    'iframe[src*="/recaptcha/enterprise/anchor"]:not([src*="size=invisible"])',
+]
+
+# selectors of reCAPTCHA v2 widget containers
+RECAPTCHA_V2_CONTAINER_SELECTORS = [
+    '.g-recaptcha',
+]
+
+# regex patterns for detecting reCAPTCHA v2 in the raw HTML (the anchor iframe is only created by the script)
+RECAPTCHA_V2_SOURCE_PATTERNS = [
+    r'class="[^"]*\bg-recaptcha\b',
+    r'grecaptcha(\.enterprise)?\.render\(',
+]
+
 
 async def detect_recaptcha_v2_data(queryable: Union[Page, Frame, ElementHandle], **kwargs) -> dict:
     """
@@ -9,6 +9,18 @@ from playwright_captcha.utils.regex_helpers import search_content_by_regex
 
 logger = logging.getLogger(__name__)
 
+# selectors for detecting reCAPTCHA v3 (invisible, no widget container)
+RECAPTCHA_V3_INDICATORS_SELECTORS = [
+    'script[src*="/recaptcha/api.js?render="]:not([src*="render=explicit"])',
+    'script[src*="/recaptcha/enterprise.js?render="]:not([src*="render=explicit"])',
+    'iframe[title="reCAPTCHA"][src*="size=invisible"]',
+]
+
+# regex patterns for detecting reCAPTCHA v3 in the raw HTML
+RECAPTCHA_V3_SOURCE_PATTERNS = [
+    r'/recaptcha/(api|enterprise)\.js\?render=(?!explicit)',
+]
+
 
 async def detect_recaptcha_v3_data(queryable: Union[Page, Frame, ElementHandle], **kwargs) -> dict:
     """
@@ -0,0 +1,24 @@
+from playwright_captcha.clearance.base import ClearanceStore
+from playwright_captcha.clearance.cookies import get_clearance_key, extract_clearance, apply_clearance, \
+    CF_CLEARANCE_COOKIE, DEFAULT_CLEARANCE_TTL
+from playwright_captcha.clearance.handoff import SessionHandoff, export_session, is_challenge_response
+from playwright_captcha.clearance.keeper import ClearanceKeeper
+from playwright_captcha.clearance.memory import MemoryClearanceStore
+from playwright_captcha.clearance.single_flight import SingleFlight
+from playwright_captcha.clearance.sqlite import SqliteClearanceStore
+
+__all__ = [
+    'ClearanceStore',
+    'MemoryClearanceStore',
+    'SqliteClearanceStore',
+    'SingleFlight',
+    'ClearanceKeeper',
+    'SessionHandoff',
+    'export_session',
+    'is_challenge_response',
+    'get_clearance_key',
+    'extract_clearance',
+    'apply_clearance',
+    'CF_CLEARANCE_COOKIE',
+    'DEFAULT_CLEARANCE_TTL'
+]
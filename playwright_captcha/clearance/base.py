@@ -0,0 +1,56 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from playwright_captcha.clearance.cookies import DEFAULT_CLEARANCE_TTL
+from playwright_captcha.types.clearance import ClearanceKey, Clearance
+
+
+class ClearanceStore(ABC):
+    """Base class for Cloudflare clearance stores (backends)"""
+
+    def __init__(self, ttl: float = DEFAULT_CLEARANCE_TTL):
+        """
+        Initialize the store
+
+        :param ttl: Maximum time in seconds to keep a clearance (capped by the cookie expiry)
+        """
+
+        self.ttl = ttl
+
+    @abstractmethod
+    async def get(self, key: ClearanceKey) -> Optional[Clearance]:
+        """
+        Get the valid (not expired) clearance
+
+        :param key: Clearance key (domain, user agent, proxy)
+
+        :return: Clearance, None if there is no valid one
+        """
+
+        raise NotImplementedError('This method must be implemented in subclasses')
+
+    @abstractmethod
+    async def set(self, key: ClearanceKey, clearance: Clearance) -> None:
+        """
+        Store the clearance (replaces the previous one)
+
+        :param key: Clearance key (domain, user agent, proxy)
+        :param clearance: Clearance to store
+        """
+
+        raise NotImplementedError('This method must be implemented in subclasses')
+
+    @abstractmethod
+    async def delete(self, key: ClearanceKey) -> None:
+        """
+        Delete the clearance (e.g. rejected by Cloudflare before it expired)
+
+        :param key: Clearance key (domain, user agent, proxy)
+        """
+
+        raise NotImplementedError('This method must be implemented in subclasses')
+
+    async def close(self) -> None:
+        """Release the backend resources"""
+
+        pass
@@ -0,0 +1,77 @@
+import logging
+import time
+from typing import Optional
+from urllib.parse import urlparse
+
+from playwright.async_api import Page, BrowserContext
+
+from playwright_captcha.types.clearance import ClearanceKey, Clearance
+
+logger = logging.getLogger(__name__)
+
+CF_CLEARANCE_COOKIE = 'cf_clearance'
+
+# cloudflare's default challenge passage (the cookie itself usually expires much later than the clearance)
+DEFAULT_CLEARANCE_TTL = 30 * 60
+
+
+def get_clearance_domain(url: str) -> str:
+    """
+    Get the domain the clearance is bound to
+
+    :param url: Page URL
+
+    :return: Lower-case host name
+    """
+
+    return (urlparse(url).hostname or '').lower()
+
+
+async def get_clearance_key(page: Page, proxy: Optional[str] = None, url: Optional[str] = None) -> ClearanceKey:
+    """
+    Build the clearance key of the page (one round-trip to read the user agent)
+
+    :param page: Playwright Page
+    :param proxy: Proxy the page's context uses (None if direct)
+    :param url: URL to get the domain from (the page's URL by default)
+
+    :return: ClearanceKey
+    """
+
+    user_agent = await page.evaluate('navigator.userAgent')
+
+    return ClearanceKey(domain=get_clearance_domain(url or page.url), user_agent=user_agent, proxy=proxy)
+
+
+async def extract_clearance(context: BrowserContext, url: str, ttl: float = DEFAULT_CLEARANCE_TTL) -> Optional[Clearance]:
+    """
+    Get the clearance cookies the context received for the URL
+
+    :param context: Playwright BrowserContext
+    :param url: URL of the solved page
+    :param ttl: Maximum time in seconds to keep the clearance (capped by the cookie expiry)
+
+    :return: Clearance, None if the context has no clearance cookie for the URL
+    """
+
+    cookies = [cookie for cookie in await context.cookies(url) if cookie['name'] == CF_CLEARANCE_COOKIE]
+    if not cookies:
+        return None
+
+    expires_at = time.time() + ttl
+    for cookie in cookies:
+        if cookie.get('expires', -1) > 0:  # -1 for session cookies
+            expires_at = min(expires_at, cookie['expires'])
+
+    return Clearance(cookies=cookies, expires_at=expires_at)
+
+
+async def apply_clearance(context: BrowserContext, clearance: Clearance) -> None:
+    """
+    Add the clearance cookies to the context
+
+    :param context: Playwright BrowserContext
+    :param clearance: Clearance to apply
+    """
+
+    await context.add_cookies(clearance.cookies)
@@ -0,0 +1,233 @@
+import logging
+import weakref
+from typing import Optional, Mapping, Dict, Any, List
+from urllib.parse import urlparse
+
+import httpx
+from playwright.async_api import Page, APIRequest, APIRequestContext, APIResponse
+
+from playwright_captcha.types import CaptchaType
+from playwright_captcha.types.session import BrowserSession
+from playwright_captcha.utils.challenge_monitor import classify_challenge_response
+
+logger = logging.getLogger(__name__)
+
+# the headers the browser sends with every request (besides cookies) that a plain client has to repeat to look the same
+BROWSER_HEADERS_JS = """
+() => {
+    const headers = {'user-agent': navigator.userAgent};
+
+    // same format as chrome: "en-US,en;q=0.9"
+    const languages = navigator.languages && navigator.languages.length ? navigator.languages : [navigator.language];
+    headers['accept-language'] = languages
+        .map((language, index) => index === 0 ? language : `${language};q=${Math.max(1 - index / 10, 0.1).toFixed(1)}`)
+        .join(',');
+
+    // client hints (chromium only)
+    if (navigator.userAgentData) {
+        headers['sec-ch-ua'] = navigator.userAgentData.brands
+            .map((brand) => `"${brand.brand}";v="${brand.version}"`)
+            .join(', ');
+        headers['sec-ch-ua-mobile'] = navigator.userAgentData.mobile ? '?1' : '?0';
+        headers['sec-ch-ua-platform'] = `"${navigator.userAgentData.platform}"`;
+    }
+
+    return headers;
+}
+"""
+
+
+async def export_session(page: Page, proxy: Optional[str] = None) -> BrowserSession:
+    """
+    Export the page's session after the captcha is solved: cookies of its context (including cf_clearance),
+    the exact user agent and the headers the browser sends
+
+    :param page: Playwright Page
+    :param proxy: Proxy the page's context uses (cf_clearance is bound to the IP), None if direct
+
+    :return: BrowserSession
+    """
+
+    headers = await page.evaluate(BROWSER_HEADERS_JS)
+    cookies = await page.context.cookies()
+
+    return BrowserSession(cookies=cookies, user_agent=headers['user-agent'], headers=headers, proxy=proxy)
+
+
+def is_challenge_response(status: int, headers: Mapping[str, str], body: Optional[str] = None) -> bool:
+    """
+    Check if an HTTP response is a Cloudflare challenge (the session was re-challenged and needs a browser solve)
+
+    :param status: Response status code
+    :param headers: Response headers (case-insensitive mapping or lower-case names)
+    :param body: Response body, needed to tell a 403/503 challenge without the cf-mitigated header from a plain error
+
+    :return: True if it's a Cloudflare challenge
+    """
+
+    challenged = classify_challenge_response(status, headers)
+    if challenged is not None or body is None:
+        return bool(challenged)
+
+    from playwright_captcha.captchas.http_probe import analyze_http_response
+
+    return CaptchaType.CLOUDFLARE_INTERSTITIAL in analyze_http_response('', status, headers, body).captcha_types
+
+
+def _get_playwright_proxy(proxy: str) -> Dict[str, str]:
+    """Convert a proxy URL to the Playwright proxy settings (credentials are passed separately)"""
+
+    parsed = urlparse(proxy)
+    settings = {'server': f'{parsed.scheme}://{parsed.hostname}' + (f':{parsed.port}' if parsed.port else '')}
+    if parsed.username:
+        settings['username'] = parsed.username
+    if parsed.password:
+        settings['password'] = parsed.password
+
+    return settings
+
+
+class SessionHandoff:
+    """
+    Continues a browser session solved by a solver with lightweight HTTP clients (httpx or Playwright
+    APIRequestContext), and flags the responses that got re-challenged, so the page can be solved again:
+
+        handoff = await SessionHandoff.from_page(page, proxy=proxy_url)
+        async with handoff.create_client() as client:
+            response = await client.get(url)
+            if handoff.needs_resolve:
+                await solver.solve_captcha(page, CaptchaType.CLOUDFLARE_INTERSTITIAL)
+                await handoff.refresh(page)
+    """
+
+    def __init__(self, session: BrowserSession):
+        """
+        Initialize the handoff
+
+        :param session: Exported browser session (see export_session())
+        """
+
+        self.session = session
+        self.challenged_urls: List[str] = []
+
+        self._clients: 'weakref.WeakSet[httpx.AsyncClient]' = weakref.WeakSet()
+
+    @classmethod
+    async def from_page(cls, page: Page, proxy: Optional[str] = None) -> 'SessionHandoff':
+        """
+        Export the page's session and create the handoff
+
+        :param page: Playwright Page
+        :param proxy: Proxy the page's context uses (cf_clearance is bound to the IP), None if direct
+
+        :return: SessionHandoff
+        """
+
+        return cls(await export_session(page, proxy))
+
+    @property
+    def needs_resolve(self) -> bool:
+        """True if a response was re-challenged since the session was exported"""
+
+        return bool(self.challenged_urls)
+
+    def _flag(self, url: str) -> None:
+        """Flag the re-challenged response"""
+
+        logger.info(f'Response from {url} is a Cloudflare challenge, the session needs to be solved again')
+        self.challenged_urls.append(url)
+
+    def _set_client_cookies(self, client: httpx.AsyncClient) -> None:
+        """Copy the session cookies into the client's cookie jar"""
+
+        for cookie in self.session.cookies:
+            client.cookies.set(cookie['name'], cookie['value'], domain=cookie['domain'], path=cookie.get('path', '/'))
+
+    async def _on_response(self, response: httpx.Response) -> None:
+        """httpx response hook flagging the re-challenged responses"""
+
+        body = None
+        if classify_challenge_response(response.status_code, response.headers) is None:
+            # 403/503 without the cf-mitigated header - the body tells (challenge pages are small)
+            await response.aread()
+            body = response.text
+
+        if is_challenge_response(response.status_code, response.headers, body):
+            self._flag(str(response.url))
+
+    def create_client(self, **kwargs: Any) -> httpx.AsyncClient:
+        """
+        Create an httpx AsyncClient with the session's cookies, headers and proxy
+
+        :param kwargs: Additional httpx.AsyncClient parameters (e.g. timeout, limits, http2)
+
+        :return: httpx AsyncClient (close it with `async with` or `await client.aclose()`)
+        """
+
+        headers = {**self.session.headers, **kwargs.pop('headers', {})}
+        event_hooks = kwargs.pop('event_hooks', {})
+        event_hooks = {**event_hooks, 'response': [*event_hooks.get('response', []), self._on_response]}
+        if self.session.proxy:
+            kwargs.setdefault('proxy', self.session.proxy)
+        kwargs.setdefault('follow_redirects', True)
+
+        client = httpx.AsyncClient(headers=headers, event_hooks=event_hooks, **kwargs)
+        self._set_client_cookies(client)
+        self._clients.add(client)
+
+        return client
+
+    async def create_request_context(self, request: APIRequest, **kwargs: Any) -> APIRequestContext:
+        """
+        Create a Playwright APIRequestContext with the session's cookies, headers and proxy, which doesn't need
+        the browser (check its responses with self.check_response())
+
+        :param request: Playwright APIRequest (playwright.request)
+        :param kwargs: Additional APIRequest.new_context() parameters (e.g. base_url, timeout)
+
+        :return: APIRequestContext (close it with `await request_context.dispose()`)
+        """
+
+        if self.session.proxy:
+            kwargs.setdefault('proxy', _get_playwright_proxy(self.session.proxy))
+
+        return await request.new_context(
+            user_agent=self.session.user_agent,
+            extra_http_headers={**self.session.headers, **kwargs.pop('extra_http_headers', {})},
+            storage_state={'cookies': self.session.cookies, 'origins': []},
+            **kwargs
+        )
+
+    async def check_response(self, response: APIResponse) -> bool:
+        """
+        Check if an APIRequestContext response was re-challenged and flag it
+
+        :param response: Playwright APIResponse
+
+        :return: True if it's a Cloudflare challenge
+        """
+
+        body = None
+        if classify_challenge_response(response.status, response.headers) is None:
+            body = await response.text()
+
+        challenged = is_challenge_response(response.status, response.headers, body)
+        if challenged:
+            self._flag(response.url)
+
+        return challenged
+
+    async def refresh(self, page: Page) -> None:
+        """
+        Re-export the session after the page was solved again, update the cookies of the created httpx clients
+        and clear the re-challenge flag (APIRequestContexts have to be created again)
+
+        :param page: Playwright Page
+        """
+
+        self.session = await export_session(page, self.session.proxy)
+        self.challenged_urls.clear()
+
+        for client in list(self._clients):
+            if not client.is_closed:
+                self._set_client_cookies(client)
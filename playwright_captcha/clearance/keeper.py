@@ -0,0 +1,265 @@
+import asyncio
+import logging
+import time
+import weakref
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Set, Tuple
+
+from playwright.async_api import BrowserContext, Page
+
+from playwright_captcha.clearance.base import ClearanceStore
+from playwright_captcha.clearance.cookies import CF_CLEARANCE_COOKIE, DEFAULT_CLEARANCE_TTL, apply_clearance, \
+    extract_clearance, get_clearance_domain, get_clearance_key
+from playwright_captcha.types import CaptchaType
+from playwright_captcha.types.clearance import Clearance
+
+if TYPE_CHECKING:
+    from playwright_captcha.solvers.base_solver import BaseSolver
+
+logger = logging.getLogger(__name__)
+
+
+class ClearanceKeeper:
+    """
+    Keeps the Cloudflare clearances of hot domains fresh in the background: re-solves the interstitial in a dedicated
+    warm page shortly before the clearance expires and pushes the new cookies into the active contexts,
+    so their requests never hit the challenge.
+    The warm context must be dedicated to the keeper (its clearance is dropped before every re-solve) and
+    the active contexts must use the same user agent and proxy as it (the clearance is bound to them)
+    """
+
+    def __init__(self, context: BrowserContext, solver_factory: Callable[[Page], 'BaseSolver'],
+                 refresh_before: float = 5 * 60, max_concurrency: int = 2, retry_delay: float = 30,
+                 ttl: float = DEFAULT_CLEARANCE_TTL, clearance_store: Optional[ClearanceStore] = None,
+                 proxy: Optional[str] = None):
+        """
+        Initialize the keeper
+
+        :param context: Playwright BrowserContext to open the warm pages in, not used by any active pages
+        :param solver_factory: Function creating an (unprepared) solver without a clearance store for a warm page,
+                               e.g. lambda page: ClickSolver(framework=framework, page=page)
+        :param refresh_before: Time in seconds before the clearance expiry to refresh it
+        :param max_concurrency: Maximum number of concurrent refreshes
+        :param retry_delay: Delay in seconds before retrying a failed refresh
+        :param ttl: Maximum time in seconds to consider a clearance valid (capped by the cookie expiry)
+        :param clearance_store: Store to also save the fresh clearances to, for other processes (None to disable)
+        :param proxy: Proxy the warm context uses (the clearance store key), None if direct
+        """
+
+        self.context = context
+        self.solver_factory = solver_factory
+        self.refresh_before = refresh_before
+        self.retry_delay = retry_delay
+        self.ttl = ttl
+        self.clearance_store = clearance_store
+        self.proxy = proxy
+
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._urls: Dict[str, str] = {}  # domain -> URL to solve the challenge at
+        self._clearances: Dict[str, Clearance] = {}  # domain -> latest clearance
+        self._tasks: Dict[str, asyncio.Task] = {}  # domain -> refresh loop
+        self._warm_pages: Dict[str, Tuple[Page, 'BaseSolver']] = {}  # domain -> warm page and its solver
+        self._contexts: 'weakref.WeakSet[BrowserContext]' = weakref.WeakSet()
+        self._push_tasks: Set[asyncio.Task] = set()  # pushes of the current clearances into the added contexts
+        self._running = False
+
+    # context manager
+    async def __aenter__(self):
+        """Async context manager entry"""
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit with cleanup"""
+        await self.stop()
+
+    def add_domain(self, url: str) -> None:
+        """
+        Keep the clearance of the URL's domain fresh
+
+        :param url: URL of the domain to solve the challenge at
+        """
+
+        domain = get_clearance_domain(url)
+        self._urls[domain] = url
+
+        if self._running and domain not in self._tasks:
+            self._tasks[domain] = asyncio.get_running_loop().create_task(self._keep(domain))
+
+    async def remove_domain(self, url: str) -> None:
+        """
+        Stop refreshing the clearance of the URL's domain
+
+        :param url: URL of the domain
+        """
+
+        domain = get_clearance_domain(url)
+        self._urls.pop(domain, None)
+        self._clearances.pop(domain, None)
+
+        task = self._tasks.pop(domain, None)
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        await self._close_warm_page(domain)
+
+    def add_context(self, context: BrowserContext) -> None:
+        """
+        Push the fresh clearances into the context (including the ones already obtained)
+
+        :param context: Playwright BrowserContext
+
+        :raises ValueError: If the context is the keeper's warm context
+        """
+
+        if context is self.context:
+            raise ValueError('The warm context can not be an active context, its clearance is dropped on refresh')
+
+        self._contexts.add(context)
+
+        for clearance in self._clearances.values():
+            if not clearance.is_expired():
+                task = asyncio.get_running_loop().create_task(self._push(context, clearance))
+                self._push_tasks.add(task)
+                task.add_done_callback(self._push_tasks.discard)
+
+    def remove_context(self, context: BrowserContext) -> None:
+        """
+        Stop pushing the clearances into the context (closed contexts are dropped automatically)
+
+        :param context: Playwright BrowserContext
+        """
+
+        self._contexts.discard(context)
+
+    def get_clearance(self, url: str) -> Optional[Clearance]:
+        """
+        Get the latest clearance of the URL's domain
+
+        :param url: URL of the domain
+
+        :return: Clearance, None if there is no valid one
+        """
+
+        clearance = self._clearances.get(get_clearance_domain(url))
+        if clearance is None or clearance.is_expired():
+            return None
+
+        return clearance
+
+    async def start(self) -> None:
+        """Start the refresh loops of the added domains"""
+
+        self._running = True
+        for domain in self._urls:
+            if domain not in self._tasks:
+                self._tasks[domain] = asyncio.get_running_loop().create_task(self._keep(domain))
+
+    async def stop(self) -> None:
+        """Stop the refresh loops and close the warm pages"""
+
+        self._running = False
+
+        tasks = [*self._tasks.values(), *self._push_tasks]
+        self._tasks.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        for domain in list(self._warm_pages):
+            await self._close_warm_page(domain)
+
+    async def _keep(self, domain: str) -> None:
+        """Refresh loop of the domain: refresh, then sleep until shortly before the clearance expires"""
+
+        while True:
+            try:
+                clearance = await self.refresh(self._urls[domain])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f'Failed to refresh clearance for {domain}: {e}')
+                clearance = None
+
+            if clearance is None:
+                delay = self.retry_delay
+            else:
+                delay = max(clearance.expires_at - self.refresh_before - time.time(), self.retry_delay)
+
+            logger.debug(f'Next clearance refresh for {domain} in {delay:.0f} seconds')
+            await asyncio.sleep(delay)
+
+    async def refresh(self, url: str) -> Optional[Clearance]:
+        """
+        Solve the Cloudflare interstitial of the URL in the warm page now and push the clearance into the contexts
+
+        :param url: URL to solve the challenge at
+
+        :return: New clearance, None if no clearance cookie was received
+        """
+
+        domain = get_clearance_domain(url)
+
+        async with self._semaphore:
+            page, solver = await self._get_warm_page(domain)
+
+            # drop the current clearance, so the page gets the challenge to solve
+            for cookie in await self.context.cookies(url):
+                if cookie['name'] == CF_CLEARANCE_COOKIE:
+                    await self.context.clear_cookies(name=CF_CLEARANCE_COOKIE, domain=cookie['domain'])
+
+            logger.info(f'Refreshing clearance for {domain}')
+            await page.goto(url)
+            await solver.solve_captcha(captcha_container=page, captcha_type=CaptchaType.CLOUDFLARE_INTERSTITIAL)
+
+            clearance = await extract_clearance(self.context, url, self.ttl)
+            if clearance is None:
+                logger.warning(f'No clearance cookie received for {domain}')
+                return None
+
+            self._clearances[domain] = clearance
+
+            if self.clearance_store is not None:
+                await self.clearance_store.set(await get_clearance_key(page, self.proxy, url), clearance)
+
+        await asyncio.gather(*(self._push(context, clearance) for context in list(self._contexts)))
+        logger.info(f'Refreshed clearance for {domain}, valid for {clearance.expires_at - time.time():.0f} seconds')
+
+        return clearance
+
+    async def _push(self, context: BrowserContext, clearance: Clearance) -> None:
+        """Add the clearance cookies to the context, dropping the context if it's closed"""
+
+        try:
+            await apply_clearance(context, clearance)
+        except Exception as e:
+            logger.debug(f'Failed to push clearance into a context, dropping it: {e}')
+            self._contexts.discard(context)
+
+    async def _get_warm_page(self, domain: str) -> Tuple[Page, 'BaseSolver']:
+        """Get the warm page of the domain, opening and preparing it on first use (or after it was closed)"""
+
+        warm_page = self._warm_pages.get(domain)
+        if warm_page is not None and not warm_page[0].is_closed():
+            return warm_page
+
+        page = await self.context.new_page()
+        solver = self.solver_factory(page)
+        await solver.prepare()
+
+        warm_page = self._warm_pages[domain] = (page, solver)
+        return warm_page
+
+    async def _close_warm_page(self, domain: str) -> None:
+        """Clean up the domain's warm page solver and close the page"""
+
+        warm_page = self._warm_pages.pop(domain, None)
+        if warm_page is None:
+            return
+
+        page, solver = warm_page
+        try:
+            await solver.cleanup()
+            await page.close()
+        except Exception as e:
+            logger.debug(f'Failed to close warm page of {domain}: {e}')
@@ -0,0 +1,37 @@
+from typing import Optional, Dict
+
+from playwright_captcha.clearance.base import ClearanceStore
+from playwright_captcha.clearance.cookies import DEFAULT_CLEARANCE_TTL
+from playwright_captcha.types.clearance import ClearanceKey, Clearance
+
+
+class MemoryClearanceStore(ClearanceStore):
+    """In-memory clearance store, shared by all contexts of the process"""
+
+    def __init__(self, ttl: float = DEFAULT_CLEARANCE_TTL):
+        """
+        Initialize the store
+
+        :param ttl: Maximum time in seconds to keep a clearance (capped by the cookie expiry)
+        """
+
+        super().__init__(ttl=ttl)
+
+        self._clearances: Dict[ClearanceKey, Clearance] = {}
+
+    async def get(self, key: ClearanceKey) -> Optional[Clearance]:
+        clearance = self._clearances.get(key)
+        if clearance is None:
+            return None
+
+        if clearance.is_expired():
+            del self._clearances[key]
+            return None
+
+        return clearance
+
+    async def set(self, key: ClearanceKey, clearance: Clearance) -> None:
+        self._clearances[key] = clearance
+
+    async def delete(self, key: ClearanceKey) -> None:
+        self._clearances.pop(key, None)
@@ -0,0 +1,93 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from playwright_captcha.utils.exceptions import CaptchaSolvingCancelledError
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent solves of the same key (e.g. ClearanceKey - domain, user agent, proxy):
+    the first caller (leader) runs the solve, the others (followers) await its result instead of solving again.
+    Share one instance between all solvers of the pool
+    """
+
+    def __init__(self, timeout: Optional[float] = 180):
+        """
+        Initialize the single-flight group
+
+        :param timeout: Maximum time in seconds a solve may take before it's cancelled for everyone
+                        (so one stuck leader can't block the followers), None for no limit
+        """
+
+        self.timeout = timeout
+
+        self._flights: Dict[Hashable, asyncio.Task] = {}
+
+    async def _run(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Run the solve of the flight, with the group's timeout"""
+
+        try:
+            return await asyncio.wait_for(func(), self.timeout)
+        finally:
+            if self._flights.get(key) is asyncio.current_task():
+                del self._flights[key]
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Run the solve once per key: starts it if no solve of the key is in flight, joins the running one otherwise
+
+        :param key: Flight key
+        :param func: Coroutine function running the solve
+
+        :return: Tuple (result of the solve, True if this caller started it)
+
+        :raises asyncio.TimeoutError: If the solve timed out
+        :raises CaptchaSolvingCancelledError: If the solve was cancelled by self.cancel()
+        :raises Exception: The error of the solve
+        """
+
+        flight = self._flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = self._flights[key] = asyncio.get_running_loop().create_task(self._run(key, func))
+        else:
+            logger.info(f'Solve of {key} is already in flight, waiting for its result')
+
+        try:
+            # shield, so a caller being cancelled doesn't cancel the solve the others are waiting for
+            return await asyncio.shield(flight), leader
+        except asyncio.CancelledError:
+            if flight.cancelled():
+                # cancelled by self.cancel() - report it as an error, not as the caller's own cancellation
+                raise CaptchaSolvingCancelledError(f'Shared solve of {key} was cancelled') from None
+            raise
+
+    def in_flight(self, key: Hashable) -> bool:
+        """
+        Check if a solve of the key is running
+
+        :param key: Flight key
+
+        :return: True if a solve is in flight
+        """
+
+        return key in self._flights
+
+    def cancel(self, key: Hashable) -> bool:
+        """
+        Cancel the in-flight solve of the key, its leader and followers get CaptchaSolvingCancelledError
+
+        :param key: Flight key
+
+        :return: True if a solve was in flight
+        """
+
+        flight = self._flights.pop(key, None)
+        if flight is None:
+            return False
+
+        flight.cancel()
+        return True
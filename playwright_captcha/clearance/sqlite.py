@@ -0,0 +1,111 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import time
+from typing import Optional, Union
+
+from playwright_captcha.clearance.base import ClearanceStore
+from playwright_captcha.clearance.cookies import DEFAULT_CLEARANCE_TTL
+from playwright_captcha.types.clearance import ClearanceKey, Clearance
+
+logger = logging.getLogger(__name__)
+
+CREATE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS clearances (
+    domain TEXT NOT NULL,
+    user_agent TEXT NOT NULL,
+    proxy TEXT NOT NULL,
+    cookies TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (domain, user_agent, proxy)
+)
+"""
+
+
+class SqliteClearanceStore(ClearanceStore):
+    """
+    SQLite file clearance store, shared by all worker processes using the same file.
+    Queries run in the default executor, so they don't block the event loop
+    """
+
+    def __init__(self, path: Union[str, os.PathLike], ttl: float = DEFAULT_CLEARANCE_TTL, busy_timeout: float = 10):
+        """
+        Initialize the store (the database file is created on first use)
+
+        :param path: Path to the SQLite database file
+        :param ttl: Maximum time in seconds to keep a clearance (capped by the cookie expiry)
+        :param busy_timeout: Time in seconds to wait for other processes' locks
+        """
+
+        super().__init__(ttl=ttl)
+
+        self.path = os.fspath(path)
+        self.busy_timeout = busy_timeout
+
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection (one per query, so it's safe across threads and processes)"""
+
+        connection = sqlite3.connect(self.path, timeout=self.busy_timeout)
+        if not self._initialized:
+            # WAL lets readers in other processes work while a writer holds the lock
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(CREATE_TABLE_SQL)
+            connection.commit()
+            self._initialized = True
+
+        return connection
+
+    def _get(self, key: ClearanceKey) -> Optional[Clearance]:
+        connection = self._connect()
+        try:
+            row = connection.execute(
+                'SELECT cookies, expires_at, created_at FROM clearances '
+                'WHERE domain = ? AND user_agent = ? AND proxy = ? AND expires_at > ?',
+                (key.domain, key.user_agent, key.proxy or '', time.time())
+            ).fetchone()
+        finally:
+            connection.close()
+
+        if row is None:
+            return None
+
+        cookies, expires_at, created_at = row
+        return Clearance(cookies=json.loads(cookies), expires_at=expires_at, created_at=created_at)
+
+    def _set(self, key: ClearanceKey, clearance: Clearance) -> None:
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute(
+                    'INSERT OR REPLACE INTO clearances (domain, user_agent, proxy, cookies, expires_at, created_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    (key.domain, key.user_agent, key.proxy or '', json.dumps(clearance.cookies),
+                     clearance.expires_at, clearance.created_at)
+                )
+                # drop the expired entries while holding the write lock anyway
+                connection.execute('DELETE FROM clearances WHERE expires_at <= ?', (time.time(),))
+        finally:
+            connection.close()
+
+    def _delete(self, key: ClearanceKey) -> None:
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute('DELETE FROM clearances WHERE domain = ? AND user_agent = ? AND proxy = ?',
+                                   (key.domain, key.user_agent, key.proxy or ''))
+        finally:
+            connection.close()
+
+    async def get(self, key: ClearanceKey) -> Optional[Clearance]:
+        return await asyncio.get_running_loop().run_in_executor(None, self._get, key)
+
+    async def set(self, key: ClearanceKey, clearance: Clearance) -> None:
+        await asyncio.get_running_loop().run_in_executor(None, self._set, key, clearance)
+
+    async def delete(self, key: ClearanceKey) -> None:
+        await asyncio.get_running_loop().run_in_executor(None, self._delete, key)
@@ -1,8 +1,10 @@
 import logging
 from abc import abstractmethod
+from typing import Optional
 
 from playwright.async_api import Page
 
+from playwright_captcha.clearance import ClearanceStore, SingleFlight
 from playwright_captcha.solvers.base_solver import BaseSolver
 from playwright_captcha.types import FrameworkType
 
@@ -12,16 +14,23 @@ logger = logging.getLogger(__name__)
 class ApiSolverBase(BaseSolver):
     """ Base class for external API-based captcha solvers """
 
-    def __init__(self, framework: FrameworkType, page: Page, max_attempts: int = 3, attempt_delay: int = 5):
+    def __init__(self, framework: FrameworkType, page: Page, max_attempts: int = 3, attempt_delay: int = 5,
+                 clearance_store: Optional[ClearanceStore] = None, proxy: Optional[str] = None,
+                 single_flight: Optional[SingleFlight] = None):
         """
         Initialize the API-based solver
 
         :param page: Playwright Page object where the captcha is located
         :param max_attempts: Maximum number of attempts to solve the captcha
         :param attempt_delay: Delay in seconds between attempts to solve the captcha
+        :param clearance_store: Store to reuse Cloudflare clearances across contexts and processes (None to disable)
+        :param proxy: Proxy the page's context uses (clearances are bound to the IP), None if direct
+        :param single_flight: SingleFlight shared by the pool's solvers, so concurrent Cloudflare interstitial
+                              solves of the same domain, user agent and proxy are done once (None to disable)
         """
 
-        super().__init__(framework=framework, page=page, max_attempts=max_attempts, attempt_delay=attempt_delay)
+        super().__init__(framework=framework, page=page, max_attempts=max_attempts, attempt_delay=attempt_delay,
+                         clearance_store=clearance_store, proxy=proxy, single_flight=single_flight)
 
     @abstractmethod
     async def get_balance(self) -> float:
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 
+import asyncio
 from contextlib import AsyncExitStack
 
 import aiofiles
@@ -9,8 +10,85 @@ from .exceptions.api import NetworkException, ApiException
 
 
 class AsyncApiClient():
-    def __init__(self, post_url='ocr.10captcha.com'):
+    def __init__(self,
+                 post_url='ocr.10captcha.com',
+                 maxConnections=100,
+                 maxKeepaliveConnections=20,
+                 keepaliveExpiry=30,
+                 http2=False):
+        '''
+
+        one long-lived pooled httpx client is used for all requests, so submits and polls reuse
+        the keep-alive connections instead of doing a TCP and TLS handshake each
+
+        Parameters
+        ----------
+        post_url : str, optional
+            API server host (or base URL with the scheme). The default is 'ocr.10captcha.com'.
+        maxConnections : int, optional
+            Maximum number of concurrent connections. The default is 100.
+        maxKeepaliveConnections : int, optional
+            Maximum number of idle connections kept open. The default is 20.
+        keepaliveExpiry : float, optional
+            Time in seconds an idle connection is kept open. The default is 30.
+        http2 : bool, optional
+            Use HTTP/2 if the server supports it (requires the h2 package: pip install httpx[http2]).
+            The default is False.
+
+        '''
+
         self.post_url = post_url
+        self.base_url = post_url if '://' in post_url else 'https://' + post_url
+
+        limits = httpx.Limits(max_connections=maxConnections,
+                              max_keepalive_connections=maxKeepaliveConnections,
+                              keepalive_expiry=keepaliveExpiry)
+        self.client = httpx.AsyncClient(limits=limits, http2=http2)
+        self.max_keepalive_connections = maxKeepaliveConnections
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def aclose(self):
+        '''
+        closes the pooled connections
+        '''
+
+        await self.client.aclose()
+
+    async def warmup(self, connections=1):
+        '''
+
+        opens connections to the API server in advance, so the first submits don't wait for the handshakes
+
+        Parameters
+        ----------
+        connections : int, optional
+            Number of connections to open (capped by maxKeepaliveConnections). The default is 1.
+
+        Returns
+        -------
+        opened : int
+            Number of connections opened successfully.
+
+        '''
+
+        async def connect():
+            try:
+                await self.client.head(self.base_url + '/res.php')
+                return True
+            except httpx.RequestError:
+                return False
+
+        # more idle connections than that would be closed right away
+        connections = min(connections, self.max_keepalive_connections)
+
+        # concurrent requests, so each one takes its own connection
+        results = await asyncio.gather(*(connect() for _ in range(connections)))
+        return sum(results)
 
     async def in_(self, files={}, **kwargs):
         '''
@@ -39,31 +117,31 @@ class AsyncApiClient():
         '''
 
         try:
-            current_url = 'https://' + self.post_url + '/in.php'
-
-            async with httpx.AsyncClient() as client:
-                if files:
-                    async with AsyncExitStack() as stack:
-                        file_objects = {}
-                        for key, path in files.items():
-                            file_handle = await stack.enter_async_context(aiofiles.open(path, 'rb'))
-                            content = await file_handle.read()
-                            file_objects[key] = content
-
-                        resp = await client.post(current_url,
-                                                 data=kwargs,
-                                                 files=file_objects)
-
-                elif 'file' in kwargs:
-                    file_path = kwargs.pop('file')
-                    async with aiofiles.open(file_path, 'rb') as file_handle:
+            current_url = self.base_url + '/in.php'
+            client = self.client
+
+            if files:
+                async with AsyncExitStack() as stack:
+                    file_objects = {}
+                    for key, path in files.items():
+                        file_handle = await stack.enter_async_context(aiofiles.open(path, 'rb'))
                         content = await file_handle.read()
-                        resp = await client.post(current_url,
-                                                 data=kwargs,
-                                                 files={'file': content})
-                else:
+                        file_objects[key] = content
+
+                    resp = await client.post(current_url,
+                                             data=kwargs,
+                                             files=file_objects)
+
+            elif 'file' in kwargs:
+                file_path = kwargs.pop('file')
+                async with aiofiles.open(file_path, 'rb') as file_handle:
+                    content = await file_handle.read()
                     resp = await client.post(current_url,
-                                             data=kwargs)
+                                             data=kwargs,
+                                             files={'file': content})
+            else:
+                resp = await client.post(current_url,
+                                         data=kwargs)
 
         except httpx.RequestError as e:
             raise NetworkException(e)
@@ -102,20 +180,63 @@ class AsyncApiClient():
         '''
 
         try:
-            current_url_out = 'https://' + self.post_url + '/res.php'
+            current_url_out = self.base_url + '/res.php'
 
-            async with httpx.AsyncClient() as client:
-                resp = await client.get(current_url_out, params=kwargs)
+            resp = await self.client.get(current_url_out, params=kwargs)
 
-                if resp.status_code != 200:
-                    raise NetworkException(f'bad response: {resp.status_code}')
+            if resp.status_code != 200:
+                raise NetworkException(f'bad response: {resp.status_code}')
 
-                resp = resp.content.decode('utf-8')
+            resp = resp.content.decode('utf-8')
 
-                if 'ERROR' in resp:
-                    raise ApiException(resp)
+            if 'ERROR' in resp:
+                raise ApiException(resp)
 
         except httpx.RequestError as e:
             raise NetworkException(e)
 
         return resp
+
+    async def res_batch(self, ids, **kwargs):
+        '''
+        sends one GET-request for the results of many captchas (action=get&ids=...)
+
+        Parameters
+        ----------
+        ids : list
+            IDs of the captchas.
+        **kwargs : dict
+            Request params (key, action).
+
+        Raises
+        ------
+        NetworkException
+            The request failed.
+        ApiException
+            The whole request was rejected (e.g. ERROR_WRONG_USER_KEY).
+
+        Returns
+        -------
+        results : list
+            Result of every ID in the order of ids: the answer, CAPCHA_NOT_READY or ERROR_*.
+            None if the response can't be split by ID (e.g. an answer contains "|").
+
+        '''
+
+        try:
+            resp = await self.client.get(self.base_url + '/res.php', params={**kwargs, 'ids': ','.join(ids)})
+        except httpx.RequestError as e:
+            raise NetworkException(e)
+
+        if resp.status_code != 200:
+            raise NetworkException(f'bad response: {resp.status_code}')
+
+        resp = resp.content.decode('utf-8')
+        results = resp.split('|')
+
+        if len(results) != len(ids):
+            if 'ERROR' in resp and '|' not in resp:
+                raise ApiException(resp)
+            return None
+
+        return results
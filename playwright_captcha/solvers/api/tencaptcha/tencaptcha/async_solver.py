@@ -5,9 +5,9 @@ import os
 import time
 from base64 import b64encode
 
-import httpx
-
 from .async_api import AsyncApiClient
+from .polling import FixedPollingSchedule, default_polling_schedules
+from .result_poller import ResultPoller
 from .exceptions.solver import ValidationException, NetworkException, TimeoutException, ApiException, \
     SolverExceptions
 
@@ -23,7 +23,16 @@ class AsyncTenCaptcha():
                  recaptchaTimeout=600,
                  pollingInterval=10,
                  server='ocr.10captcha.com',
-                 extendedResponse=None):
+                 extendedResponse=None,
+                 maxConnections=100,
+                 maxKeepaliveConnections=20,
+                 keepaliveExpiry=30,
+                 http2=False,
+                 warmupConnections=1,
+                 pollingSchedules=None,
+                 batchPolling=True,
+                 pingbackReceiver=None,
+                 pingbackGracePeriod=60):
 
         self.API_KEY = apiKey
         self.soft_id = softId
@@ -31,11 +40,57 @@ class AsyncTenCaptcha():
         self.default_timeout = defaultTimeout
         self.recaptcha_timeout = recaptchaTimeout
         self.polling_interval = pollingInterval
-        self.api_client = AsyncApiClient(post_url=str(server))
+        self.api_client = AsyncApiClient(post_url=str(server),
+                                         maxConnections=maxConnections,
+                                         maxKeepaliveConnections=maxKeepaliveConnections,
+                                         keepaliveExpiry=keepaliveExpiry,
+                                         http2=http2)
+        self.warmup_connections = warmupConnections
+        # result polling schedules by captcha type ('recaptcha_v2', 'recaptcha_v3', 'turnstile', 'default'),
+        # pollingInterval is the longest interval they back off to
+        self.polling_schedules = pollingSchedules or default_polling_schedules(max_interval=pollingInterval)
+        # one background poller fetching the results of all in-flight captchas with bulk requests (action=get&ids=...)
+        self.batch_polling = batchPolling
+        self.result_poller = ResultPoller(self.api_client, apiKey)
+        # results are pushed to the receiver's callback URL, polled only if they don't arrive within the grace period
+        self.pingback_receiver = pingbackReceiver
+        self.pingback_grace_period = pingbackGracePeriod
         self.max_files = 9
         self.exceptions = SolverExceptions
         self.extendedResponse = extendedResponse
 
+    async def __aenter__(self):
+        await self.warmup()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def warmup(self, connections=None):
+        '''Opens the pooled connections to the API server in advance (called on `async with`).
+
+        Parameters
+        __________
+        connections : int, optional
+            Number of connections to open (capped by maxKeepaliveConnections). Default: warmupConnections.
+
+        Returns
+
+        opened : int
+        '''
+
+        connections = self.warmup_connections if connections is None else connections
+        if not connections:
+            return 0
+
+        return await self.api_client.warmup(connections)
+
+    async def aclose(self):
+        '''Stops the result poller and closes the pooled connections (called on `async with` exit).'''
+
+        await self.result_poller.aclose()
+        await self.api_client.aclose()
+
     async def recaptcha(self, sitekey, url, version='v2', enterprise=0, **kwargs):
         '''Wrapper for solving recaptcha (v2, v3).
 
@@ -95,6 +150,7 @@ class AsyncTenCaptcha():
         timeout : float
 
         polling_interval : int
+            fixed polling interval, the adaptive schedule of the captcha type is used if not set
 
         **kwargs : dict
             all captcha params
@@ -104,16 +160,25 @@ class AsyncTenCaptcha():
         result : string
         '''
 
+        schedule = FixedPollingSchedule(polling_interval) if polling_interval else self.get_polling_schedule(kwargs)
+
+        if self.pingback_receiver is not None:
+            await self.pingback_receiver.start()
+            kwargs.setdefault('callback', self.pingback_receiver.url)
+
         id_ = await self.send(**kwargs)
         result = {'captchaId': id_}
 
-        if self.callback is None:
+        if self.callback is None or self.pingback_receiver is not None:
             timeout = float(timeout or self.default_timeout)
-            sleep = int(polling_interval or self.polling_interval)
 
-            code = await self.wait_result(id_, timeout, sleep)
+            if self.pingback_receiver is not None:
+                code = await self.wait_pingback(id_, timeout, schedule)
+            else:
+                code = await self.poll_result(id_, timeout, schedule)
 
-            if self.extendedResponse == True:
+            # pingbacks deliver the answer only
+            if self.extendedResponse == True and isinstance(code, dict):
                 new_code = {
                     key if key != 'request' else 'code': value
                     for key, value in code.items()
@@ -125,14 +190,110 @@ class AsyncTenCaptcha():
 
             return result
 
+    async def poll_result(self, id_, timeout, schedule):
+        '''Polls the result with the bulk result poller, or on its own (bulk responses have no extended format).'''
+
+        if self.batch_polling and not self.extendedResponse:
+            return await self.result_poller.wait(id_, timeout, schedule)
+
+        return await self.wait_result(id_, timeout, schedule)
+
+    async def wait_pingback(self, id_, timeout, schedule):
+        '''Waits for the pingback of the submitted captcha, polls too if it doesn't arrive within the grace period.
+
+        Parameters
+        __________
+        id_ : str
+            ID of the captcha sent for solution
+        timeout : float
+            overall deadline in seconds from now
+        schedule : PollingSchedule
+            polling schedule of the captcha type (continued after the grace period)
+
+        Returns
+
+        answer : text
+        '''
+
+        started = time.monotonic()
+        grace_period = min(self.pingback_grace_period, timeout)
+        pingback = self.pingback_receiver.expect(id_)
+        polling = None
+
+        try:
+            try:
+                code = await asyncio.wait_for(asyncio.shield(pingback), grace_period)
+                schedule.observe(time.monotonic() - started)
+                return code
+            except asyncio.TimeoutError:
+                pass
+
+            # no pingback yet - poll, the pingback still wins if it arrives first
+            polling = asyncio.ensure_future(
+                self.poll_result(id_, timeout - grace_period, schedule.after(grace_period))
+            )
+            done, _ = await asyncio.wait({pingback, polling}, return_when=asyncio.FIRST_COMPLETED)
+
+            return (pingback if pingback in done else polling).result()
+        finally:
+            self.pingback_receiver.discard(id_)
+            if polling is not None and not polling.done():
+                polling.cancel()
+
+    def get_polling_schedule(self, params):
+        '''Polling schedule of the captcha type of the params.'''
+
+        method = params.get('method')
+        if method == 'userrecaptcha':
+            captcha_type = 'recaptcha_v3' if params.get('version') == 'v3' else 'recaptcha_v2'
+        elif method == 'turnstile':
+            captcha_type = 'turnstile'
+        else:
+            captcha_type = 'default'
+
+        return self.polling_schedules.get(captcha_type) or self.polling_schedules['default']
+
     async def wait_result(self, id_, timeout, polling_interval):
-        max_wait = time.time() + timeout
+        '''Polls the result of the submitted captcha until it's ready or the timeout is exceeded.
+
+        Parameters
+        __________
+        id_ : str
+            ID of the captcha sent for solution
+        timeout : float
+            overall deadline in seconds from now
+        polling_interval : int or PollingSchedule
+            fixed polling interval or the polling schedule
 
-        while time.time() < max_wait:
+        Returns
+
+        answer : text
+        '''
+
+        schedule = polling_interval if hasattr(polling_interval, 'delays') else FixedPollingSchedule(polling_interval)
+
+        # monotonic, so system clock adjustments don't shorten or stretch the wait
+        started = time.monotonic()
+        deadline = started + timeout
+        next_poll = started
+        not_ready_at = None
+
+        for delay in schedule.delays():
+            # planned from the start, so slow requests don't shift the schedule
+            next_poll = min(next_poll + delay, deadline)
+            await asyncio.sleep(max(next_poll - time.monotonic(), 0))
+
+            polled_at = time.monotonic() - started
             try:
-                return await self.get_result(id_)
+                code = await self.get_result(id_)
             except NetworkException:
-                await asyncio.sleep(polling_interval)
+                if next_poll >= deadline:
+                    break
+                not_ready_at = polled_at
+                continue
+
+            schedule.observe_polls(not_ready_at, polled_at)
+            return code
 
         raise TimeoutException(f'timeout {timeout} exceeded')
 
@@ -144,11 +305,10 @@ class AsyncTenCaptcha():
             return {'method': 'base64', 'body': file}
 
         if file.startswith('http'):
-            async with httpx.AsyncClient() as client:
-                img_resp = await client.get(file)
-                if img_resp.status_code != 200:
-                    raise ValidationException(f'File could not be downloaded from url: {file}')
-                return {'method': 'base64', 'body': b64encode(img_resp.content).decode('utf-8')}
+            img_resp = await self.api_client.client.get(file)
+            if img_resp.status_code != 200:
+                raise ValidationException(f'File could not be downloaded from url: {file}')
+            return {'method': 'base64', 'body': b64encode(img_resp.content).decode('utf-8')}
 
         if not os.path.exists(file):
             raise ValidationException(f'File not found: {file}')
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+
+import asyncio
+import hmac
+import ipaddress
+import secrets
+from collections import OrderedDict
+from urllib.parse import urlparse, parse_qs
+
+from .exceptions.solver import ApiException, ValidationException
+
+
+class PingbackReceiver():
+    '''Embedded webhook receiver for the pingback (callback) results.
+
+    The provider sends the result of a solved captcha to the callback URL (id and code, as a form
+    or query params), the receiver resolves the waiter of that captcha ID right away, so no
+    polling is needed. The callback URL (host) has to be registered in the provider's account.
+    The callback URL ends with a random secret, requests to any other path are rejected, so
+    nobody else can post answers.
+
+    Parameters
+    __________
+    host : str
+        Interface to listen on. Default: 127.0.0.1 (e.g. behind a reverse proxy).
+    port : int
+        Port to listen on, 0 for a free one. Default: 0.
+    path : str
+        Path of the callback URL (followed by the secret). Default: /pingback.
+    publicUrl : str, optional
+        Base URL (scheme://host:port) the provider reaches the receiver at, required if host is
+        a loopback or wildcard address. Default: http://host:port.
+    secret : str, optional
+        Last path segment of the callback URL. Default: random.
+    '''
+
+    # results that arrived before their waiter was registered
+    max_early_results = 1000
+    max_body_size = 64 * 1024
+    # seconds a client has to send the whole request, so idle connections don't stay open
+    read_timeout = 5
+
+    def __init__(self, host='127.0.0.1', port=0, path='/pingback', publicUrl=None, secret=None):
+        self.host = host
+        self.port = port
+        self.path = path.rstrip('/')
+        self.public_url = publicUrl
+        self.secret = secret or secrets.token_urlsafe(16)
+
+        self._server = None
+        self._waiters = {}  # id -> future
+        self._early = OrderedDict()  # id -> code
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
+
+    @property
+    def callback_path(self):
+        '''Path of the callback URL, including the secret.'''
+
+        return f'{self.path}/{self.secret}'
+
+    @property
+    def url(self):
+        '''Callback URL to send with the captchas.'''
+
+        if self.public_url:
+            return self.public_url.rstrip('/') + self.callback_path
+
+        if self._is_local_host():
+            raise ValidationException(f'The provider can\'t reach {self.host}, publicUrl is required')
+
+        return f'http://{self.host}:{self.port}{self.callback_path}'
+
+    def _is_local_host(self):
+        if self.host in ('', 'localhost'):
+            return True
+
+        try:
+            address = ipaddress.ip_address(self.host)
+        except ValueError:
+            return False  # a host name
+
+        return address.is_loopback or address.is_unspecified
+
+    async def start(self):
+        '''Starts listening.'''
+
+        if self._server is not None:
+            return
+
+        if not self.public_url and self._is_local_host():
+            raise ValidationException(f'The provider can\'t reach {self.host}, publicUrl is required')
+
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        '''Stops listening, the pending waiters are cancelled.'''
+
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+        for future in self._waiters.values():
+            future.cancel()
+        self._waiters.clear()
+
+    def expect(self, id_):
+        '''Registers the waiter of the captcha ID.
+
+        Returns
+
+        future : asyncio.Future resolved with the answer (or ApiException) when the pingback arrives
+        '''
+
+        future = asyncio.get_running_loop().create_future()
+
+        if id_ in self._early:
+            self._set_result(future, self._early.pop(id_))
+        else:
+            self._waiters[id_] = future
+
+        return future
+
+    def discard(self, id_):
+        '''Forgets the waiter of the captcha ID (e.g. it was resolved by polling).'''
+
+        future = self._waiters.pop(id_, None)
+        if future is not None and not future.done():
+            future.cancel()
+
+    def _set_result(self, future, code):
+        if future.done():
+            return
+
+        if 'ERROR' in code:
+            future.set_exception(ApiException(code))
+        else:
+            future.set_result(code)
+
+    def _resolve(self, id_, code):
+        future = self._waiters.pop(id_, None)
+        if future is not None:
+            self._set_result(future, code)
+            return
+
+        self._early[id_] = code
+        while len(self._early) > self.max_early_results:
+            self._early.popitem(last=False)
+
+    async def _read_request(self, reader):
+        '''Reads the request target and body.'''
+
+        request_line = (await reader.readline()).decode('latin-1')
+        method, target, _ = request_line.split(' ', 2)
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        length = int(headers.get('content-length') or 0)
+        if length > self.max_body_size:
+            raise ValueError('body too large')
+        body = await reader.readexactly(length)
+
+        return target, body
+
+    async def _handle(self, reader, writer):
+        status = '200 OK'
+        try:
+            target, body = await asyncio.wait_for(self._read_request(reader), self.read_timeout)
+
+            url = urlparse(target)
+            if not hmac.compare_digest(url.path.encode(), self.callback_path.encode()):
+                status = '404 Not Found'
+            else:
+                params = parse_qs(url.query)
+                params.update(parse_qs(body.decode('utf-8', errors='replace')))
+
+                id_ = params.get('id', [None])[0]
+                code = params.get('code', [None])[0]
+                if id_ and code is not None:
+                    self._resolve(id_, code)
+                else:
+                    status = '400 Bad Request'
+        except asyncio.TimeoutError:
+            status = '408 Request Timeout'
+        except (ValueError, asyncio.IncompleteReadError, ConnectionError):
+            status = '400 Bad Request'
+
+        try:
+            writer.write(f'HTTP/1.1 {status}\r\nContent-Length: 2\r\nConnection: close\r\n\r\nOK'.encode())
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
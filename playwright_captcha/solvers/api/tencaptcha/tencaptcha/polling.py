@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+
+from collections import deque
+
+
+class PollingSchedule():
+    '''Result polling schedule of a captcha type.
+
+    Waits initial_delay before the first poll (almost no captcha is solved earlier), polls every
+    interval seconds until expected_time (most captchas are solved in between), then backs off
+    up to max_interval. Once enough solve latencies are observed, initial_delay and expected_time
+    follow their distribution (10th and 90th percentiles).
+
+    Parameters
+    __________
+    initial_delay : float
+        Delay in seconds before the first poll, until enough latencies are observed.
+    expected_time : float
+        Time in seconds after the submit until which the tight interval is used, until enough latencies are observed.
+    interval : float
+        Polling interval in seconds around the expected completion time. Default: 2.
+    backoff : float
+        Interval multiplier after expected_time. Default: 1.5.
+    max_interval : float
+        Maximum polling interval in seconds. Default: 10.
+    min_samples : int
+        Number of observed latencies needed to adapt the schedule. Default: 10.
+    max_samples : int
+        Number of latest latencies to keep. Default: 100.
+    '''
+
+    def __init__(self,
+                 initial_delay,
+                 expected_time,
+                 interval=2,
+                 backoff=1.5,
+                 max_interval=10,
+                 min_samples=10,
+                 max_samples=100):
+        self.initial_delay = initial_delay
+        self.expected_time = expected_time
+        self.interval = interval
+        self.backoff = backoff
+        self.max_interval = max_interval
+        self.min_samples = min_samples
+
+        self.latencies = deque(maxlen=max_samples)
+
+    def observe(self, latency):
+        '''Records the time in seconds a captcha took from the submit to the result.'''
+
+        self.latencies.append(latency)
+
+    def observe_polls(self, not_ready_at, ready_at):
+        '''Records a solve found by polling: it was done somewhere between the last poll that wasn't ready
+        and the ready one (times in seconds from the submit), so the midpoint is recorded. If already
+        the first poll was ready, the captcha may be solved much earlier - the initial delay is lowered.
+
+        Parameters
+        __________
+        not_ready_at : float or None
+            Time of the last poll that wasn't ready, None if the first poll was ready.
+        ready_at : float
+            Time of the ready poll.
+        '''
+
+        if not_ready_at is None:
+            not_ready_at = 0
+            self.initial_delay = min(self.initial_delay, ready_at / 2)
+
+        self.observe((not_ready_at + ready_at) / 2)
+
+    def percentile(self, percent):
+        '''Nearest-rank percentile of the observed latencies (None if there are not enough of them).'''
+
+        if len(self.latencies) < self.min_samples:
+            return None
+
+        latencies = sorted(self.latencies)
+        index = max(int(round(percent / 100 * len(latencies))) - 1, 0)
+        return latencies[min(index, len(latencies) - 1)]
+
+    def delays(self, elapsed=0):
+        '''Yields the delays in seconds before each poll, for polling started elapsed seconds after the submit.'''
+
+        initial_delay = self.percentile(10)
+        if initial_delay is None:
+            initial_delay, expected_time = self.initial_delay, self.expected_time
+        else:
+            # a few tight polls even if all the latencies are alike
+            expected_time = max(self.percentile(90), initial_delay + 3 * self.interval)
+
+        yield max(initial_delay - elapsed, 0)
+
+        elapsed = max(elapsed, initial_delay)
+        interval = self.interval
+        while True:
+            if elapsed >= expected_time:
+                interval = min(interval * self.backoff, max(self.max_interval, self.interval))
+
+            yield interval
+            elapsed += interval
+
+    def after(self, elapsed):
+        '''Schedule for polling started elapsed seconds after the submit (e.g. after the pingback grace period).'''
+
+        return ShiftedPollingSchedule(self, elapsed)
+
+
+class ShiftedPollingSchedule():
+    '''Continues a schedule from elapsed seconds after the submit, observed latencies are counted from the submit.'''
+
+    def __init__(self, schedule, elapsed):
+        self.schedule = schedule
+        self.elapsed = elapsed
+
+    def observe(self, latency):
+        self.schedule.observe(latency + self.elapsed)
+
+    def observe_polls(self, not_ready_at, ready_at):
+        # the polling started after elapsed seconds, a ready first poll says nothing about the initial delay
+        not_ready_at = 0 if not_ready_at is None else not_ready_at
+        self.schedule.observe_polls(self.elapsed + not_ready_at, self.elapsed + ready_at)
+
+    def delays(self):
+        return self.schedule.delays(self.elapsed)
+
+
+class FixedPollingSchedule(PollingSchedule):
+    '''Polls right away, then every interval seconds (the classic behaviour).'''
+
+    def __init__(self, interval):
+        super().__init__(initial_delay=0, expected_time=float('inf'), interval=interval)
+
+    def delays(self, elapsed=0):
+        yield 0
+
+        while True:
+            yield self.interval
+
+
+def default_polling_schedules(max_interval=10):
+    '''Schedules by captcha type, based on typical solve latencies of the human-powered services.'''
+
+    return {
+        'recaptcha_v2': PollingSchedule(initial_delay=15, expected_time=45, interval=3, max_interval=max_interval),
+        'recaptcha_v3': PollingSchedule(initial_delay=10, expected_time=30, interval=2, max_interval=max_interval),
+        'turnstile': PollingSchedule(initial_delay=8, expected_time=25, interval=2, max_interval=max_interval),
+        'default': PollingSchedule(initial_delay=5, expected_time=20, interval=2, max_interval=max_interval),
+    }
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+
+import asyncio
+import time
+from contextlib import suppress
+
+from .exceptions import api
+from .exceptions.solver import NetworkException, ApiException, TimeoutException
+
+# errors of the requests (AsyncApiClient raises the api ones)
+NETWORK_ERRORS = (NetworkException, api.NetworkException)
+API_ERRORS = (ApiException, api.ApiException)
+
+
+class _PendingResult():
+    def __init__(self, future, schedule, started):
+        self.future = future
+        self.schedule = schedule
+        self.started = started
+        self.delays = schedule.delays()
+        self.due = started + next(self.delays)
+        self.not_ready_at = None  # time of the last poll that wasn't ready, from the start
+
+    def reschedule(self, now):
+        '''Plans the next poll (from the start, so slow requests don't shift the schedule).'''
+
+        self.due += next(self.delays)
+        while self.due <= now:
+            self.due += next(self.delays)
+
+
+class ResultPoller():
+    '''One background polling loop per client for all in-flight captchas.
+
+    Every tick fetches the results of all the captcha IDs that are due (by their polling schedules)
+    with bulk requests (action=get&ids=...), so the number of requests grows with the number of ticks,
+    not with the number of concurrent solves.
+
+    Parameters
+    __________
+    api_client : AsyncApiClient
+        Client to send the requests with.
+    api_key : str
+        API key.
+    max_batch : int
+        Maximum number of IDs per request. Default: 100.
+    tick : float
+        IDs due within this many seconds are polled together with the due ones. Default: 1.
+    '''
+
+    def __init__(self, api_client, api_key, max_batch=100, tick=1):
+        self.api_client = api_client
+        self.api_key = api_key
+        self.max_batch = max_batch
+        self.tick = tick
+
+        self._pending = {}  # id -> _PendingResult
+        self._task = None
+        self._wakeup = None
+
+    async def wait(self, id_, timeout, schedule):
+        '''Waits for the result of the submitted captcha.
+
+        Parameters
+        __________
+        id_ : str
+            ID of the captcha sent for solution
+        timeout : float
+            overall deadline in seconds from now
+        schedule : PollingSchedule
+            polling schedule of the captcha type
+
+        Returns
+
+        answer : text
+        '''
+
+        loop = asyncio.get_running_loop()
+        pending = self._pending[id_] = _PendingResult(loop.create_future(), schedule, time.monotonic())
+
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = loop.create_task(self._run())
+        self._wakeup.set()
+
+        try:
+            return await asyncio.wait_for(pending.future, timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutException(f'timeout {timeout} exceeded')
+        finally:
+            if self._pending.get(id_) is pending:
+                del self._pending[id_]
+
+    async def aclose(self):
+        '''Stops the polling loop, the pending waits are cancelled.'''
+
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+        for pending in self._pending.values():
+            pending.future.cancel()
+        self._pending.clear()
+
+    async def _run(self):
+        try:
+            while self._pending:
+                now = time.monotonic()
+                next_due = min(pending.due for pending in self._pending.values())
+
+                if next_due > now:
+                    # sleep until the next poll, or until a new captcha is added
+                    self._wakeup.clear()
+                    with suppress(asyncio.TimeoutError):
+                        await asyncio.wait_for(self._wakeup.wait(), next_due - now)
+                    continue
+
+                ids = [id_ for id_, pending in self._pending.items() if pending.due <= now + self.tick]
+                await asyncio.gather(*(self._poll(ids[index:index + self.max_batch])
+                                       for index in range(0, len(ids), self.max_batch)))
+        except Exception as e:
+            for pending in self._pending.values():
+                if not pending.future.done():
+                    pending.future.set_exception(e)
+
+    async def _poll_one(self, id_):
+        '''Result of one ID in the bulk response format.'''
+
+        try:
+            result = await self.api_client.res(key=self.api_key, action='get', id=id_)
+        except NETWORK_ERRORS:
+            return 'CAPCHA_NOT_READY'
+        except API_ERRORS as e:
+            return str(e)
+
+        return result[3:] if result.startswith('OK|') else result
+
+    async def _poll(self, ids):
+        polled_at = time.monotonic()
+        try:
+            results = await self.api_client.res_batch(ids, key=self.api_key, action='get')
+        except NETWORK_ERRORS:
+            results = ['CAPCHA_NOT_READY'] * len(ids)  # retried on the next poll
+        except API_ERRORS as e:
+            results = [str(e)] * len(ids)
+
+        if results is None:
+            # the response can't be split by ID (e.g. an answer contains "|"), ask for each one
+            results = await asyncio.gather(*(self._poll_one(id_) for id_ in ids))
+
+        now = time.monotonic()
+        for id_, result in zip(ids, results):
+            pending = self._pending.get(id_)
+            if pending is None or pending.future.done():
+                continue
+
+            if result == 'CAPCHA_NOT_READY':
+                pending.not_ready_at = polled_at - pending.started
+                pending.reschedule(now)
+                continue
+
+            del self._pending[id_]
+            if 'ERROR' in result:
+                pending.future.set_exception(ApiException(result))
+            else:
+                pending.schedule.observe_polls(pending.not_ready_at, polled_at - pending.started)
+                pending.future.set_result(result)
@@ -1,8 +1,9 @@
 import logging
-from typing import Union
+from typing import Union, Optional
 
 from playwright.async_api import Page, Frame, ElementHandle
 
+from playwright_captcha.clearance import ClearanceStore, SingleFlight
 from playwright_captcha.solvers.api.api_solver_base import ApiSolverBase
 from playwright_captcha.solvers.api.tencaptcha.tencaptcha.async_solver import AsyncTenCaptcha
 from playwright_captcha.solvers.base_solver import CaptchaType
@@ -20,7 +21,9 @@ class TenCaptchaSolver(ApiSolverBase):
 
     def __init__(self, framework: FrameworkType, page: Page,
                  async_ten_captcha_client: AsyncTenCaptcha,
-                 max_attempts: int = 3, attempt_delay: int = 5):
+                 max_attempts: int = 3, attempt_delay: int = 5,
+                 clearance_store: Optional[ClearanceStore] = None, proxy: Optional[str] = None,
+                 single_flight: Optional[SingleFlight] = None):
         """
         Initialize the 10Captcha solver
 
@@ -28,9 +31,14 @@ class TenCaptchaSolver(ApiSolverBase):
         :param async_ten_captcha_client: AsyncTenCaptcha client instance
         :param max_attempts: Maximum number of attempts to solve the captcha
         :param attempt_delay: Delay in seconds between attempts to solve the captcha
+        :param clearance_store: Store to reuse Cloudflare clearances across contexts and processes (None to disable)
+        :param proxy: Proxy the page's context uses (clearances are bound to the IP), None if direct
+        :param single_flight: SingleFlight shared by the pool's solvers, so concurrent Cloudflare interstitial
+                              solves of the same domain, user agent and proxy are done once (None to disable)
         """
 
-        super().__init__(framework=framework, page=page, max_attempts=max_attempts, attempt_delay=attempt_delay)
+        super().__init__(framework=framework, page=page, max_attempts=max_attempts, attempt_delay=attempt_delay,
+                         clearance_store=clearance_store, proxy=proxy, single_flight=single_flight)
 
         self.async_ten_captcha_client = async_ten_captcha_client
 
@@ -1,17 +1,27 @@
 import asyncio
 import logging
 from abc import ABC, abstractmethod
-from typing import Union, ClassVar, Dict, Callable, Optional, Any
+from typing import Union, ClassVar, Dict, Callable, Optional, Any, List, Tuple
 
 from playwright.async_api import Page, Frame, ElementHandle
 
-from playwright_captcha.types import CaptchaType, FrameworkType
+from playwright_captcha.clearance import ClearanceStore, SingleFlight, get_clearance_key, extract_clearance, \
+    apply_clearance, DEFAULT_CLEARANCE_TTL
+from playwright_captcha.types import CaptchaType, FrameworkType, CaptchaInventory, Clearance
 from playwright_captcha.types.solvers import SolverType
-from playwright_captcha.utils.js_script import load_js_script
-from playwright_captcha.utils.exceptions import CaptchaAlreadySolvedException
+from playwright_captcha.utils.challenge_monitor import watch_challenges, get_challenge_state
+from playwright_captcha.utils.intercepted_params import watch_intercepted_params
+from playwright_captcha.utils.js_script import load_js_script, preload_js_scripts
+from playwright_captcha.utils.cdp_session import get_cdp_session_manager
+from playwright_captcha.utils.exceptions import CaptchaAlreadySolvedException, CaptchaSolvingCancelledError
+from playwright_captcha.utils.init_scripts import add_init_script_once, is_init_script_registered, \
+    mark_init_script_registered, unmark_init_script_registered
 
 logger = logging.getLogger(__name__)
 
+# maximum time in seconds to wait for the cf_clearance cookie after the interstitial is solved
+CLEARANCE_WAIT_TIMEOUT = 10
+
 
 class BaseSolver(ABC):
     """Universal base class for all captcha solvers"""
@@ -22,19 +32,28 @@ class BaseSolver(ABC):
     _solvers: ClassVar[Dict[SolverType, Dict[CaptchaType, Dict[str, Callable]]]] = {}
     _appliers: ClassVar[Dict[CaptchaType, Callable]] = {}
 
-    def __init__(self, framework: FrameworkType, page: Page, max_attempts: int = 3, attempt_delay: int = 5):
+    def __init__(self, framework: FrameworkType, page: Page, max_attempts: int = 3, attempt_delay: int = 5,
+                 clearance_store: Optional[ClearanceStore] = None, proxy: Optional[str] = None,
+                 single_flight: Optional[SingleFlight] = None):
         """
         Initialize the base solver
 
         :param page: Playwright Page object where the captcha is located
         :param max_attempts: Maximum number of attempts to solve the captcha
         :param attempt_delay: Delay in seconds between attempts to solve the captcha
+        :param clearance_store: Store to reuse Cloudflare clearances across contexts and processes (None to disable)
+        :param proxy: Proxy the page's context uses (clearances are bound to the IP), None if direct
+        :param single_flight: SingleFlight shared by the pool's solvers, so concurrent Cloudflare interstitial
+                              solves of the same domain, user agent and proxy are done once (None to disable)
         """
 
         self.framework = framework
         self.page = page
         self.max_attempts = max_attempts
         self.attempt_delay = attempt_delay
+        self.clearance_store = clearance_store
+        self.proxy = proxy
+        self.single_flight = single_flight
 
         self._prepare_called = False
         self._cleanup_called = False
@@ -97,19 +116,35 @@ class BaseSolver(ABC):
 
         self._prepare_called = True
 
+        # load all bundled scripts into memory once per process, so prepare/apply calls don't hit the disk
+        await preload_js_scripts()
+
         await self._prepare_framework()
 
+        # classify navigations by response headers (cf-mitigated), so unchallenged pages skip the DOM detection
+        watch_challenges(self.page)
+
+        # the intercept scripts push the cloudflare interstitial params via console events the moment they are
+        # intercepted, start listening before navigation (patchright doesn't emit console events, so it polls)
+        if self.type in [SolverType.twocaptcha, SolverType.tencaptcha]:
+            watch_intercepted_params(self.page, push_supported=self.framework != FrameworkType.PATCHRIGHT)
+
         # monkey-patch to open closed shadowRoots
         # for patchright, add_init_script causes net::ERR_NAME_NOT_RESOLVED on subsequent page.goto,
-        # so the script is injected via CDP in _prepare_patchright() instead
+        # so the script is injected via CDP in _prepare_patchright() instead.
+        # registered once per context (once per page for the camoufox workaround, which is bound to the page)
         if self.framework != FrameworkType.PATCHRIGHT:
-            await self.page.add_init_script(await load_js_script('patches/unlockShadowRoot.js'))
+            await add_init_script_once(self.page, 'patches/unlockShadowRoot.js',
+                                       await load_js_script('patches/unlockShadowRoot.js'),
+                                       context_level=self.framework != FrameworkType.CAMOUFOX)
 
         # cloudflare interstitial requires to inject a script to intercept the challenge parameters
-        # only needed for API-based solvers on Playwright (Camoufox has it built-in, Patchright uses CDP)
+        # only needed for API-based solvers on Playwright (Camoufox has it built-in, Patchright uses CDP).
+        # registered per page, because it blocks the turnstile render, which would break click solvers in the same context
         if self.type in [SolverType.twocaptcha, SolverType.tencaptcha] and self.framework not in [FrameworkType.CAMOUFOX, FrameworkType.PATCHRIGHT]:
             intercept_script = await load_js_script('patches/interceptCloudflareInterstitialData.js')
-            await self.page.add_init_script(intercept_script)
+            await add_init_script_once(self.page, 'patches/interceptCloudflareInterstitialData.js', intercept_script,
+                                       context_level=False)
 
     async def _prepare_framework(self) -> None:
         """Framework preparation"""
@@ -131,10 +166,11 @@ class BaseSolver(ABC):
                 hasattr(self.page.add_init_script, 'is_camoufox_workaround')):
             logger.info("Applying add_init_script workaround for Camoufox...")
             from playwright_captcha.utils.camoufox_add_init_script.add_init_script import add_init_script, \
-                get_addon_path, clean_scripts
+                get_addon_path
 
+            # scripts are content-addressed and registered once, so the (possibly shared) scripts dir
+            # is not wiped here - other solvers and processes may still use it (stale scripts expire instead)
             addon_path = get_addon_path()
-            clean_scripts(addon_path)
 
             # store original method for cleanup
             self._original_methods['add_init_script'] = getattr(self.page, 'add_init_script', None)
@@ -149,8 +185,9 @@ class BaseSolver(ABC):
 
         if self.type in [SolverType.twocaptcha, SolverType.tencaptcha]:
             logger.info("Setting Cloudflare intercept flag for API solver (Camoufox)")
-            await self.page.context.add_init_script('sessionStorage.setItem("_blockCloudflareRender", "true");')
-            logger.info("Cloudflare intercept flag registered in context via sessionStorage")
+            if await add_init_script_once(self.page, 'blockCloudflareRender',
+                                          'sessionStorage.setItem("_blockCloudflareRender", "true");'):
+                logger.info("Cloudflare intercept flag registered in context via sessionStorage")
 
     async def _prepare_patchright(self) -> None:
         """Patchright preparation"""
@@ -169,26 +206,27 @@ class BaseSolver(ABC):
 
         # patchright's add_init_script causes net::ERR_NAME_NOT_RESOLVED on subsequent page.goto,
         # so all init scripts are injected directly via CDP instead
+        # CDP scripts are bound to the page's target, so they are tracked per page
+        script_names = ['patches/unlockShadowRoot.js']
+        if self.type in [SolverType.twocaptcha, SolverType.tencaptcha]:
+            script_names.append('patches/interceptCloudflareInterstitialData.js')
+        script_names = [name for name in script_names if not is_init_script_registered(self.page, name)]
+        if not script_names:
+            logger.info("Init scripts are already injected via CDP for this page, skipping")
+            return
+
+        for name in script_names:
+            mark_init_script_registered(self.page, name)
+
+        # one persistent CDP session per page (shared with other solvers), all scripts are merged
+        # into a single Page.addScriptToEvaluateOnNewDocument command
         try:
-            cdp = await self.page.context.new_cdp_session(self.page)
-
-            shadow_root_script = await load_js_script('patches/unlockShadowRoot.js')
-            await cdp.send('Page.addScriptToEvaluateOnNewDocument', {
-                'source': shadow_root_script,
-                'runImmediately': False,
-            })
-            logger.info("Injected unlockShadowRoot.js via CDP for patchright")
-
-            if self.type in [SolverType.twocaptcha, SolverType.tencaptcha]:
-                intercept_script = await load_js_script('patches/interceptCloudflareInterstitialData.js')
-                await cdp.send('Page.addScriptToEvaluateOnNewDocument', {
-                    'source': intercept_script,
-                    'runImmediately': False,
-                })
-                logger.info("Injected interceptCloudflareInterstitialData.js via CDP for patchright")
-
-            await cdp.detach()
+            scripts = [await load_js_script(name) for name in script_names]
+            await get_cdp_session_manager(self.page).add_init_scripts(scripts)
+            logger.info(f"Injected {', '.join(script_names)} via CDP for patchright")
         except Exception as e:
+            for name in script_names:
+                unmark_init_script_registered(self.page, name)
             logger.warning(f"Failed to inject init scripts via CDP for patchright: {e}")
 
     async def _prepare_playwright(self) -> None:
@@ -234,16 +272,36 @@ class BaseSolver(ABC):
         # get the required captcha data (e.g. site key) if not provided
         # first get data found in the page and then in the captcha container (the captcha container has priority,
         # so if the same key is found in both, the one from the container will be used)
-        data = {}
-        data.update(await detector(queryable=self.page, **kwargs))
         # don't call it for captcha container for cloudflare interstitial, because:
         # 1. detection method for cloudflare can be called only 1 time after reload
         # 2. cloudflare interstitial is a whole-page captcha
+        # the page and the container are scanned concurrently
+        queryables = [self.page]
         if captcha_type != CaptchaType.CLOUDFLARE_INTERSTITIAL:
-            data.update(await detector(queryable=captcha_container, **kwargs))
+            queryables.append(captcha_container)
+
+        data = {}
+        for queryable_data in await asyncio.gather(*(detector(queryable=queryable, **kwargs)
+                                                     for queryable in queryables)):
+            data.update(queryable_data)
 
         return data
 
+    async def detect(self, captcha_types: Optional[List[CaptchaType]] = None) -> CaptchaInventory:
+        """
+        Detect which captchas are present on the page, with one probe per frame run concurrently in all frames.
+        Cheap enough to be called on every page to check that there is no captcha
+
+        :param captcha_types: Captcha types to look for (all supported types by default)
+
+        :return: CaptchaInventory with the detected captcha types, their sitekeys, actions and widget containers
+                 (falsy if no captcha is found)
+        """
+
+        from playwright_captcha.captchas.inventory import detect_captchas
+
+        return await detect_captchas(self.page, captcha_types)
+
     async def _get_solver_data(self, captcha_type: CaptchaType) -> Dict:
         """
         Get the solver data for the given captcha type
@@ -298,15 +356,17 @@ class BaseSolver(ABC):
 
         raise NotImplementedError('This method must be implemented in subclasses')
 
-    async def solve_captcha(self, captcha_container, captcha_type, **kwargs) -> Union[bool, str]:
+    async def solve_captcha(self, captcha_container, captcha_type: Optional[CaptchaType] = None,
+                            **kwargs) -> Union[bool, str]:
         """
         Universal captcha solving function
 
         :param captcha_container: Page, Frame or ElementHandle containing the captcha
-        :param captcha_type: Type of captcha to solve
+        :param captcha_type: Type of captcha to solve. If None, it's detected automatically (see self.detect())
         **kwargs: Additional parameters passed to the solver
 
-        :return bool or str: True/False for success-based solvers, token string for token-based solvers
+        :return bool or str: True/False for success-based solvers, token string for token-based solvers.
+                             False if captcha_type is None and no captcha this solver can solve is detected
 
         :raises RuntimeError: If the solver is not prepared
         :raises ValueError: If the captcha type is not supported by this solver
@@ -324,6 +384,23 @@ class BaseSolver(ABC):
         if self.type == SolverType.base:
             raise ValueError(f"BaseSolver is an abstract class and cannot be used directly")
 
+        # the navigation response headers already tell if the page is a cloudflare challenge (None if they can't)
+        challenged = get_challenge_state(self.page)
+
+        # detect the captcha type if not provided
+        if captcha_type is None and challenged and self.can_solve(CaptchaType.CLOUDFLARE_INTERSTITIAL):
+            captcha_type = CaptchaType.CLOUDFLARE_INTERSTITIAL
+            logger.info(f'Detected {captcha_type.value} captcha by response headers')
+        elif captcha_type is None:
+            inventory = await self.detect()
+            captcha_type = next((detected_type for detected_type in inventory.types if self.can_solve(detected_type)),
+                                None)
+            if captcha_type is None:
+                logger.info(f'No captcha that {self.get_name()} can solve was detected, skipping solve')
+                return False
+
+            logger.info(f'Detected {captcha_type.value} captcha')
+
         # ensure captcha_type is a valid CaptchaType
         if not isinstance(captcha_type, CaptchaType):
             raise TypeError(f"captcha_type must be a CaptchaType enum value, not {type(captcha_type).__name__}")
@@ -334,6 +411,10 @@ class BaseSolver(ABC):
 
         solver_data = await self._get_solver_data(captcha_type)
 
+        if captcha_type == CaptchaType.CLOUDFLARE_INTERSTITIAL and challenged is False:
+            logger.info('Response headers show no Cloudflare challenge, skipping solve')
+            return True
+
         # if expected content is already visible, the challenge was bypassed automatically (e.g. patchright)
         expected_content_selector = kwargs.get('expected_content_selector')
         if expected_content_selector:
@@ -342,6 +423,135 @@ class BaseSolver(ABC):
                 logger.info('Challenge already bypassed - expected content is already visible, skipping solve')
                 return True
 
+        if captcha_type != CaptchaType.CLOUDFLARE_INTERSTITIAL:
+            return await self._solve_captcha_with_retries(captcha_container, captcha_type, solver_data, **kwargs)
+
+        # a clearance stored by another context or process lets the page through without solving
+        if await self.restore_clearance(reload=True):
+            return True
+
+        if self.single_flight is not None:
+            return await self._solve_interstitial_single_flight(captcha_container, solver_data, **kwargs)
+
+        result, _ = await self._solve_interstitial(captcha_container, solver_data, **kwargs)
+        return result
+
+    async def _solve_interstitial(self, captcha_container, solver_data: Dict,
+                                  **kwargs) -> Tuple[Union[bool, str], Optional[Clearance]]:
+        """
+        Solve the Cloudflare interstitial and store the clearance it gave
+
+        :param captcha_container: Page, Frame or ElementHandle containing the captcha
+        :param solver_data: Registered solver data of the captcha type
+        **kwargs: Additional parameters passed to the solver
+
+        :return: Tuple (solve result, clearance the page's context received or None)
+        """
+
+        result = await self._solve_captcha_with_retries(captcha_container, CaptchaType.CLOUDFLARE_INTERSTITIAL,
+                                                        solver_data, **kwargs)
+        if not result:
+            return result, None
+
+        # only wait for a late clearance cookie if it's stored or shared with the waiting solvers
+        shared = self.clearance_store is not None or self.single_flight is not None
+        clearance = await self._wait_for_clearance(None if shared else 0)
+        if clearance is not None and self.clearance_store is not None:
+            key = await get_clearance_key(self.page, self.proxy)
+            await self.clearance_store.set(key, clearance)
+            logger.info(f'Stored clearance for {key.domain}')
+
+        return result, clearance
+
+    async def _solve_interstitial_single_flight(self, captcha_container, solver_data: Dict,
+                                                **kwargs) -> Union[bool, str]:
+        """
+        Solve the Cloudflare interstitial once per domain, user agent and proxy across the pool:
+        the first solver solves it, the others wait, then take its clearance cookies (or just reload, if the pages
+        share the context) instead of solving the same challenge again.
+        If the shared solve times out, is cancelled or fails, or its clearance doesn't work here, the shared solve
+        is retried (one of the waiting solvers becomes the new leader), up to self.max_attempts rounds
+
+        :param captcha_container: Page, Frame or ElementHandle containing the captcha
+        :param solver_data: Registered solver data of the captcha type
+        **kwargs: Additional parameters passed to the solver
+
+        :return bool or str: True/False for success-based solvers, token string for token-based solvers
+                             (True for the pages that got the clearance from another solver)
+
+        :raises Exception: The error of the last shared solve if no round succeeded
+        """
+
+        key = await get_clearance_key(self.page, self.proxy)
+        last_exception = None
+
+        for _ in range(max(self.max_attempts, 1)):
+            leader = False
+
+            async def solve() -> Tuple[Union[bool, str], Optional[Clearance]]:
+                nonlocal leader
+                leader = True
+                return await self._solve_interstitial(captcha_container, solver_data, **kwargs)
+
+            try:
+                (result, clearance), _ = await self.single_flight.do(key, solve)
+            except (asyncio.TimeoutError, CaptchaSolvingCancelledError) as e:
+                logger.warning(f'Shared solve of {key.domain} did not finish ({type(e).__name__}), '
+                               f'electing a new leader')
+                last_exception = e
+                continue
+            except Exception as e:
+                if leader:
+                    raise
+                # the error may be specific to the leader's page (e.g. it was closed)
+                logger.warning(f'Shared solve of {key.domain} failed ({e}), electing a new leader')
+                last_exception = e
+                continue
+
+            if leader or not result:
+                return result
+
+            if clearance is not None:
+                await apply_clearance(self.page.context, clearance)
+                logger.info(f'Applied the clearance of the shared solve for {key.domain}')
+
+            await self.page.goto(self.page.url)  # camoufox doesn't work with page.reload() properly
+
+            if not await self._is_interstitial_challenged():
+                return True
+
+            logger.info(f'Clearance of the shared solve was not accepted for {key.domain}, retrying the shared solve')
+
+        if last_exception is not None:
+            raise last_exception
+
+        return False
+
+    async def _is_interstitial_challenged(self) -> bool:
+        """Check if the page's current document is the Cloudflare interstitial (by headers, or by DOM if unknown)"""
+
+        challenged = get_challenge_state(self.page)
+        if challenged is None:
+            from playwright_captcha.solvers.click.cloudflare.utils.detection import detect_cloudflare_challenge
+            challenged = await detect_cloudflare_challenge(self.page, 'interstitial')
+
+        return bool(challenged)
+
+    async def _solve_captcha_with_retries(self, captcha_container, captcha_type: CaptchaType, solver_data: Dict,
+                                          **kwargs) -> Union[bool, str]:
+        """
+        Solve the captcha, retrying up to self.max_attempts times
+
+        :param captcha_container: Page, Frame or ElementHandle containing the captcha
+        :param captcha_type: Type of captcha to solve
+        :param solver_data: Registered solver data of the captcha type
+        **kwargs: Additional parameters passed to the solver
+
+        :return bool or str: True/False for success-based solvers, token string for token-based solvers
+
+        :raises Exception: The last error if all attempts failed
+        """
+
         last_exception = None
         for attempt in range(1, self.max_attempts + 1):
             logger.info(f'Solving {captcha_type.value} captcha, attempt {attempt}/{self.max_attempts}')
@@ -366,6 +576,104 @@ class BaseSolver(ABC):
 
         raise last_exception
 
+    async def restore_clearance(self, url: Optional[str] = None, reload: bool = False) -> bool:
+        """
+        Inject the stored Cloudflare clearance for the page's domain, user agent and proxy into the page's context.
+        Call it before page.goto(url) to skip the challenge entirely
+
+        :param url: URL the clearance is needed for (the page's current URL by default)
+        :param reload: Reload the page and verify that the challenge is gone (the clearance is dropped if it's not)
+
+        :return: True if a valid clearance was injected (and accepted, if reload is True)
+        """
+
+        if self.clearance_store is None:
+            return False
+
+        url = url or self.page.url
+        key = await get_clearance_key(self.page, self.proxy, url)
+        clearance = await self.clearance_store.get(key)
+        if clearance is None:
+            logger.debug(f'No stored clearance for {key.domain}')
+            return False
+
+        await apply_clearance(self.page.context, clearance)
+        logger.info(f'Injected stored clearance for {key.domain}')
+
+        if not reload:
+            return True
+
+        await self.page.goto(url)  # camoufox doesn't work with page.reload() properly
+
+        if await self._is_interstitial_challenged():
+            logger.info(f'Stored clearance for {key.domain} was rejected, dropping it')
+            await self.clearance_store.delete(key)
+            return False
+
+        return True
+
+    async def _wait_for_clearance(self, timeout: Optional[float] = None) -> Optional[Clearance]:
+        """
+        Get the clearance of the page's context, waiting for it if the solve hasn't delivered it yet
+        (API solvers only pass the token to the page, the cookie comes with a later response)
+
+        :param timeout: Maximum time in seconds to wait for the cf_clearance cookie or an unchallenged document
+                        (CLEARANCE_WAIT_TIMEOUT by default)
+
+        :return: Clearance, None if the context has no clearance cookie within the timeout
+        """
+
+        timeout = CLEARANCE_WAIT_TIMEOUT if timeout is None else timeout
+        ttl = self.clearance_store.ttl if self.clearance_store is not None else DEFAULT_CLEARANCE_TTL
+
+        if timeout <= 0:
+            return await extract_clearance(self.page.context, self.page.url, ttl)
+
+        from playwright_captcha.solvers.click.cloudflare.utils.completion import wait_for_challenge_completion
+
+        # start listening before checking the cookie, so a response arriving in between isn't missed
+        completion = asyncio.ensure_future(
+            wait_for_challenge_completion(self.framework, self.page, self.page, None, 'interstitial', timeout)
+        )
+        await asyncio.sleep(0)
+
+        try:
+            clearance = await extract_clearance(self.page.context, self.page.url, ttl)
+            if clearance is None:
+                logger.debug('Waiting for the clearance cookie...')
+                await completion
+                clearance = await extract_clearance(self.page.context, self.page.url, ttl)
+        finally:
+            if not completion.done():
+                completion.cancel()
+                await asyncio.gather(completion, return_exceptions=True)
+
+        return clearance
+
+    async def store_clearance(self, timeout: Optional[float] = None) -> bool:
+        """
+        Store the Cloudflare clearance the page's context received, for other contexts and processes
+
+        :param timeout: Maximum time in seconds to wait for the clearance cookie if the context doesn't have it yet
+                        (CLEARANCE_WAIT_TIMEOUT by default)
+
+        :return: True if a clearance cookie was found and stored
+        """
+
+        if self.clearance_store is None:
+            return False
+
+        clearance = await self._wait_for_clearance(timeout)
+        if clearance is None:
+            logger.debug('No clearance cookie to store')
+            return False
+
+        key = await get_clearance_key(self.page, self.proxy)
+        await self.clearance_store.set(key, clearance)
+        logger.info(f'Stored clearance for {key.domain}')
+
+        return True
+
     async def apply_captcha(self, captcha_type: CaptchaType, token: str, **kwargs) -> None:
         """
         Apply the solved captcha token to the page
@@ -1,13 +1,16 @@
+import asyncio
 import logging
 from typing import Optional, Union, Literal
 
-from playwright.async_api import Page, ElementHandle, Frame, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import Page, ElementHandle, Frame, Locator
 
+from playwright_captcha.solvers.click.cloudflare.utils.completion import wait_for_challenge_completion
 from playwright_captcha.solvers.click.cloudflare.utils.detection import detect_cloudflare_challenge
 from playwright_captcha.solvers.click.cloudflare.utils.dom_helpers import get_ready_checkbox
 from playwright_captcha.solvers.click.common.detection import detect_expected_content
-from playwright_captcha.solvers.click.common.shadow_root import search_shadow_root_iframes, search_shadow_root_elements
+from playwright_captcha.solvers.click.common.shadow_root import search_shadow_root_iframes
 from playwright_captcha.types import FrameworkType
+from playwright_captcha.utils.challenge_monitor import get_challenge_state
 from playwright_captcha.utils.exceptions import CaptchaSolvingError, CaptchaDetectionError
 
 logger = logging.getLogger(__name__)
@@ -22,6 +25,7 @@ async def solve_cloudflare_by_click(
         solve_click_delay: int = 6,
         wait_checkbox_attempts: int = 10,
         wait_checkbox_delay: int = 6,
+        wait_checkbox_timeout: Optional[float] = None,
         checkbox_click_attempts: int = 3,
 ) -> None:
     """
@@ -32,9 +36,10 @@ async def solve_cloudflare_by_click(
     :param captcha_container: Page, Frame, ElementHandle
     :param challenge_type: Type of Cloudflare challenge: "interstitial" or "turnstile"
     :param expected_content_selector: Optional CSS selector to verify page content is accessible after solving
-    :param solve_click_delay: Delay after clicking the checkbox to allow Cloudflare to process the click
-    :param wait_checkbox_attempts: Maximum number of attempts to find the checkbox and wait for it to be ready
-    :param wait_checkbox_delay: Delay between wait_checkbox_attempts in seconds to find the checkbox and wait for it to be ready
+    :param solve_click_delay: Maximum time in seconds to wait for Cloudflare to complete the challenge after the click
+    :param wait_checkbox_attempts: Kept for compatibility, the default checkbox timeout is wait_checkbox_attempts * wait_checkbox_delay
+    :param wait_checkbox_delay: Kept for compatibility, the default checkbox timeout is wait_checkbox_attempts * wait_checkbox_delay
+    :param wait_checkbox_timeout: Overall time in seconds to find the checkbox in all iframes and wait for it to be ready
     :param checkbox_click_attempts: Maximum number of attempts to click the checkbox
 
     :return: None if solved, Exception otherwise
@@ -46,12 +51,19 @@ async def solve_cloudflare_by_click(
     logger.info(f'Starting Cloudflare {challenge_type} challenge solving by click...')
 
     # 1. check if Cloudflare challenge is present
-    cloudflare_detected = await detect_cloudflare_challenge(captcha_container, challenge_type)
-    expected_content_detected = await detect_expected_content(page, captcha_container, expected_content_selector)
-    if not cloudflare_detected or expected_content_detected:
-        logger.info('No Cloudflare challenge detected')
+    # the interstitial is classified by the navigation response headers, the DOM is only checked if they can't tell
+    challenged = get_challenge_state(page) if challenge_type == "interstitial" else None
+    if challenged is False:
+        logger.info('No Cloudflare challenge detected (response headers)')
         return
 
+    if challenged is None:
+        cloudflare_detected = await detect_cloudflare_challenge(captcha_container, challenge_type)
+        expected_content_detected = await detect_expected_content(page, captcha_container, expected_content_selector)
+        if not cloudflare_detected or expected_content_detected:
+            logger.info('No Cloudflare challenge detected')
+            return
+
     # 2. find Cloudflare iframes
     cf_iframes = await search_shadow_root_iframes(
         framework=framework,
@@ -61,47 +73,47 @@ async def solve_cloudflare_by_click(
     if not cf_iframes:
         raise CaptchaDetectionError(f'Cloudflare iframes not found')
 
-    # 3. in all found iframes, search for the valid checkbox input and wait until it's ready to be clicked
-    checkbox_data = await get_ready_checkbox(
-        framework=framework,
-        iframes=cf_iframes,
-        delay=wait_checkbox_delay,
-        attempts=wait_checkbox_attempts)
+    # 3. in all found iframes (concurrently), search for the valid checkbox input and wait until it's ready to be clicked
+    if wait_checkbox_timeout is None:
+        wait_checkbox_timeout = max(wait_checkbox_attempts, 1) * wait_checkbox_delay
+    checkbox_data = await get_ready_checkbox(framework=framework, iframes=cf_iframes, timeout=wait_checkbox_timeout)
     if not checkbox_data:
         raise CaptchaDetectionError(f'Cloudflare checkbox not found or not ready')
     iframe, checkbox = checkbox_data
 
     logger.info('Found checkbox in Cloudflare iframe')
 
-    # 4. click the checkboxs
-    if challenge_type == "interstitial":
-        # click checkbox and wait for page to reload or challenge to disappear
-        await click_checkbox(checkbox, checkbox_click_attempts)
-        
-        try:
-            # wait for networkidle state (page fully loaded with no network activity)
-            await page.wait_for_load_state("networkidle", timeout=solve_click_delay * 1000)
-        except PlaywrightTimeoutError:
-            logger.debug("Network did not become idle within timeout, checking challenge status")
-        
-        # verify challenge is solved
-        cloudflare_detected = await detect_cloudflare_challenge(captcha_container)
-        challenge_solved = not cloudflare_detected
-    elif challenge_type == "turnstile":
-        # turnstile Success - Check that the `success` element is visible and showing
-        await click_checkbox(checkbox, checkbox_click_attempts)
-        success_elements = await search_shadow_root_elements(framework, iframe, 'div[id="success"]')
-        if success_element := next(iter(success_elements), None):
-            try:
-                await success_element.wait_for_element_state("visible", timeout=solve_click_delay * 1000)
-                challenge_solved = True
-            except PlaywrightTimeoutError:
-                challenge_solved = False
-        else:
-            raise CaptchaDetectionError("Cloudflare turnstile success element does not exist on the page.")
-    else:
+    # 4. click the checkbox, watching for the completion signals from before the click (so none is missed)
+    if challenge_type not in ("interstitial", "turnstile"):
         raise CaptchaDetectionError("Unsupported Cloudflare Captcha Type: %s", challenge_type)
 
+    # the timeout starts after the (possibly retried) click, so the retries don't use up Cloudflare's time
+    clicked = asyncio.Event()
+    completion = asyncio.create_task(wait_for_challenge_completion(
+        framework=framework,
+        page=page,
+        captcha_container=captcha_container,
+        iframe=iframe,
+        challenge_type=challenge_type,
+        timeout=solve_click_delay,
+        armed=clicked
+    ))
+    await asyncio.sleep(0)  # let the watcher subscribe to the page events
+    try:
+        await click_checkbox(checkbox, checkbox_click_attempts)
+        clicked.set()
+    except Exception:
+        completion.cancel()
+        await asyncio.gather(completion, return_exceptions=True)
+        raise
+
+    # resolves on the first definitive signal: cf_clearance cookie, navigation away from the challenge,
+    # turnstile response token or the success element
+    challenge_solved = await completion is not None
+    if not challenge_solved and challenge_type == "interstitial":
+        # no signal in time - check the current state of the page
+        challenge_solved = not await detect_cloudflare_challenge(page, challenge_type)
+
     # 5. validate Success
     expected_content_detected = await detect_expected_content(page, captcha_container, expected_content_selector)
     if challenge_solved or expected_content_detected:
@@ -112,11 +124,11 @@ async def solve_cloudflare_by_click(
         'Failed to solve Cloudflare challenge by click: challenge still present or expected content not detected')
 
 
-async def click_checkbox(checkbox: ElementHandle, checkbox_click_attempts: int):
+async def click_checkbox(checkbox: Union[ElementHandle, Locator], checkbox_click_attempts: int):
     """
     Click the checkbox with retry logic
     
-    :param checkbox: ElementHandle of the checkbox to click
+    :param checkbox: ElementHandle or Locator of the checkbox to click
     :param checkbox_click_attempts: Maximum number of attempts to click the checkbox
     :raises CaptchaSolvingError: If checkbox click fails after all attempts
     """
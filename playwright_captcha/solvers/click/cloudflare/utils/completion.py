@@ -0,0 +1,161 @@
+import asyncio
+import logging
+from typing import Optional, Literal, Set, Union
+
+from playwright.async_api import Page, Frame, ElementHandle, Response
+
+from playwright_captcha.solvers.click.cloudflare.utils.detection import detect_cloudflare_challenge
+from playwright_captcha.solvers.click.common.selector_engine import is_deep_selector_engine_available, deep_locator
+from playwright_captcha.solvers.click.common.shadow_root import wait_for_ready_element, DEEP_QUERY_SELECTOR_ALL_JS
+from playwright_captcha.types import FrameworkType
+
+logger = logging.getLogger(__name__)
+
+# completion signals, in the order they usually arrive
+SIGNAL_CLEARANCE_COOKIE = 'clearance_cookie'  # a response set the cf_clearance cookie
+SIGNAL_NAVIGATION = 'navigation'  # the page loaded a document without the challenge
+SIGNAL_TURNSTILE_RESPONSE = 'turnstile_response'  # the cf-turnstile-response input got the token
+SIGNAL_SUCCESS_ELEMENT = 'success_element'  # the widget shows its success state
+
+CF_TURNSTILE_SUCCESS_SELECTOR = 'div[id="success"]'
+
+# true once any cf-turnstile-response input (in the document or a shadow root) has a value
+TURNSTILE_RESPONSE_FILLED_JS = """
+() => (%s)('input[name="cf-turnstile-response"]').some((input) => !!input.value)
+""" % DEEP_QUERY_SELECTOR_ALL_JS.strip()
+
+
+async def _wait_turnstile_response(captcha_container: Union[Page, Frame], timeout: float) -> bool:
+    """
+    Wait until the turnstile token is written to the response input (set as a property, so it has to be polled).
+    Input values are visible in isolated worlds too, so no main world evaluation is needed
+
+    :param captcha_container: Page or Frame containing the turnstile widget
+    :param timeout: Maximum time to wait in seconds
+
+    :return: True once the input has a value
+    """
+
+    await captcha_container.wait_for_function(TURNSTILE_RESPONSE_FILLED_JS, polling=100, timeout=timeout * 1000)
+
+    return True
+
+
+async def _wait_success_element(framework: FrameworkType, iframe: Frame, timeout: float) -> bool:
+    """
+    Wait until the widget's success element is visible
+
+    :param framework: Framework type (e.g. PLAYWRIGHT, PATCHRIGHT, CAMOUFOX)
+    :param iframe: Cloudflare iframe with the clicked checkbox
+    :param timeout: Maximum time to wait in seconds
+
+    :return: True if the success element became visible
+    """
+
+    if await is_deep_selector_engine_available(iframe.page):
+        await deep_locator(iframe, CF_TURNSTILE_SUCCESS_SELECTOR).first.wait_for(state='visible', timeout=timeout * 1000)
+        return True
+
+    return await wait_for_ready_element(framework, iframe, CF_TURNSTILE_SUCCESS_SELECTOR, timeout=timeout) is not None
+
+
+async def wait_for_challenge_completion(
+        framework: FrameworkType,
+        page: Page,
+        captcha_container: Union[Page, Frame, ElementHandle],
+        iframe: Optional[Frame],
+        challenge_type: Literal['interstitial', 'turnstile'],
+        timeout: float,
+        armed: Optional[asyncio.Event] = None
+) -> Optional[str]:
+    """
+    Wait for the Cloudflare challenge to be completed after the checkbox click, racing all completion signals:
+    cf_clearance Set-Cookie response, navigation to a document without the challenge (interstitial),
+    cf-turnstile-response input getting a value and the success element appearing (turnstile).
+    Resolves as soon as the first one arrives
+
+    :param framework: Framework type (e.g. PLAYWRIGHT, PATCHRIGHT, CAMOUFOX)
+    :param page: Playwright Page
+    :param captcha_container: Page, Frame, ElementHandle
+    :param iframe: Cloudflare iframe with the clicked checkbox
+    :param challenge_type: Type of Cloudflare challenge: "interstitial" or "turnstile"
+    :param timeout: Maximum time to wait in seconds
+    :param armed: Event starting the timeout (e.g. set once the checkbox is clicked), the page events are watched
+                  from the start anyway, so no signal is missed. None to start the timeout right away
+
+    :return: Name of the first completion signal (SIGNAL_*), None if none arrived within the timeout
+    """
+
+    loop = asyncio.get_running_loop()
+    completed: asyncio.Future = loop.create_future()
+    tasks: Set[asyncio.Task] = set()
+
+    def complete(signal: str) -> None:
+        if not completed.done():
+            completed.set_result(signal)
+
+    def run(coroutine) -> None:
+        task = loop.create_task(coroutine)
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    async def check_clearance_cookie(response: Response) -> None:
+        try:
+            # set-cookie is not in the response.headers shortcut
+            set_cookie = await response.header_value('set-cookie')
+        except Exception:
+            return
+        if set_cookie and 'cf_clearance=' in set_cookie:
+            complete(SIGNAL_CLEARANCE_COOKIE)
+
+    async def check_navigation() -> None:
+        # a new document may just be the challenge again (e.g. failed verification)
+        if not await detect_cloudflare_challenge(page, 'interstitial'):
+            complete(SIGNAL_NAVIGATION)
+
+    async def signal_when(coroutine, signal: str) -> None:
+        try:
+            if await coroutine:
+                complete(signal)
+        except Exception as e:
+            # e.g. the frame navigated away - another signal covers it
+            logger.debug(f'Completion signal "{signal}" is not available: {e}')
+
+    def on_response(response: Response) -> None:
+        run(check_clearance_cookie(response))
+
+    def on_domcontentloaded(_: Page) -> None:
+        run(check_navigation())
+
+    page.on('response', on_response)
+    if challenge_type == 'interstitial':
+        page.on('domcontentloaded', on_domcontentloaded)
+
+    try:
+        if armed is not None:
+            armed_waiter = loop.create_task(armed.wait())
+            try:
+                await asyncio.wait([completed, armed_waiter], return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                armed_waiter.cancel()
+
+        # the turnstile signals are states of the page (not events), so they can be polled from now on
+        if challenge_type == 'turnstile' and not completed.done():
+            container = captcha_container if hasattr(captcha_container, 'wait_for_function') else page
+            run(signal_when(_wait_turnstile_response(container, timeout), SIGNAL_TURNSTILE_RESPONSE))
+            if iframe is not None:
+                run(signal_when(_wait_success_element(framework, iframe, timeout), SIGNAL_SUCCESS_ELEMENT))
+
+        signal = await asyncio.wait_for(completed, timeout)
+        logger.debug(f'Cloudflare challenge completion signal: {signal}')
+        return signal
+    except asyncio.TimeoutError:
+        logger.debug(f'No Cloudflare challenge completion signal within {timeout} seconds')
+        return None
+    finally:
+        page.remove_listener('response', on_response)
+        if challenge_type == 'interstitial':
+            page.remove_listener('domcontentloaded', on_domcontentloaded)
+        for task in list(tasks):
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -5,9 +5,12 @@ from playwright.async_api import ElementHandle, Frame, Page
 
 logger = logging.getLogger(__name__)
 
-# selectors for detecting Cloudflare interstitial challenge (page)
+# selectors for detecting Cloudflare interstitial challenge (page).
+# only the challenge page loads the orchestrate script from '/h/', bot management scripts on normal pages
+# (e.g. next to a turnstile widget) load '/cdn-cgi/challenge-platform/scripts/...'
 CF_INTERSTITIAL_INDICATORS_SELECTORS = [
-    'script[src*="/cdn-cgi/challenge-platform/"]',
+    'script[src*="/cdn-cgi/challenge-platform/h/"]',
+    '#challenge-form',
 ]
 
 # selectors for detecting Cloudflare turnstile challenge (small embedded captcha)
@@ -16,6 +19,22 @@ CF_TURNSTILE_INDICATORS_SELECTORS = [
     'script[src*="challenges.cloudflare.com/turnstile/v0"]',
 ]
 
+# selectors of Cloudflare turnstile widget containers
+CF_TURNSTILE_CONTAINER_SELECTORS = [
+    '.cf-turnstile',
+]
+
+# regex patterns for detecting the challenges in the raw HTML (before any script ran, e.g. HTTP probes).
+# the plain '/cdn-cgi/challenge-platform/' is not enough here, bot management scripts on normal pages use it too
+CF_INTERSTITIAL_SOURCE_PATTERNS = [
+    r'window\._cf_chl_opt',
+    r'/cdn-cgi/challenge-platform/h/',
+]
+CF_TURNSTILE_SOURCE_PATTERNS = [
+    r'challenges\.cloudflare\.com/turnstile/v0',
+    r'class="[^"]*\bcf-turnstile\b',
+]
+
 
 async def detect_cloudflare_challenge(
         captcha_container: Union[Page, Frame, ElementHandle],
@@ -1,73 +1,112 @@
 import asyncio
 import logging
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Union, Awaitable, Any
 
-from playwright.async_api import Frame, ElementHandle
+from playwright.async_api import Frame, ElementHandle, Locator
 
-from playwright_captcha.solvers.click.common.shadow_root import search_shadow_root_elements
+from playwright_captcha.solvers.click.common.selector_engine import is_deep_selector_engine_available, deep_locator
+from playwright_captcha.solvers.click.common.shadow_root import wait_for_ready_element
 from playwright_captcha.types import FrameworkType
 
 logger = logging.getLogger(__name__)
 
+CHECKBOX_SELECTOR = 'input[type="checkbox"]'
 
-async def get_ready_checkbox(
+
+async def _first_result(awaitables: List[Awaitable[Any]]) -> Optional[Any]:
+    """
+    Run the awaitables concurrently and return the result of the first one that succeeds, cancelling the rest
+
+    :param awaitables: Awaitables to race
+
+    :return: Result of the first successful awaitable, None if all of them failed
+    """
+
+    tasks = {asyncio.ensure_future(awaitable) for awaitable in awaitables}
+    try:
+        while tasks:
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                logger.debug(f'Checkbox probe failed: {task.exception()}')
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    return None
+
+
+async def _wait_ready_checkbox(
         framework: FrameworkType,
-        iframes: List[Frame],
-        delay: int,
-        attempts: int
-) -> Optional[Tuple[Frame, ElementHandle]]:
+        iframe: Frame,
+        deadline: float,
+        use_locators: bool
+) -> Tuple[Frame, Union[ElementHandle, Locator]]:
     """
-    Accepts a list of Cloudflare iframes, sorts out detached ones, collects checkboxes from the remaining iframes,
-    and waits until at least one checkbox is found and ready to be clicked (visible)
+    Wait until a checkbox in the iframe is ready to be clicked (visible), before the deadline
 
     :param framework: Framework type (e.g. PLAYWRIGHT, PATCHRIGHT, CAMOUFOX)
-    :param iframes: Cloudflare iframes
-    :param delay: Delay in seconds between attempts to find the checkbox
-    :param attempts: Maximum number of attempts to find the checkbox
+    :param iframe: Cloudflare iframe
+    :param deadline: Event loop time by which the checkbox must be ready
+    :param use_locators: Use the shadow-piercing selector engine (Playwright's auto-waiting)
+
+    :return: Tuple (checkbox Frame, checkbox ElementHandle or Locator)
 
-    :return: Tuple (checkboxes Frame, checkboxes ElementHandle) if checkbox is found and ready, None otherwise
+    :raises TimeoutError: If no checkbox was ready before the deadline
     """
 
-    logger.debug(f'Waiting for Cloudflare checkbox input in {len(iframes)} iframes '
-                 f'with {attempts} attempts and {delay} seconds delay')
+    loop = asyncio.get_running_loop()
+
+    if use_locators:
+        checkbox = deep_locator(iframe, CHECKBOX_SELECTOR).first
+        # at least 1ms, 0 disables Playwright's timeout
+        await checkbox.wait_for(state='visible', timeout=max((deadline - loop.time()) * 1000, 1))
+        return iframe, checkbox
 
-    # ensure at least one attempt
-    if attempts <= 0:
-        attempts = 1
+    # the in-frame watcher signals the moment the checkbox is attached, visible and stable
+    checkbox = await wait_for_ready_element(framework, iframe, CHECKBOX_SELECTOR, timeout=max(deadline - loop.time(), 0))
+    if checkbox:
+        return iframe, checkbox
 
-    for attempt in range(attempts):
-        try:
-            checkboxes = []
+    raise TimeoutError('No ready checkbox in Cloudflare iframe')
+
+
+async def get_ready_checkbox(
+        framework: FrameworkType,
+        iframes: List[Frame],
+        timeout: float
+) -> Optional[Tuple[Frame, Union[ElementHandle, Locator]]]:
+    """
+    Accepts a list of Cloudflare iframes, sorts out detached ones and probes the remaining iframes concurrently
+    until a checkbox is found and ready to be clicked (visible), returning as soon as the first one is.
+    If the shadow-piercing selector engine is registered, the checkbox is returned as a Locator
 
-            # search for checkboxes in each iframe
-            for iframe in iframes:
-                try:
-                    if iframe.is_detached():  # skip detached iframes
-                        continue
+    :param framework: Framework type (e.g. PLAYWRIGHT, PATCHRIGHT, CAMOUFOX)
+    :param iframes: Cloudflare iframes
+    :param timeout: Overall time in seconds to wait for the checkbox in all iframes
 
-                    iframe_checkboxes = await search_shadow_root_elements(framework, iframe, 'input[type="checkbox"]')
+    :return: Tuple (checkboxes Frame, checkboxes ElementHandle or Locator) if checkbox is found and ready, None otherwise
+    """
 
-                    # add found checkboxes to the list with their parent iframe
-                    checkboxes += [(iframe, iframe_checkbox) for iframe_checkbox in iframe_checkboxes]
-                except Exception as e:
-                    logger.error(f'Error searching for checkboxes in iframe: {e}')
+    iframes = [iframe for iframe in iframes if not iframe.is_detached()]  # skip detached iframes
+    if not iframes:
+        logger.error('No attached Cloudflare iframes to search for the checkbox input')
+        return None
 
-            logger.info(f'Found {len(checkboxes)} checkboxes in {len(iframes)} Cloudflare iframes')
+    logger.debug(f'Waiting for Cloudflare checkbox input in {len(iframes)} iframes for up to {timeout} seconds')
 
-            # filter checkboxes that are visible and ready to be clicked
-            visible_checkboxes = []
-            for iframe, checkbox in checkboxes:
-                if await checkbox.is_visible():
-                    visible_checkboxes.append((iframe, checkbox))
+    use_locators = await is_deep_selector_engine_available(iframes[0].page)
 
-            if visible_checkboxes:
-                logger.info('Checkbox input is ready to be clicked')
-                return visible_checkboxes[0]  # return the first visible checkbox
+    # one deadline for all iframes
+    deadline = asyncio.get_running_loop().time() + timeout
+    checkbox_data = await _first_result(
+        [_wait_ready_checkbox(framework, iframe, deadline, use_locators) for iframe in iframes])
 
-            logger.info('Waiting for Cloudflare checkbox input...')
-            await asyncio.sleep(delay)
-        except Exception as e:
-            logger.error(f'Error while waiting for checkbox: {e}')
+    if checkbox_data:
+        logger.info('Checkbox input is ready to be clicked')
+        return checkbox_data
 
-    logger.error('Max attempts reached while waiting for Cloudflare checkbox input')
+    logger.error('Timed out while waiting for Cloudflare checkbox input')
     return None
@@ -0,0 +1,104 @@
+import asyncio
+import logging
+from typing import List, Optional, Union
+
+from playwright.async_api import Page, Frame, ElementHandle
+
+logger = logging.getLogger(__name__)
+
+
+async def _get_frames_owner(queryable: Union[Page, Frame, ElementHandle]) -> Optional[Union[Page, Frame]]:
+    """
+    Get the page or frame whose frame tree should be searched
+
+    :param queryable: Page, Frame, ElementHandle
+
+    :return: Page or Frame, None if the element is not attached to a frame
+    """
+
+    if hasattr(queryable, 'frames') or hasattr(queryable, 'child_frames'):
+        return queryable
+
+    # element handles only know their frame (one round-trip)
+    return await queryable.owner_frame()
+
+
+def _is_descendant_frame(frame: Frame, ancestor: Frame) -> bool:
+    """
+    Check if the frame is nested (at any depth) in the ancestor frame
+
+    :param frame: Frame to check
+    :param ancestor: Possible ancestor frame
+
+    :return: True if the frame is a descendant of the ancestor
+    """
+
+    parent = frame.parent_frame
+    while parent is not None:
+        if parent == ancestor:
+            return True
+        parent = parent.parent_frame
+
+    return False
+
+
+def match_frames_by_url(owner: Union[Page, Frame], url_filter: str) -> List[Frame]:
+    """
+    Find the attached frames whose URL contains the filter, in the cached frame tree (no browser round-trips)
+
+    :param owner: Page (all its frames) or Frame (its descendant frames)
+    :param url_filter: Substring of the frame URL
+
+    :return: List of matched frames
+    """
+
+    if hasattr(owner, 'frames'):
+        frames = owner.frames
+    else:
+        frames = [frame for frame in owner.page.frames if _is_descendant_frame(frame, owner)]
+
+    return [frame for frame in frames if url_filter in frame.url and not frame.is_detached()]
+
+
+async def wait_for_frames_by_url(
+        queryable: Union[Page, Frame, ElementHandle],
+        url_filter: str,
+        timeout: float = 10
+) -> List[Frame]:
+    """
+    Get the frames whose URL contains the filter, waiting for frameattached/framenavigated events if none is there yet
+
+    :param queryable: Page, Frame, ElementHandle (the frames of its page or frame are searched)
+    :param url_filter: Substring of the frame URL
+    :param timeout: Maximum time to wait for a matching frame in seconds (Default: 10)
+
+    :return: List of matched frames, empty if none appeared within the timeout
+    """
+
+    owner = await _get_frames_owner(queryable)
+    if owner is None:
+        return []
+
+    frames = match_frames_by_url(owner, url_filter)
+    if frames or timeout <= 0:
+        return frames
+
+    page = owner if hasattr(owner, 'frames') else owner.page
+    frame_matched = asyncio.get_running_loop().create_future()
+
+    def on_frame(frame: Frame) -> None:
+        # frames usually attach with an empty url and get it on their first navigation
+        if not frame_matched.done() and frame in match_frames_by_url(owner, url_filter):
+            frame_matched.set_result(None)
+
+    page.on('frameattached', on_frame)
+    page.on('framenavigated', on_frame)
+    try:
+        await asyncio.wait_for(frame_matched, timeout)
+    except asyncio.TimeoutError:
+        logger.debug(f'No frame with url containing "{url_filter}" appeared within {timeout} seconds')
+    finally:
+        page.remove_listener('frameattached', on_frame)
+        page.remove_listener('framenavigated', on_frame)
+
+    return match_frames_by_url(owner, url_filter)
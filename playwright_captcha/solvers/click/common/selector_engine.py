@@ -0,0 +1,89 @@
+import logging
+import weakref
+from typing import Any, Union
+
+from playwright.async_api import Page, Frame, Locator, BrowserContext
+
+from playwright_captcha.utils.js_script import load_js_script
+
+logger = logging.getLogger(__name__)
+
+# name of the selector engine piercing all (including closed) shadow roots, e.g. 'cfdeep=input[type="checkbox"]'
+DEEP_SELECTOR_ENGINE_NAME = 'cfdeep'
+
+# selectors registries (playwright.selectors) the engine was registered in
+_registered_selectors: 'weakref.WeakSet[Any]' = weakref.WeakSet()
+
+# context -> whether the engine is available in it (probed once per context)
+_context_support: 'weakref.WeakKeyDictionary[BrowserContext, bool]' = weakref.WeakKeyDictionary()
+
+
+async def register_deep_selector_engine(selectors: Any) -> None:
+    """
+    Register the shadow-piercing selector engine, so the click solvers can use Locators with Playwright's
+    built-in auto-waiting instead of raw ElementHandles. Safe to call multiple times
+
+    Usage:
+        async with async_playwright() as playwright:
+            await register_deep_selector_engine(playwright.selectors)
+
+    :param selectors: Selectors of the Playwright (Patchright, Camoufox) instance (playwright.selectors)
+    """
+
+    if selectors in _registered_selectors:
+        return
+
+    script = await load_js_script('selectors/deepSelectorEngine.js')
+    try:
+        await selectors.register(DEEP_SELECTOR_ENGINE_NAME, script=script)
+    except Exception as e:
+        # e.g. registered by another copy of this module - the engine is the same
+        if 'already registered' not in str(e):
+            raise
+    _registered_selectors.add(selectors)
+
+    logger.debug(f'Registered "{DEEP_SELECTOR_ENGINE_NAME}" selector engine')
+
+
+async def is_deep_selector_engine_available(page: Page) -> bool:
+    """
+    Check if the shadow-piercing selector engine can be used in the page's context (probed once per context)
+
+    :param page: Playwright Page
+
+    :return: True if the engine is registered in the page's Playwright instance
+    """
+
+    context = page.context
+    supported = _context_support.get(context)
+    if supported is not None:
+        return supported
+
+    try:
+        # unknown engines are rejected when the selector is parsed
+        await page.locator(f'{DEEP_SELECTOR_ENGINE_NAME}=html').count()
+        supported = True
+    except Exception as e:
+        if 'Unknown engine' not in str(e):
+            # e.g. the execution context was destroyed by a navigation - probe again next time
+            logger.debug(f'Failed to probe "{DEEP_SELECTOR_ENGINE_NAME}" selector engine, using shadow root helpers: {e}')
+            return False
+        logger.debug(f'"{DEEP_SELECTOR_ENGINE_NAME}" selector engine is not available, using shadow root helpers: {e}')
+        supported = False
+
+    _context_support[context] = supported
+
+    return supported
+
+
+def deep_locator(queryable: Union[Page, Frame, Locator], selector: str) -> Locator:
+    """
+    Locator matching the CSS selector in the document and in all shadow roots of the queryable object
+
+    :param queryable: Page, Frame or Locator to search in
+    :param selector: CSS selector
+
+    :return: Playwright Locator
+    """
+
+    return queryable.locator(f'{DEEP_SELECTOR_ENGINE_NAME}={selector}')
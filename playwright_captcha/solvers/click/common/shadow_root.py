@@ -1,14 +1,289 @@
 import logging
-from asyncio import create_task, wait, gather, FIRST_COMPLETED, Task, CancelledError
-from typing import Union, List, Optional
+from typing import Union, List, Optional, Any
 
-from playwright.async_api import ElementHandle, Page, Frame, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import ElementHandle, Page, Frame
 
+from playwright_captcha.solvers.click.common.frames import wait_for_frames_by_url
 from playwright_captcha.types import FrameworkType
 
 logger = logging.getLogger(__name__)
 
 
+# whether the node is inside the scope element, also through shadow roots (a shadow host contains its shadow tree)
+IS_IN_SCOPE_JS = """
+(node, scope) => {
+    while (node) {
+        if (scope.contains(node)) return true;
+        node = node.getRootNode().host;
+    }
+    return false;
+}
+"""
+
+# reads the live registry kept by patches/unlockShadowRoot.js, falls back to a single linear traversal
+# (e.g. the patch is not visible in this world or the page was loaded before the patch).
+# the optional scope element (the queried ElementHandle) limits it to the roots inside that element
+GET_SHADOW_ROOTS_JS = """
+(_, scope) => {
+    const isInScope = (%s);
+
+    if (window._shadowRootRegistry) {
+        const roots = window._shadowRootRegistry.getRoots();
+        return scope ? roots.filter((root) => isInScope(root.host, scope)) : roots;
+    }
+
+    const roots = [];
+    const pending = [scope || document];
+    if (scope && scope.shadowRoot) {
+        roots.push(scope.shadowRoot);
+        pending.push(scope.shadowRoot);
+    }
+    while (pending.length) {
+        const node = pending.pop();
+        for (const el of node.querySelectorAll("*")) {
+            const shadow = el.shadowRoot;
+            if (shadow) {
+                roots.push(shadow);
+                pending.push(shadow);
+            }
+        }
+    }
+    return roots;
+}
+""" % IS_IN_SCOPE_JS.strip()
+
+# returns only the elements matching the selector in the document and all shadow roots
+# (or only inside the optional scope element)
+DEEP_QUERY_SELECTOR_ALL_JS = """
+(selector, scope) => {
+    const isInScope = (%s);
+
+    if (window._shadowRootRegistry) {
+        const elements = window._shadowRootRegistry.querySelectorAll(selector);
+        return scope ? elements.filter((el) => el !== scope && isInScope(el, scope)) : elements;
+    }
+
+    const elements = [];
+    const pending = [scope || document];
+    if (scope && scope.shadowRoot) {
+        pending.push(scope.shadowRoot);
+    }
+    while (pending.length) {
+        const node = pending.pop();
+        for (const el of node.querySelectorAll("*")) {
+            if (el.matches(selector)) {
+                elements.push(el);
+            }
+            if (el.shadowRoot) {
+                pending.push(el.shadowRoot);
+            }
+        }
+    }
+    return elements;
+}
+""" % IS_IN_SCOPE_JS.strip()
+
+# waits until elements matching the selector appear in the document or any shadow root, resolves with all of them
+# (or an empty array at the deadline). mutations are observed in the document (or the scope element) and in every
+# shadow root, newly attached roots are picked up through the registry's attach listeners (or the next mutation)
+WAIT_FOR_DEEP_SELECTOR_JS = """
+({ selector, timeout }, scope) => new Promise((resolve) => {
+    const registry = window._shadowRootRegistry;
+    const getShadowRoots = (%s);
+    const deepQuery = (%s);
+    const getRoots = () => getShadowRoots(null, scope);
+    const query = (selector) => deepQuery(selector, scope);
+
+    const found = query(selector);
+    if (found.length) {
+        resolve(found);
+        return;
+    }
+
+    const observers = [];
+    const observedRoots = new WeakSet();
+    let timer = null;
+    let scheduled = false;
+
+    const finish = (elements) => {
+        observers.forEach((observer) => observer.disconnect());
+        if (registry && registry.removeAttachListener) registry.removeAttachListener(onAttach);
+        clearTimeout(timer);
+        resolve(elements);
+    };
+
+    // a single query per animation frame, no matter how many mutations (e.g. of animated attributes) reported
+    const check = () => {
+        if (scheduled) return;
+        scheduled = true;
+        requestAnimationFrame(() => {
+            scheduled = false;
+            const elements = query(selector);
+            if (elements.length) {
+                finish(elements);
+            } else {
+                observeRoots();
+            }
+        });
+    };
+
+    const observe = (root) => {
+        if (observedRoots.has(root)) return;
+        observedRoots.add(root);
+        const observer = new MutationObserver(check);
+        observer.observe(root, { childList: true, subtree: true, attributes: true });
+        observers.push(observer);
+    };
+
+    const observeRoots = () => {
+        observe(scope || document);
+        getRoots().forEach(observe);
+    };
+
+    const onAttach = (root) => {
+        observe(root);
+        check();
+    };
+
+    if (registry && registry.addAttachListener) registry.addAttachListener(onAttach);
+    observeRoots();
+    timer = setTimeout(() => finish([]), timeout);
+})
+""" % (GET_SHADOW_ROOTS_JS.strip(), DEEP_QUERY_SELECTOR_ALL_JS.strip())
+
+# waits until an element matching the selector is attached, visible and stable (same box in two consecutive frames),
+# resolves with it (or an empty array at the deadline). readiness is re-checked on the element's mutations,
+# intersection changes and finished transitions/animations - no polling
+WAIT_FOR_READY_ELEMENT_JS = """
+async ({ selector, timeout }, scope) => {
+    const deadline = Date.now() + timeout;
+    const waitForElements = (%s);
+
+    // same semantics as Playwright's visibility: opacity:0 elements (e.g. custom checkbox inputs) are visible
+    const isVisible = (el) => {
+        if (!el.isConnected) return false;
+        if (el.checkVisibility && !el.checkVisibility({ checkVisibilityCSS: true })) return false;
+        const rect = el.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0 && getComputedStyle(el).visibility !== 'hidden';
+    };
+
+    const nextFrame = () => new Promise((resolve) => requestAnimationFrame(resolve));
+    const isStable = async (el) => {
+        const before = el.getBoundingClientRect();
+        await nextFrame();
+        const after = el.getBoundingClientRect();
+        return before.x === after.x && before.y === after.y &&
+            before.width === after.width && before.height === after.height;
+    };
+
+    // resolves with the element once it's ready, with null if it's detached or the deadline passes
+    const waitReady = (el) => new Promise((resolve) => {
+        const root = el.getRootNode();
+        let done = false;
+        let checking = false;
+        let pending = false;
+
+        const finish = (result) => {
+            if (done) return;
+            done = true;
+            mutationObserver.disconnect();
+            intersectionObserver.disconnect();
+            root.removeEventListener('transitionend', check, true);
+            root.removeEventListener('animationend', check, true);
+            clearTimeout(timer);
+            resolve(result);
+        };
+
+        async function check() {
+            if (done) return;
+            // an event during a check may change the result, re-check once the current one is done
+            if (checking) { pending = true; return; }
+            if (!el.isConnected) return finish(null);
+            checking = true;
+            const visible = isVisible(el);
+            const stable = visible && await isStable(el);
+            checking = false;
+            if (done) return;
+            if (stable && isVisible(el)) return finish(el);
+            if (pending) {
+                pending = false;
+                check();
+            } else if (visible) {
+                // still moving (no event may follow, e.g. a js animation), check again on the next frame
+                requestAnimationFrame(check);
+            }
+        }
+
+        const mutationObserver = new MutationObserver(check);
+        mutationObserver.observe(root, { childList: true, subtree: true, attributes: true });
+        const intersectionObserver = new IntersectionObserver(check);
+        intersectionObserver.observe(el);
+        root.addEventListener('transitionend', check, true);
+        root.addEventListener('animationend', check, true);
+        const timer = setTimeout(() => finish(null), Math.max(deadline - Date.now(), 0));
+
+        check();
+    });
+
+    // the first candidate to become ready wins, null if none does
+    const firstReady = (elements) => new Promise((resolve) => {
+        let pending = elements.length;
+        elements.forEach((el) => waitReady(el).then((ready) => {
+            if (ready) resolve(ready);
+            else if (--pending === 0) resolve(null);
+        }));
+    });
+
+    while (Date.now() < deadline) {
+        const elements = await waitForElements({ selector, timeout: deadline - Date.now() }, scope);
+        if (!elements.length) break;
+
+        const ready = await firstReady(elements);
+        if (ready) return [ready];
+        // the candidates were detached (e.g. the widget re-rendered), wait for new ones
+    }
+    return [];
+}
+""" % WAIT_FOR_DEEP_SELECTOR_JS.strip()
+
+
+async def _evaluate_elements(
+        framework: FrameworkType,
+        queryable: Union[Page, Frame, ElementHandle],
+        js_script: str,
+        arg: Optional[Any] = None
+) -> List[ElementHandle]:
+    """
+    Evaluate the script returning an array of nodes and convert it to ElementHandles
+
+    :param framework: Framework type (e.g. PLAYWRIGHT, PATCHRIGHT, CAMOUFOX)
+    :param queryable: Page, Frame, ElementHandle
+    :param js_script: JavaScript function returning an array of nodes
+    :param arg: Argument passed to the function
+
+    :return: List of ElementHandles
+    """
+
+    # element handles pass themselves as the first argument of the function, the scripts take them as the scope
+    if hasattr(queryable, 'as_element'):
+        js_script = f'(element, arg) => ({js_script})(arg, element)'
+
+    if framework == FrameworkType.PATCHRIGHT:
+        handle = await queryable.evaluate_handle(js_script, arg, isolated_context=False)
+    else:
+        handle = await queryable.evaluate_handle(js_script, arg)
+
+    properties = await handle.get_properties()
+
+    elements = []
+    for prop_handle in properties.values():
+        element = prop_handle.as_element()
+        if element:
+            elements.append(element)
+
+    return elements
+
+
 async def get_shadow_roots(
         framework: FrameworkType,
         queryable: Union[Page, Frame, ElementHandle],
@@ -24,47 +299,34 @@ async def get_shadow_roots(
 
     logger.debug(f'Collecting shadow roots from {queryable}')
 
-    js_script = """
-    () => {
-        const roots = [];
+    shadow_roots = await _evaluate_elements(framework, queryable, GET_SHADOW_ROOTS_JS)
 
-        function collectShadowRoots(node) {
-            if (!node) return;
+    logger.debug(f'Found {len(shadow_roots)} shadow roots')
 
-            const shadow = node.shadowRoot;
-            if (shadow) {
-                roots.push(shadow);
-                collectShadowRoots(shadow);
-            }
+    return shadow_roots
 
-            for (const el of node.querySelectorAll("*")) {
-                if (el.shadowRoot) {
-                    collectShadowRoots(el);
-                }
-            }
-        }
 
-        collectShadowRoots(document);
-        return roots;
-    }
+async def deep_query_selector_all(
+        framework: FrameworkType,
+        queryable: Union[Page, Frame, ElementHandle],
+        selector: str
+) -> List[ElementHandle]:
     """
+    Get the elements matching the selector in the document and in all (including closed) shadow roots,
+    without returning the shadow roots themselves
 
-    if framework == FrameworkType.PATCHRIGHT:
-        handle = await queryable.evaluate_handle(js_script, isolated_context=False)
-    else:
-        handle = await queryable.evaluate_handle(js_script)
+    :param framework: Framework type (e.g. PLAYWRIGHT, PATCHRIGHT, CAMOUFOX)
+    :param queryable: Page, Frame, ElementHandle
+    :param selector: CSS selector
 
-    properties = await handle.get_properties()
+    :return: List of ElementHandles that match the selector
+    """
 
-    shadow_roots = []
-    for prop_handle in properties.values():
-        element = prop_handle.as_element()
-        if element:
-            shadow_roots.append(element)
+    elements = await _evaluate_elements(framework, queryable, DEEP_QUERY_SELECTOR_ALL_JS, selector)
 
-    logger.debug(f'Found {len(shadow_roots)} shadow roots')
+    logger.debug(f'Found {len(elements)} elements matching selector "{selector}" in the document and shadow roots')
 
-    return shadow_roots
+    return elements
 
 
 async def search_shadow_root_elements(
@@ -74,7 +336,8 @@ async def search_shadow_root_elements(
         timeout: float = 10
 ) -> List[ElementHandle]:
     """
-    Search for elements by selector within the shadow DOM of the queryable object
+    Wait for elements by selector within the document and all shadow roots of the queryable object.
+    A single in-page waiter is used (one protocol round-trip, one deadline), however many shadow roots there are
 
     :param framework: Framework type (e.g. PATCHRIGHT, CAMOUFOX, PLAYWRIGHT)
     :param queryable: Page, Frame, ElementHandle
@@ -87,66 +350,68 @@ async def search_shadow_root_elements(
     logger.debug(f'Searching for elements by selector "{selector}" in {queryable}')
 
     elements = []
-    tasks: set[Task] = set()
     try:
-        shadow_roots = await get_shadow_roots(framework, queryable)  # get all shadow roots in the queryable object
-        for shadow_root in shadow_roots:
-            # find all elements by selector within the shadow root
-            tasks.add(
-                create_task(shadow_root.wait_for_selector(selector, timeout=timeout * 1000))
-            )
-
-        while tasks:
-            completed_tasks, tasks = await wait(tasks, return_when=FIRST_COMPLETED)
-            for task in completed_tasks:
-                try:
-                    if element_handle := task.result():
-                        if element := element_handle.as_element():
-                            elements.append(element)
-                            break
-                except PlaywrightTimeoutError:
-                    logger.debug("Searching shadow root for selector (%s) timed out", selector)
-                except CancelledError:
-                    continue
-            else:
-                continue
-            break
-
+        elements = await _evaluate_elements(
+            framework, queryable, WAIT_FOR_DEEP_SELECTOR_JS, {'selector': selector, 'timeout': timeout * 1000}
+        )
+        if not elements:
+            logger.debug("Searching shadow roots for selector (%s) timed out", selector)
     except Exception as e:
+        # e.g. the frame navigated or detached while waiting
         logger.error(f'Error searching for elements: {e}')
 
-    finally:
-        if tasks:
-            for task in tasks:
-                task.cancel()
-            await gather(*tasks, return_exceptions=True)
-
-    # fallback: search the main document directly (not just shadow roots).
-    if not elements:
-        try:
-            direct_elements = await queryable.query_selector_all(selector)
-            if direct_elements:
-                logger.debug(f'Found {len(direct_elements)} elements via direct query fallback for selector "{selector}"')
-                elements.extend(direct_elements)
-        except Exception as e:
-            logger.debug(f'Direct query fallback failed for selector "{selector}": {e}')
-
     logger.debug(f'Found {len(elements)} elements matching selector "{selector}"')
 
     return elements
 
 
+async def wait_for_ready_element(
+        framework: FrameworkType,
+        queryable: Union[Page, Frame, ElementHandle],
+        selector: str,
+        timeout: float = 10
+) -> Optional[ElementHandle]:
+    """
+    Wait for an element matching the selector (in the document or any shadow root) to be attached, visible and stable.
+    The in-page watcher reacts to DOM, intersection and animation events, so the element is returned
+    as soon as it's ready to be clicked, in a single protocol round-trip
+
+    :param framework: Framework type (e.g. PATCHRIGHT, CAMOUFOX, PLAYWRIGHT)
+    :param queryable: Page, Frame, ElementHandle
+    :param selector: CSS selector
+    :param timeout: Timeout value in seconds to wait for the element to be ready (Default: 10)
+
+    :return: ElementHandle of the ready element, None if no element was ready within the timeout
+    """
+
+    logger.debug(f'Waiting for element by selector "{selector}" to be ready in {queryable}')
+
+    try:
+        elements = await _evaluate_elements(
+            framework, queryable, WAIT_FOR_READY_ELEMENT_JS, {'selector': selector, 'timeout': timeout * 1000}
+        )
+    except Exception as e:
+        # e.g. the frame navigated or detached while waiting
+        logger.error(f'Error waiting for element to be ready: {e}')
+        return None
+
+    return next(iter(elements), None)
+
+
 async def search_shadow_root_iframes(
         framework: FrameworkType,
         captcha_container: Union[Page, Frame, ElementHandle],
-        src_filter: str
+        src_filter: str,
+        timeout: float = 10
 ) -> Optional[List[Frame]]:
     """
-    Search for an iframe within the shadow DOM, src of which includes the src_filter
+    Search for an iframe, src of which includes the src_filter. The frame tree Playwright already keeps is checked first
+    (no browser round-trips, waits for the frame by events), the shadow DOM is searched only if no frame matches
 
     :param framework: Framework type (e.g. PATCHRIGHT, CAMOUFOX, PLAYWRIGHT)
     :param captcha_container: Page, Frame, ElementHandle
     :param src_filter: String to filter the iframe's src attribute
+    :param timeout: Timeout value in seconds to wait for the iframe to appear (Default: 10)
 
     :return: list of matched iframes or empty list if no iframes found
     """
@@ -156,37 +421,28 @@ async def search_shadow_root_iframes(
     matched_iframes = []
 
     try:
-        iframe_elements = await search_shadow_root_elements(framework, captcha_container, 'iframe')
-        for iframe_element in iframe_elements:
-            src_prop = await iframe_element.get_property('src')
-            src = await src_prop.json_value()
-
-            if src_filter in src:
-                cf_iframe = await iframe_element.content_frame()
-                if cf_iframe and cf_iframe.is_detached():  # skip detached iframes
-                    continue
-
-                matched_iframes.append(cf_iframe)
+        matched_iframes = await wait_for_frames_by_url(captcha_container, src_filter, timeout)
     except Exception as e:
-        logger.error(f'Error searching for iframes: {e}')
+        logger.error(f'Error searching for iframes in the frame tree: {e}')
 
-    # Fallback: search page.frames directly
+    # fallback: the frame url may differ from the iframe src attribute, search the shadow DOM once (already waited above)
     if not matched_iframes:
-        logger.debug(f'Shadow DOM traversal found no iframes, falling back to page.frames search')
+        logger.debug(f'Frame tree search found no iframes, falling back to shadow DOM search')
         try:
-            frames_owner = None
-            if hasattr(captcha_container, 'frames'):
-                frames_owner = captcha_container
-            elif hasattr(captcha_container, 'page') and hasattr(captcha_container.page, 'frames'):
-                frames_owner = captcha_container.page
-
-            if frames_owner is not None:
-                for frame in frames_owner.frames:
-                    if src_filter in frame.url and not frame.is_detached():
-                        matched_iframes.append(frame)
+            iframe_elements = await search_shadow_root_elements(framework, captcha_container, 'iframe', timeout=0)
+            for iframe_element in iframe_elements:
+                src_prop = await iframe_element.get_property('src')
+                src = await src_prop.json_value()
+
+                if src_filter in src:
+                    cf_iframe = await iframe_element.content_frame()
+                    if not cf_iframe or cf_iframe.is_detached():  # skip detached iframes
+                        continue
+
+                    matched_iframes.append(cf_iframe)
         except Exception as e:
-            logger.error(f'Error in page.frames fallback search: {e}')
+            logger.error(f'Error searching for iframes: {e}')
 
     logger.debug(f'Found {len(matched_iframes)} iframes with src containing "{src_filter}"')
 
-    return matched_iframes
\ No newline at end of file
+    return matched_iframes
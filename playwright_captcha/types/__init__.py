@@ -1,9 +1,19 @@
 from playwright_captcha.types.captcha import CaptchaType
+from playwright_captcha.types.clearance import ClearanceKey, Clearance
 from playwright_captcha.types.frameworks import FrameworkType
+from playwright_captcha.types.http_probe import HttpProbeResult
+from playwright_captcha.types.inventory import CaptchaInventory, DetectedCaptcha
+from playwright_captcha.types.session import BrowserSession
 from playwright_captcha.types.solvers import SolverType
 
 __all__ = [
     'CaptchaType',
     'SolverType',
-    'FrameworkType'
+    'FrameworkType',
+    'CaptchaInventory',
+    'DetectedCaptcha',
+    'HttpProbeResult',
+    'ClearanceKey',
+    'Clearance',
+    'BrowserSession'
 ]
@@ -0,0 +1,32 @@
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional, Dict, Any
+
+
+@dataclass(frozen=True)
+class ClearanceKey:
+    """ Cloudflare clearance is only valid for the same domain, user agent and IP (proxy) """
+
+    domain: str
+    user_agent: str
+    proxy: Optional[str] = None
+
+
+@dataclass
+class Clearance:
+    """ Stored Cloudflare clearance cookies """
+
+    cookies: List[Dict[str, Any]]  # Playwright cookie dicts (context.cookies() / context.add_cookies() format)
+    expires_at: float  # unix time
+    created_at: float = field(default_factory=time.time)
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        """
+        Check if the clearance is expired
+
+        :param now: Current unix time (time.time() by default)
+
+        :return: True if expired
+        """
+
+        return (now if now is not None else time.time()) >= self.expires_at
@@ -0,0 +1,22 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from playwright_captcha.types.captcha import CaptchaType
+
+
+@dataclass
+class HttpProbeResult:
+    """ Captcha gating of a URL, detected from a plain HTTP response (without a browser) """
+
+    url: str
+    status: Optional[int] = None
+    challenged: Optional[bool] = None  # cloudflare challenge by status/headers, None if they can't tell
+    captcha_types: List[CaptchaType] = field(default_factory=list)
+    site_keys: List[str] = field(default_factory=list)
+    error: Optional[str] = None  # the request failed, nothing is known about the URL
+
+    @property
+    def needs_browser(self) -> bool:
+        """ True if the URL has to be opened in a browser (gated, or the probe couldn't tell) """
+
+        return bool(self.captcha_types) or self.challenged is not False or self.error is not None
@@ -0,0 +1,56 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from playwright.async_api import Frame, Locator
+
+from playwright_captcha.types.captcha import CaptchaType
+
+# order in which detected captcha types are reported (and picked for auto-solving)
+CAPTCHA_TYPES_PRIORITY = [
+    CaptchaType.CLOUDFLARE_INTERSTITIAL,
+    CaptchaType.CLOUDFLARE_TURNSTILE,
+    CaptchaType.RECAPTCHA_V2,
+    CaptchaType.RECAPTCHA_V3,
+]
+
+
+@dataclass
+class DetectedCaptcha:
+    """ Captcha found on the page """
+
+    captcha_type: CaptchaType
+    frame: Frame
+    container: Optional[Locator] = None  # widget container, None for whole-page or invisible captchas
+    site_key: Optional[str] = None
+    action: Optional[str] = None
+
+
+@dataclass
+class CaptchaInventory:
+    """ All captchas found on the page """
+
+    captchas: List[DetectedCaptcha] = field(default_factory=list)
+
+    @property
+    def types(self) -> List[CaptchaType]:
+        """ Detected captcha types ordered by priority """
+
+        detected_types = {captcha.captcha_type for captcha in self.captchas}
+        return [captcha_type for captcha_type in CAPTCHA_TYPES_PRIORITY if captcha_type in detected_types]
+
+    def get(self, captcha_type: CaptchaType) -> List[DetectedCaptcha]:
+        """
+        Get the detected captchas of the given type
+
+        :param captcha_type: Type of captcha
+
+        :return: List of detected captchas of the given type
+        """
+
+        return [captcha for captcha in self.captchas if captcha.captcha_type == captcha_type]
+
+    def __contains__(self, captcha_type: CaptchaType) -> bool:
+        return any(captcha.captcha_type == captcha_type for captcha in self.captchas)
+
+    def __bool__(self) -> bool:
+        return bool(self.captchas)
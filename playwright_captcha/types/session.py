@@ -0,0 +1,12 @@
+from dataclasses import dataclass, field
+from typing import List, Optional, Dict, Any
+
+
+@dataclass
+class BrowserSession:
+    """ Browser session state needed to continue with a plain HTTP client after the captcha is solved """
+
+    cookies: List[Dict[str, Any]]  # Playwright cookie dicts (context.cookies() / context.add_cookies() format)
+    user_agent: str
+    headers: Dict[str, str] = field(default_factory=dict)  # user-agent, accept-language and client hints
+    proxy: Optional[str] = None
@@ -1,28 +1,168 @@
+import asyncio
 import hashlib
 import json
 import os
+import tempfile
+import time
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Dict, Iterator, Optional
 
-import aiofiles
+try:
+    import fcntl
+except ImportError:  # windows
+    fcntl = None
+    import msvcrt
 
+# set it (e.g. per worker process) to give every browser its own addon directory instead of the shared one
+ADDON_PROFILE_ENV = 'PLAYWRIGHT_CAPTCHA_CAMOUFOX_PROFILE'
 
-def get_addon_path() -> str:
+ADDON_TEMPLATE_PATH = Path(__file__).parent / 'addon'
+ADDON_TEMPLATE_FILES = ('manifest.json', 'inject.js')
+ADDON_PROFILES_DIR = Path(tempfile.gettempdir()) / 'playwright-captcha' / 'camoufox-addons'
+
+# scripts not registered again by any solver for this long (seconds) are removed from the store,
+# so scripts of older versions don't pile up in the shared addon directory
+SCRIPT_TTL = 24 * 60 * 60
+
+# scripts dir -> script filename -> when this process registered it, so repeated calls don't rewrite the registry
+_registered_scripts: Dict[str, Dict[str, float]] = {}
+
+
+def get_addon_path(profile: Optional[str] = None) -> str:
     """
     Get the absolute path to the addon's directory
 
+    :param profile: Name of the addon profile. Every profile gets its own copy of the addon, so browsers
+                    (or worker processes) using different profiles never share the scripts directory.
+                    Defaults to the PLAYWRIGHT_CAPTCHA_CAMOUFOX_PROFILE environment variable,
+                    if neither is set, the addon bundled with the package is used
+
     :return: Absolute path to the addon's directory
     """
 
-    current_dir = Path(__file__).parent
+    profile = profile or os.environ.get(ADDON_PROFILE_ENV)
+    if not profile:
+        return str(ADDON_TEMPLATE_PATH.resolve())
+
+    addon_path = ADDON_PROFILES_DIR / profile
+    addon_path.mkdir(parents=True, exist_ok=True)
 
-    addon_path = current_dir / "addon"
+    # copy the addon files (only if they are missing or outdated)
+    for file_name in ADDON_TEMPLATE_FILES:
+        content = (ADDON_TEMPLATE_PATH / file_name).read_bytes()
+        target_path = addon_path / file_name
+        if not target_path.exists() or target_path.read_bytes() != content:
+            _atomic_write(str(target_path), content)
 
     return str(addon_path.resolve())
 
 
+def _atomic_write(path: str, content: bytes) -> None:
+    """
+    Write the file atomically: readers (and the browser) see either the old or the new content, never a partial one
+
+    :param path: Path of the file to write
+    :param content: Content to write
+    """
+
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp_')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+@contextmanager
+def _registry_lock(scripts_dir: str) -> Iterator[None]:
+    """
+    Cross-process exclusive lock guarding read-modify-write cycles of the registry
+
+    :param scripts_dir: Path to the addon's scripts directory
+    """
+
+    with open(os.path.join(scripts_dir, 'registry.lock'), 'a+b') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _read_registry(registry_path: str) -> Dict[str, float]:
+    """
+    Read the scripts registry
+
+    :param registry_path: Path to the registry.json file
+
+    :return: Registered script filenames with the time they were last registered
+    """
+
+    if not os.path.exists(registry_path):
+        return {}
+
+    with open(registry_path, 'r', encoding='utf-8') as f:
+        registry = f.read()
+
+    registry = json.loads(registry) if registry else {}
+    if isinstance(registry, list):
+        # registry of an older version without the registration times
+        now = time.time()
+        registry = {filename: now for filename in registry}
+
+    return registry
+
+
+def _register_script(scripts_dir: str, script_filename: str, js_script_string: str) -> None:
+    """
+    Write the script file (content-addressed, so it's written only once), add it to the registry (or renew it there)
+    and remove the scripts not registered again for SCRIPT_TTL
+
+    :param scripts_dir: Path to the addon's scripts directory
+    :param script_filename: Filename of the script
+    :param js_script_string: JavaScript code of the script
+    """
+
+    os.makedirs(scripts_dir, exist_ok=True)
+
+    registry_path = os.path.join(scripts_dir, 'registry.json')
+    with _registry_lock(scripts_dir):
+        # the filename is the hash of the content, so an existing file already has the same content
+        script_path = os.path.join(scripts_dir, script_filename)
+        if not os.path.exists(script_path):
+            _atomic_write(script_path, js_script_string.encode('utf-8'))
+
+        now = time.time()
+        registry = _read_registry(registry_path)
+        registry[script_filename] = now
+
+        for filename, registered_at in list(registry.items()):
+            if now - registered_at > SCRIPT_TTL:
+                del registry[filename]
+                if os.path.exists(os.path.join(scripts_dir, filename)):
+                    os.remove(os.path.join(scripts_dir, filename))
+
+        _atomic_write(registry_path, json.dumps(registry, indent=2).encode('utf-8'))
+
+
 async def add_init_script(js_script_string: str, addon_path: str = 'addon') -> str:
     """
-    Save JavaScript code to addon's scripts directory with hash filename
+    Save JavaScript code to addon's scripts directory with hash filename.
+    Safe to call concurrently from multiple solvers and processes, scripts already registered by this process
+    are skipped (while their file exists), their registration is renewed after SCRIPT_TTL / 2
 
     :param js_script_string: JavaScript code to be saved
     :param addon_path: Path to the addon's directory
@@ -30,56 +170,57 @@ async def add_init_script(js_script_string: str, addon_path: str = 'addon') -> s
     :return: The filename of the saved script
     """
 
-    # create the scripts directory if it doesn't exist
     scripts_dir = os.path.join(addon_path, 'scripts')
-    os.makedirs(scripts_dir, exist_ok=True)
 
     # generate hash for the script
     script_hash = hashlib.md5(js_script_string.encode('utf-8')).hexdigest()
     script_filename = f"script_{script_hash}.js"
-    script_path = os.path.join(scripts_dir, script_filename)
-
-    # write the script file
-    async with aiofiles.open(script_path, 'w', encoding='utf-8') as f:
-        await f.write(js_script_string)
 
-    # update the scripts registry
-    registry_path = os.path.join(scripts_dir, 'registry.json')
-    registry = []
-
-    if os.path.exists(registry_path):
-        async with aiofiles.open(registry_path, 'r', encoding='utf-8') as f:
-            registry = await f.read()
-            registry = json.loads(registry) if registry else []
+    # the file is checked, as another process may have pruned or reset the store since
+    registered_scripts = _registered_scripts.setdefault(os.path.abspath(scripts_dir), {})
+    registered_at = registered_scripts.get(script_filename)
+    if registered_at is not None and time.time() - registered_at < SCRIPT_TTL / 2 and \
+            os.path.exists(os.path.join(scripts_dir, script_filename)):
+        return script_filename
 
-    # add script to registry if not already there
-    if script_filename not in registry:
-        registry.append(script_filename)
+    # blocking file locks and writes are executed in a thread to not block the event loop
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, _register_script, scripts_dir, script_filename, js_script_string)
 
-    # write updated registry
-    async with aiofiles.open(registry_path, 'w', encoding='utf-8') as f:
-        registry_json = json.dumps(registry, indent=2)
-        await f.write(registry_json)
+    registered_scripts[script_filename] = time.time()
 
     return script_filename
 
 
-def clean_scripts(addon_path: str = 'addon') -> None:
+def clean_scripts(addon_path: str = 'addon', reset: bool = False) -> None:
     """
-    Clean the scripts directory by removing all script files and the registry.
+    Clean the scripts directory.
+    By default only removes leftovers that are not in the registry (e.g. from crashed writes), so scripts
+    used by other solvers or processes stay intact
 
     :param addon_path: Path to the addon's directory
+    :param reset: Remove all scripts and the registry. Only use it when no browser is using the addon
     """
 
     scripts_dir = os.path.join(addon_path, 'scripts')
-    if os.path.exists(scripts_dir):
+    if not os.path.exists(scripts_dir):
+        return
+
+    registry_path = os.path.join(scripts_dir, 'registry.json')
+    with _registry_lock(scripts_dir):
+        registry = {} if reset else _read_registry(registry_path)
+
         for filename in os.listdir(scripts_dir):
             file_path = os.path.join(scripts_dir, filename)
+            if filename in ('registry.json', 'registry.lock') or filename in registry:
+                continue
             if os.path.isfile(file_path):
                 os.remove(file_path)
-        registry_path = os.path.join(scripts_dir, 'registry.json')
-        if os.path.exists(registry_path):
-            os.remove(registry_path)
+
+        if reset:
+            if os.path.exists(registry_path):
+                os.remove(registry_path)
+            _registered_scripts.pop(os.path.abspath(scripts_dir), None)
 
 
 add_init_script.is_camoufox_workaround = True
@@ -1,15 +1,22 @@
 if (window._shadowRootPatched !== true) {
   window._shadowRootPatched = true;
-  
+
   const shadowRoots = new WeakMap();
-  
+
+  // live registry of all attached shadow roots (weakly held where supported, so removed subtrees can be collected)
+  const attachedRoots = [];
+  const attachListeners = new Set();
+  const makeRef = typeof WeakRef === 'function' ? (root) => new WeakRef(root) : (root) => ({ deref: () => root });
+
   const originalAttachShadow = Element.prototype.attachShadow;
   Element.prototype.attachShadow = function (init) {
     const shadowRoot = originalAttachShadow.call(this, { ...init, mode: 'open' });
     shadowRoots.set(this, shadowRoot);
+    attachedRoots.push(makeRef(shadowRoot));
+    attachListeners.forEach((listener) => listener(shadowRoot));
     return shadowRoot;
   };
-  
+
   const descriptor = Object.getOwnPropertyDescriptor(Element.prototype, 'shadowRoot');
   if (descriptor && descriptor.get) {
     const originalGetter = descriptor.get;
@@ -21,19 +28,55 @@ if (window._shadowRootPatched !== true) {
       enumerable: descriptor.enumerable
     });
   }
+
+  // shadow roots whose hosts are in the document (drops the collected ones from the registry)
+  const getRoots = () => {
+    const roots = [];
+    for (let i = attachedRoots.length - 1; i >= 0; i--) {
+      const root = attachedRoots[i].deref();
+      if (!root) {
+        attachedRoots.splice(i, 1);
+      } else if (root.host.isConnected) {
+        roots.push(root);
+      }
+    }
+    return roots.reverse();
+  };
+
+  // elements matching the selector in the document and in all shadow roots - no DOM traversal needed
+  const querySelectorAll = (selector) => {
+    const elements = [...document.querySelectorAll(selector)];
+    for (const root of getRoots()) {
+      for (const element of root.querySelectorAll(selector)) {
+        elements.push(element);
+      }
+    }
+    return elements;
+  };
+
+  Object.defineProperty(window, '_shadowRootRegistry', {
+    value: {
+      getRoots,
+      querySelectorAll,
+      // get notified about newly attached shadow roots (e.g. to observe their mutations)
+      addAttachListener: (listener) => attachListeners.add(listener),
+      removeAttachListener: (listener) => attachListeners.delete(listener),
+    },
+    enumerable: false
+  });
 }
 
 console.clear = () => console.log('Console was cleared');
 
 // Intercept Cloudflare turnstile for data extraction
-function setupIntercept() {
-  if (window.turnstile && !window._turnstileIntercepted) {
+(() => {
+  function interceptRender(turnstile) {
     console.log('intercepting turnstile.render (Camoufox)');
-    
-    const originalRender = window.turnstile.render;
+
+    const originalRender = turnstile.render;
     window._turnstileIntercepted = true;
-    
-    window.turnstile.render = (a, b) => {
+
+    turnstile.render = (a, b) => {
       let params = {
         sitekey: b.sitekey,
         pageurl: window.location.href,
@@ -48,28 +91,62 @@ function setupIntercept() {
       window.cfCallback = b.callback;
       window.cfParams = params;
 
-      if (cfInterval) {
-        clearInterval(cfInterval);
-      }
-
       // Check sessionStorage flag (shared between isolated and main worlds)
       // API solvers set this flag to prevent rendering (keeps token valid)
       // Click solvers don't set flag, allowing visual challenge to appear
       const shouldBlock = sessionStorage.getItem('_blockCloudflareRender') === 'true';
-      
+
       if (shouldBlock) {
         console.log('blocking render for API solver');
         return;
       } else {
         console.log('allowing render for click solver');
-        return originalRender.call(window.turnstile, a, b);
+        return originalRender.call(turnstile, a, b);
       }
     };
   }
-}
 
-const cfInterval = setInterval(() => {
-  setupIntercept()
-}, 50);
+  function setupIntercept(turnstile) {
+    if (!turnstile || window._turnstileIntercepted) return;
+
+    if (typeof turnstile.render === 'function') {
+      interceptRender(turnstile);
+      return;
+    }
+
+    // render is attached after the turnstile object is assigned - catch its assignment
+    let render = turnstile.render;
+    try {
+      Object.defineProperty(turnstile, 'render', {
+        configurable: true,
+        enumerable: true,
+        get: () => render,
+        set: (value) => {
+          render = value;
+          delete turnstile.render;
+          turnstile.render = value;
+          setupIntercept(turnstile);
+        },
+      });
+    } catch (e) {}
+  }
+
+  // accessor trap: costs nothing until turnstile is loaded, and the render call is intercepted synchronously
+  let turnstileValue = window.turnstile;
+  try {
+    Object.defineProperty(window, 'turnstile', {
+      configurable: true,
+      enumerable: true,
+      get: () => turnstileValue,
+      set: (value) => {
+        turnstileValue = value;
+        setupIntercept(value);
+      },
+    });
+  } catch (e) {}
+
+  setupIntercept(turnstileValue);
 
-setupIntercept();
\ No newline at end of file
+  // fallback in case the trap was bypassed (e.g. window.turnstile redefined with Object.defineProperty)
+  document.addEventListener('readystatechange', () => setupIntercept(window.turnstile));
+})();
@@ -0,0 +1,155 @@
+import asyncio
+import logging
+import weakref
+from typing import Dict, List, Optional, Tuple
+
+from playwright.async_api import Page, CDPSession
+
+logger = logging.getLogger(__name__)
+
+
+class CDPSessionManager:
+    """
+    Keeps a single CDP session per page (Chromium only), shared by every CDP operation of the library
+    (script injection, DOM queries, metrics), instead of opening and detaching a new session for each of them
+    """
+
+    def __init__(self, page: Page):
+        """
+        Initialize the CDP session manager
+
+        :param page: Playwright Page to attach the CDP session to
+        """
+
+        # weak reference, so the manager stored in the weak-keyed registry doesn't keep the page alive
+        self._page_ref = weakref.ref(page)
+
+        self._session: Optional[CDPSession] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def page(self) -> Page:
+        """ Page the manager belongs to """
+
+        page = self._page_ref()
+        if page is None:
+            raise RuntimeError('Page of the CDP session manager was garbage collected')
+
+        return page
+
+    async def get_session(self) -> CDPSession:
+        """
+        Get the page's CDP session, attaching it on the first call
+
+        :return: CDP session attached to the page
+        """
+
+        if self._session is not None:
+            return self._session
+
+        async with self._lock:
+            if self._session is None:
+                self._session = await self.page.context.new_cdp_session(self.page)
+                self.page.once('close', lambda _: self._forget_session())
+                logger.debug('Attached CDP session to the page')
+
+        return self._session
+
+    async def send(self, method: str, params: Optional[Dict] = None) -> Dict:
+        """
+        Send a CDP command over the shared session
+
+        :param method: CDP method name (e.g. 'Performance.getMetrics')
+        :param params: CDP method parameters
+
+        :return: CDP command result
+        """
+
+        session = await self.get_session()
+        return await session.send(method, params)
+
+    async def send_many(self, commands: List[Tuple[str, Optional[Dict]]]) -> List[Dict]:
+        """
+        Send independent CDP commands concurrently over the shared session
+
+        :param commands: List of (method, params) tuples
+
+        :return: List of CDP command results in the order of commands
+        """
+
+        session = await self.get_session()
+        return list(await asyncio.gather(*(session.send(method, params) for method, params in commands)))
+
+    async def add_init_scripts(self, scripts: List[str]) -> Optional[str]:
+        """
+        Register the scripts to be evaluated on every new document with a single
+        Page.addScriptToEvaluateOnNewDocument command (the scripts are merged into one source)
+
+        :param scripts: JavaScript sources to register
+
+        :return: CDP identifier of the registered script, None if there were no scripts
+        """
+
+        if not scripts:
+            return None
+
+        result = await self.send('Page.addScriptToEvaluateOnNewDocument', {
+            'source': combine_js_scripts(scripts),
+            'runImmediately': False,
+        })
+
+        return result.get('identifier')
+
+    async def detach(self) -> None:
+        """Detach the CDP session (it's attached again on the next call)"""
+
+        session, self._session = self._session, None
+        if session is None:
+            return
+
+        try:
+            await session.detach()
+        except Exception as e:
+            logger.debug(f'Failed to detach CDP session: {e}')
+
+    def _forget_session(self) -> None:
+        """Forget the session of the closed page"""
+
+        self._session = None
+
+
+# page -> its CDP session manager. weak keys, so closed pages are dropped automatically
+_managers: 'weakref.WeakKeyDictionary[Page, CDPSessionManager]' = weakref.WeakKeyDictionary()
+
+
+def get_cdp_session_manager(page: Page) -> CDPSessionManager:
+    """
+    Get the CDP session manager of the page (created on the first call)
+
+    :param page: Playwright Page
+
+    :return: CDP session manager shared by all solvers of the page
+    """
+
+    manager = _managers.get(page)
+    if manager is None:
+        manager = _managers[page] = CDPSessionManager(page)
+
+    return manager
+
+
+def combine_js_scripts(scripts: List[str]) -> str:
+    """
+    Merge multiple scripts into a single source. Every script runs in its own scope,
+    so top-level declarations don't clash and an error in one script doesn't stop the others
+
+    :param scripts: JavaScript sources
+
+    :return: Combined JavaScript source
+    """
+
+    return '\n'.join(
+        f';(() => {{\ntry {{\n{script}\n}} catch (e) {{ console.error(e); }}\n}})();'
+        for script in scripts
+    )
+
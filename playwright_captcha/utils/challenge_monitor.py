@@ -0,0 +1,144 @@
+import asyncio
+import logging
+import weakref
+from typing import Optional, Dict
+
+from playwright.async_api import Page, Request, Response
+
+logger = logging.getLogger(__name__)
+
+# statuses Cloudflare serves its challenge pages with
+CF_CHALLENGE_STATUSES = (403, 503)
+
+# header Cloudflare marks the challenge responses with
+CF_MITIGATED_HEADER = 'cf-mitigated'
+
+
+def classify_challenge_response(status: int, headers: Dict[str, str]) -> Optional[bool]:
+    """
+    Classify a navigation response by its status and headers
+
+    :param status: Response status code
+    :param headers: Response headers (lower-case names)
+
+    :return: True if it's a Cloudflare challenge, False if it's definitely not, None if it can't be told by headers
+             (e.g. a 403/503 without the cf-mitigated header - might be an older challenge page or a plain error)
+    """
+
+    if headers.get(CF_MITIGATED_HEADER, '').lower() == 'challenge':
+        return True
+
+    if status in CF_CHALLENGE_STATUSES:
+        return None
+
+    return False
+
+
+class ChallengeMonitor:
+    """
+    Classifies every main-frame navigation of the page as challenged or not the moment its response headers arrive,
+    so unchallenged pages can skip the DOM detection and challenged ones can be solved before DOM ready
+    """
+
+    def __init__(self, page: Page):
+        """
+        Initialize the monitor and start listening to the page's navigations
+
+        :param page: Playwright Page
+        """
+
+        self._classified: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._page_ref = weakref.ref(page)
+
+        page.on('request', self._on_request)
+        page.on('response', self._on_response)
+
+    def _is_main_frame_navigation(self, request: Request) -> bool:
+        """Check if the request loads a new document in the page's main frame"""
+
+        page = self._page_ref()
+        return page is not None and request.is_navigation_request() and request.frame == page.main_frame
+
+    def _on_request(self, request: Request) -> None:
+        """Forget the classification of the previous document when the page starts loading a new one"""
+
+        if self._is_main_frame_navigation(request) and self._classified.done():
+            self._classified = asyncio.get_running_loop().create_future()
+
+    def _on_response(self, response: Response) -> None:
+        """Classify the main-frame navigation response"""
+
+        if not self._is_main_frame_navigation(response.request) or 300 <= response.status < 400:
+            return  # redirects are followed by another response
+
+        challenged = classify_challenge_response(response.status, response.headers)
+
+        logger.debug(f'Navigation to {response.url} classified by headers as '
+                     f'{"unknown" if challenged is None else "challenged" if challenged else "not challenged"}')
+
+        if self._classified.done():
+            self._classified = asyncio.get_running_loop().create_future()
+        self._classified.set_result(challenged)
+
+    def is_challenged(self) -> Optional[bool]:
+        """
+        Get the classification of the current document without waiting
+
+        :return: True if challenged, False if not, None if unknown (not classified yet or not by headers)
+        """
+
+        if self._classified.done():
+            return self._classified.result()
+
+        return None
+
+    async def wait_classified(self, timeout: float) -> Optional[bool]:
+        """
+        Wait until the current navigation response arrives (e.g. after page.goto(..., wait_until='commit'))
+
+        :param timeout: Maximum time to wait in seconds
+
+        :return: True if challenged, False if not, None if unknown or no response within the timeout
+        """
+
+        try:
+            # shield, so the timeout doesn't cancel the future shared with other waiters
+            return await asyncio.wait_for(asyncio.shield(self._classified), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+# page -> its challenge monitor. weak keys, so closed pages are dropped automatically
+_monitors: 'weakref.WeakKeyDictionary[Page, ChallengeMonitor]' = weakref.WeakKeyDictionary()
+
+
+def watch_challenges(page: Page) -> ChallengeMonitor:
+    """
+    Start classifying the page's navigations by response headers (once per page), must be called before navigation
+
+    :param page: Playwright Page
+
+    :return: Challenge monitor of the page
+    """
+
+    monitor = _monitors.get(page)
+    if monitor is None:
+        monitor = _monitors[page] = ChallengeMonitor(page)
+
+    return monitor
+
+
+def get_challenge_state(page: Page) -> Optional[bool]:
+    """
+    Get the header-based challenge classification of the page's current document
+
+    :param page: Playwright Page
+
+    :return: True if challenged, False if not, None if unknown or the page is not monitored
+    """
+
+    monitor = _monitors.get(page)
+    if monitor is None:
+        return None
+
+    return monitor.is_challenged()
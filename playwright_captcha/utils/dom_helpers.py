@@ -1,27 +1,44 @@
-from typing import Union, List
+from typing import Union, List, Optional
 
-from playwright.async_api import Page, ElementHandle, Frame
+from playwright.async_api import Page, ElementHandle, Frame, Locator
 
+# returns the requested attributes of every matched element in a single evaluation
+GET_ATTRIBUTES_JS = '(elements, attributes) => elements.map(el => attributes.map(attr => el.getAttribute(attr)))'
 
-async def search_element_by_css_selector(queryable: Union[Page, Frame, ElementHandle], selector: str,
-                                         attributes: List[str]) -> List[str]:
+
+async def search_elements_attributes(queryable: Union[Page, Frame, Locator, ElementHandle], selector: str,
+                                     attributes: List[str]) -> List[List[Optional[str]]]:
+    """
+    Helper to get the attributes of all elements matching the CSS selector in a single protocol round-trip
+
+    :param queryable: Playwright Page, Frame, Locator or ElementHandle to search in
+    :param selector: CSS selector to find the elements
+    :param attributes: List of attributes to retrieve from the found elements
+
+    :return: List of attribute values lists (in the order of attributes, None if missing), one per matched element
+    """
+
+    if hasattr(queryable, 'locator'):
+        return await queryable.locator(selector).evaluate_all(GET_ATTRIBUTES_JS, attributes)
+
+    # ElementHandle has no locators
+    return await queryable.eval_on_selector_all(selector, GET_ATTRIBUTES_JS, attributes)
+
+
+async def search_element_by_css_selector(queryable: Union[Page, Frame, Locator, ElementHandle], selector: str,
+                                         attributes: List[str]) -> List[Optional[str]]:
     """
-    Helper to search for an element by CSS selector and return its data-sitekey attribute
+    Helper to search for an element by CSS selector and return its attributes (in a single protocol round-trip)
 
-    :param queryable: Playwright Page, Frame, or ElementHandle to search in
+    :param queryable: Playwright Page, Frame, Locator or ElementHandle to search in
     :param selector: CSS selector to find the element
     :param attributes: List of attributes to retrieve from the found element
 
-    :return: List of attribute values from the found element, or None for each attribute if not found
+    :return: List of attribute values from the first found element, or None for each attribute if not found
     """
 
-    results = []
+    results = await search_elements_attributes(queryable, selector, attributes)
+    if results:
+        return results[0]  # even if some are None, to keep the order
 
-    element = queryable.locator(selector)
-    if await element.count() > 0:
-        for attribute in attributes:
-            result = await element.get_attribute(attribute)
-            results.append(result)  # even if None, to keep the order
-    else:
-        results = [None] * len(attributes)  # if no element found, return None for each attribute to keep the order
-    return results
+    return [None] * len(attributes)  # if no element found, return None for each attribute to keep the order
@@ -21,3 +21,8 @@ class CaptchaSolvingError(Exception):
 class CaptchaApplyingError(Exception):
     """ Raised when there is an error in applying the solved captcha """
     pass
+
+
+class CaptchaSolvingCancelledError(CaptchaSolvingError):
+    """ Raised when a shared (single-flight) captcha solve is cancelled """
+    pass
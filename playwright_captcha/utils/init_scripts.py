@@ -0,0 +1,104 @@
+import asyncio
+import logging
+import weakref
+from typing import Dict, Optional, Set, Union
+
+from playwright.async_api import Page, BrowserContext
+
+logger = logging.getLogger(__name__)
+
+# page/context -> names of the init scripts already registered on it.
+# weak keys, so closed pages and contexts are dropped from the registry automatically
+_registered_init_scripts: 'weakref.WeakKeyDictionary[Union[Page, BrowserContext], Set[str]]' = \
+    weakref.WeakKeyDictionary()
+
+# page/context -> init script name -> future of its registration in progress (resolves with whether it succeeded)
+_pending_init_scripts: 'weakref.WeakKeyDictionary[Union[Page, BrowserContext], Dict[str, asyncio.Future]]' = \
+    weakref.WeakKeyDictionary()
+
+
+def is_init_script_registered(page: Page, name: str) -> bool:
+    """
+    Check if the init script is already registered for the page, either on the page itself or on its context
+
+    :param page: Playwright Page
+    :param name: Name of the init script (e.g. 'patches/unlockShadowRoot.js')
+
+    :return: True if the script is already registered, False otherwise
+    """
+
+    if name in _registered_init_scripts.get(page, ()):
+        return True
+
+    return name in _registered_init_scripts.get(page.context, ())
+
+
+def mark_init_script_registered(target: Union[Page, BrowserContext], name: str) -> None:
+    """
+    Mark the init script as registered on the page or context
+
+    :param target: Playwright Page or BrowserContext the script was registered on
+    :param name: Name of the init script
+    """
+
+    _registered_init_scripts.setdefault(target, set()).add(name)
+
+
+def unmark_init_script_registered(target: Union[Page, BrowserContext], name: str) -> None:
+    """
+    Remove the init script from the registry of the page or context (e.g. if registering it failed)
+
+    :param target: Playwright Page or BrowserContext
+    :param name: Name of the init script
+    """
+
+    _registered_init_scripts.get(target, set()).discard(name)
+
+
+def _get_pending_init_script(page: Page, name: str) -> Optional[asyncio.Future]:
+    """Get the registration in progress of the init script on the page or on its context"""
+
+    return _pending_init_scripts.get(page, {}).get(name) or _pending_init_scripts.get(page.context, {}).get(name)
+
+
+async def add_init_script_once(page: Page, name: str, script: str, context_level: bool = True) -> bool:
+    """
+    Register the init script once: on the page's context (applies to every page in it) or on the page only.
+    Subsequent calls for the same page or for any page of the same context are no-ops, concurrent calls
+    return once the script is installed (and retry if the registration in progress failed)
+
+    :param page: Playwright Page
+    :param name: Name of the init script used as the registry key
+    :param script: JavaScript source of the init script
+    :param context_level: Register the script on page.context instead of the page
+
+    :return: True if the script was registered, False if it was already registered
+    """
+
+    # concurrent prepares on the same page/context wait for the registration in progress instead of injecting twice
+    pending = _get_pending_init_script(page, name)
+    while pending is not None:
+        await asyncio.shield(pending)
+        pending = _get_pending_init_script(page, name)
+
+    if is_init_script_registered(page, name):
+        logger.debug(f'Init script {name} is already registered, skipping')
+        return False
+
+    target = page.context if context_level else page
+
+    pending = asyncio.get_running_loop().create_future()
+    _pending_init_scripts.setdefault(target, {})[name] = pending
+    registered = False
+    try:
+        await target.add_init_script(script)
+        mark_init_script_registered(target, name)
+        registered = True
+    finally:
+        # on failure the waiting calls retry the registration themselves
+        del _pending_init_scripts[target][name]
+        pending.set_result(registered)
+
+    logger.debug(f'Registered init script {name} on the {"context" if context_level else "page"}')
+
+    return True
@@ -0,0 +1,129 @@
+import asyncio
+import json
+import logging
+import weakref
+from typing import Optional
+
+from playwright.async_api import Page, ConsoleMessage, Request
+
+logger = logging.getLogger(__name__)
+
+# prefix of the console message the intercept scripts log the moment turnstile.render is intercepted
+# (patches/interceptCloudflareInterstitialData.js and the Camoufox addon's inject.js)
+INTERCEPTED_PARAMS_PREFIX = 'intercepted-params:'
+
+
+class InterceptedParamsWatcher:
+    """
+    Receives the Cloudflare interstitial challenge params pushed by the intercept scripts via console events,
+    so they can be awaited instead of polling window.cfParams
+    """
+
+    def __init__(self, page: Page, push_supported: bool = True):
+        """
+        Initialize the watcher and start listening to the page's console messages
+
+        :param page: Playwright Page
+        :param push_supported: False if the framework doesn't emit console events (patchright),
+                               then the params have to be polled
+        """
+
+        self.push_supported = push_supported
+
+        self._params_future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._page_ref = weakref.ref(page)
+
+        page.on('console', self._on_console)
+        page.on('request', self._on_request)
+
+    def _on_console(self, message: ConsoleMessage) -> None:
+        """Resolve the params future with the intercepted params"""
+
+        text = message.text
+        if not text.startswith(INTERCEPTED_PARAMS_PREFIX):
+            return
+
+        try:
+            params = json.loads(text[len(INTERCEPTED_PARAMS_PREFIX):])
+        except ValueError as e:
+            logger.warning(f'Failed to parse intercepted Cloudflare params: {e}')
+            return
+
+        logger.debug('Received intercepted Cloudflare params')
+
+        if self._params_future.done():
+            self._params_future = asyncio.get_running_loop().create_future()
+        self._params_future.set_result(params)
+
+    def _on_request(self, request: Request) -> None:
+        """
+        Forget the params of the previous document when the page loads a new one (e.g. reload before a retry).
+        Same-document navigations (history.replaceState on challenge pages) send no requests and keep the params
+        """
+
+        page = self._page_ref()
+        if page is None or not request.is_navigation_request() or request.frame != page.main_frame:
+            return
+
+        if self._params_future.done():
+            self._params_future = asyncio.get_running_loop().create_future()
+
+    def get_params(self) -> Optional[dict]:
+        """
+        Get the params intercepted in the current document without waiting
+
+        :return: Intercepted params, None if not intercepted yet
+        """
+
+        if self._params_future.done():
+            return self._params_future.result()
+
+        return None
+
+    async def wait_params(self, timeout: float) -> Optional[dict]:
+        """
+        Wait until the params are intercepted in the current document
+
+        :param timeout: Maximum time to wait in seconds
+
+        :return: Intercepted params, None if not intercepted within the timeout
+        """
+
+        try:
+            # shield, so the timeout doesn't cancel the future shared with other waiters
+            return await asyncio.wait_for(asyncio.shield(self._params_future), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+# page -> its intercepted params watcher. weak keys, so closed pages are dropped automatically
+_watchers: 'weakref.WeakKeyDictionary[Page, InterceptedParamsWatcher]' = weakref.WeakKeyDictionary()
+
+
+def watch_intercepted_params(page: Page, push_supported: bool = True) -> InterceptedParamsWatcher:
+    """
+    Start watching the page for intercepted Cloudflare params (once per page), must be called before navigation
+
+    :param page: Playwright Page
+    :param push_supported: False if the framework doesn't emit console events (patchright)
+
+    :return: Intercepted params watcher of the page
+    """
+
+    watcher = _watchers.get(page)
+    if watcher is None:
+        watcher = _watchers[page] = InterceptedParamsWatcher(page, push_supported)
+
+    return watcher
+
+
+def get_intercepted_params_watcher(page: Page) -> Optional[InterceptedParamsWatcher]:
+    """
+    Get the intercepted params watcher of the page
+
+    :param page: Playwright Page
+
+    :return: Intercepted params watcher, None if the page is not watched
+    """
+
+    return _watchers.get(page)
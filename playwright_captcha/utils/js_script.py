@@ -1,14 +1,20 @@
+import asyncio
 import os
 from pathlib import Path
+from typing import Dict
 
 import aiofiles
 
 JS_BASE_DIR = Path(__file__).parent / 'js_scripts'
 
+# process-wide cache of the bundled scripts (file name -> content), the files never change at runtime
+_js_script_cache: Dict[str, str] = {}
+_js_scripts_preloaded = False
+
 
 async def load_js_script(file_name: str) -> str:
     """
-    Load a JavaScript file content as string
+    Load a JavaScript file content as string (served from the in-memory cache after the first load)
 
     :param file_name: Name of the JavaScript file to load
 
@@ -17,10 +23,43 @@ async def load_js_script(file_name: str) -> str:
     :raises FileNotFoundError: If the JavaScript file does not exist
     """
 
+    script = _js_script_cache.get(file_name)
+    if script is not None:
+        return script
+
     file_path = JS_BASE_DIR / file_name.replace('/', os.sep)
 
     try:
         async with aiofiles.open(file_path, 'r', encoding='utf-8') as f:
-            return await f.read()
+            script = await f.read()
     except FileNotFoundError:
         raise FileNotFoundError(f"JavaScript file not found: {file_path}")
+
+    _js_script_cache[file_name] = script
+    return script
+
+
+async def preload_js_scripts() -> None:
+    """
+    Eagerly load every bundled script (js_scripts/**/*.js) into the cache, so later calls don't touch the disk.
+    Only the first call reads the files, subsequent calls return immediately
+    """
+
+    global _js_scripts_preloaded
+
+    if _js_scripts_preloaded:
+        return
+
+    file_names = [path.relative_to(JS_BASE_DIR).as_posix() for path in JS_BASE_DIR.rglob('*.js')]
+    await asyncio.gather(*(load_js_script(file_name) for file_name in file_names))
+
+    _js_scripts_preloaded = True
+
+
+def clear_js_script_cache() -> None:
+    """Drop all cached scripts (e.g. after editing the bundled scripts during development)"""
+
+    global _js_scripts_preloaded
+
+    _js_script_cache.clear()
+    _js_scripts_preloaded = False
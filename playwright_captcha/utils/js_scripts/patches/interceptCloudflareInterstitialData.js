@@ -2,11 +2,11 @@
 
 console.clear = () => console.log('Console was cleared');
 
-function setupIntercept() {
-  if (window.turnstile && !window._turnstileIntercepted) {
+(() => {
+  function interceptRender(turnstile) {
     window._turnstileIntercepted = true;
-    
-    window.turnstile.render = (a, b) => {
+
+    turnstile.render = (a, b) => {
       let params = {
         sitekey: b.sitekey,
         pageurl: window.location.href,
@@ -21,18 +21,52 @@ function setupIntercept() {
       window.cfCallback = b.callback;
       window.cfParams = params;
 
-      if (interval) {
-        clearInterval(interval);
-      }
-
       console.log('blocking render for API solver');
       return;
     };
   }
-}
 
-const interval = setInterval(() => {
-  setupIntercept()
-}, 50);
+  function setupIntercept(turnstile) {
+    if (!turnstile || window._turnstileIntercepted) return;
+
+    if (typeof turnstile.render === 'function') {
+      interceptRender(turnstile);
+      return;
+    }
+
+    // render is attached after the turnstile object is assigned - catch its assignment
+    let render = turnstile.render;
+    try {
+      Object.defineProperty(turnstile, 'render', {
+        configurable: true,
+        enumerable: true,
+        get: () => render,
+        set: (value) => {
+          render = value;
+          delete turnstile.render;
+          turnstile.render = value;
+          setupIntercept(turnstile);
+        },
+      });
+    } catch (e) {}
+  }
+
+  // accessor trap: costs nothing until turnstile is loaded, and the render call is intercepted synchronously
+  let turnstileValue = window.turnstile;
+  try {
+    Object.defineProperty(window, 'turnstile', {
+      configurable: true,
+      enumerable: true,
+      get: () => turnstileValue,
+      set: (value) => {
+        turnstileValue = value;
+        setupIntercept(value);
+      },
+    });
+  } catch (e) {}
+
+  setupIntercept(turnstileValue);
 
-setupIntercept();
+  // fallback in case the trap was bypassed (e.g. window.turnstile redefined with Object.defineProperty)
+  document.addEventListener('readystatechange', () => setupIntercept(window.turnstile));
+})();
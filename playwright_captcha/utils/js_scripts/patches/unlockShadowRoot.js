@@ -1,16 +1,23 @@
 (() => {
   if (window._shadowRootPatched) return;
   window._shadowRootPatched = true;
-  
+
   const shadowRoots = new WeakMap();
-  
+
+  // live registry of all attached shadow roots (weakly held where supported, so removed subtrees can be collected)
+  const attachedRoots = [];
+  const attachListeners = new Set();
+  const makeRef = typeof WeakRef === 'function' ? (root) => new WeakRef(root) : (root) => ({ deref: () => root });
+
   const originalAttachShadow = Element.prototype.attachShadow;
   Element.prototype.attachShadow = function (init) {
     const shadowRoot = originalAttachShadow.call(this, { ...init, mode: 'open' });
     shadowRoots.set(this, shadowRoot);
+    attachedRoots.push(makeRef(shadowRoot));
+    attachListeners.forEach((listener) => listener(shadowRoot));
     return shadowRoot;
   };
-  
+
   const descriptor = Object.getOwnPropertyDescriptor(Element.prototype, 'shadowRoot');
   if (descriptor && descriptor.get) {
     const originalGetter = descriptor.get;
@@ -22,4 +29,40 @@
       enumerable: descriptor.enumerable
     });
   }
-})();
\ No newline at end of file
+
+  // shadow roots whose hosts are in the document (drops the collected ones from the registry)
+  const getRoots = () => {
+    const roots = [];
+    for (let i = attachedRoots.length - 1; i >= 0; i--) {
+      const root = attachedRoots[i].deref();
+      if (!root) {
+        attachedRoots.splice(i, 1);
+      } else if (root.host.isConnected) {
+        roots.push(root);
+      }
+    }
+    return roots.reverse();
+  };
+
+  // elements matching the selector in the document and in all shadow roots - no DOM traversal needed
+  const querySelectorAll = (selector) => {
+    const elements = [...document.querySelectorAll(selector)];
+    for (const root of getRoots()) {
+      for (const element of root.querySelectorAll(selector)) {
+        elements.push(element);
+      }
+    }
+    return elements;
+  };
+
+  Object.defineProperty(window, '_shadowRootRegistry', {
+    value: {
+      getRoots,
+      querySelectorAll,
+      // get notified about newly attached shadow roots (e.g. to observe their mutations)
+      addAttachListener: (listener) => attachListeners.add(listener),
+      removeAttachListener: (listener) => attachListeners.delete(listener),
+    },
+    enumerable: false
+  });
+})();
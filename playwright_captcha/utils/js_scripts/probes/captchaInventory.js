@@ -0,0 +1,67 @@
+(indicators) => {
+    const found = [];
+
+    const getParam = (url, name) => {
+        try {
+            return new URL(url, location.href).searchParams.get(name);
+        } catch (e) {
+            return null;
+        }
+    };
+
+    const getSiteKey = (element) => {
+        let siteKey = element.getAttribute('data-sitekey');
+
+        // widget containers may keep the sitekey on a child element
+        if (!siteKey && element.querySelector) {
+            const child = element.querySelector('[data-sitekey]');
+            siteKey = child ? child.getAttribute('data-sitekey') : null;
+        }
+
+        // scripts and iframes keep it in the src (k=... or render=...)
+        const src = element.getAttribute('src');
+        if (!siteKey && src) {
+            siteKey = getParam(src, 'k') || getParam(src, 'render');
+        }
+
+        return siteKey && siteKey !== 'explicit' ? siteKey : null;
+    };
+
+    for (const [captchaType, selectors] of Object.entries(indicators)) {
+        const entries = [];
+
+        // 1. widget containers
+        for (const selector of selectors.containers) {
+            document.querySelectorAll(selector).forEach((element, index) => {
+                entries.push({
+                    captchaType,
+                    selector,
+                    index,
+                    siteKey: getSiteKey(element),
+                    action: element.getAttribute('data-action'),
+                });
+            });
+        }
+
+        // 2. indicators of captchas without (found) containers, e.g. whole-page or invisible captchas
+        if (!entries.length) {
+            let matched = false;
+            let siteKey = null;
+
+            for (const selector of selectors.indicators) {
+                for (const element of document.querySelectorAll(selector)) {
+                    matched = true;
+                    siteKey = siteKey || getSiteKey(element);
+                }
+            }
+
+            if (matched) {
+                entries.push({captchaType, selector: null, index: null, siteKey, action: null});
+            }
+        }
+
+        found.push(...entries);
+    }
+
+    return found;
+}
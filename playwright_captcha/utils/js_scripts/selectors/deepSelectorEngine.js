@@ -0,0 +1,36 @@
+(() => {
+  // selector engine piercing all shadow roots, including closed ones (unlocked by patches/unlockShadowRoot.js)
+  // usage: locator('cfdeep=input[type="checkbox"]'). the source must stay a single expression
+  const find = (root, selector, first) => {
+    const registry = window._shadowRootRegistry;
+
+    // the whole document - the live registry knows every shadow root, no DOM traversal needed
+    if (registry && (root === document || root === document.documentElement)) {
+      const elements = registry.querySelectorAll(selector);
+      return first ? elements.slice(0, 1) : elements;
+    }
+
+    const elements = [];
+    const pending = [root];
+    if (root.shadowRoot) pending.push(root.shadowRoot);
+
+    while (pending.length) {
+      const node = pending.shift();
+      for (const el of node.querySelectorAll('*')) {
+        if (el.matches(selector)) {
+          elements.push(el);
+          if (first) return elements;
+        }
+        if (el.shadowRoot) {
+          pending.push(el.shadowRoot);
+        }
+      }
+    }
+    return elements;
+  };
+
+  return {
+    query: (root, selector) => find(root, selector, true)[0] || null,
+    queryAll: (root, selector) => find(root, selector, false),
+  };
+})()
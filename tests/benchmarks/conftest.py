@@ -0,0 +1,19 @@
+import pytest
+import pytest_asyncio
+
+
+@pytest_asyncio.fixture
+async def chromium_context():
+    """Headless Chromium context for browser benchmarks (CDP metrics are Chromium-only)"""
+
+    from playwright.async_api import async_playwright, Error as PlaywrightError
+
+    async with async_playwright() as playwright:
+        try:
+            browser = await playwright.chromium.launch(headless=True)
+        except PlaywrightError as e:
+            pytest.skip(f'Chromium is not available: {e}')
+
+        context = await browser.new_context()
+        yield context
+        await browser.close()
@@ -0,0 +1,65 @@
+import asyncio
+import time
+
+import pytest
+
+from playwright_captcha import CaptchaType, ClickSolver, FrameworkType
+from playwright_captcha.captchas.recaptcha_v2.detect_data import detect_recaptcha_v2_data
+
+LATENCY = 0.05  # simulated protocol round-trip latency in seconds
+
+
+class FakeLocator:
+    def __init__(self, queryable, selector):
+        self.queryable = queryable
+        self.selector = selector
+
+    async def evaluate_all(self, script, attributes):
+        await self.queryable.round_trip()
+        values = {'data-sitekey': 'sitekey', 'data-size': 'normal', 'data-callback': 'onSuccess'}
+        return [[values.get(attribute) for attribute in attributes]]
+
+
+class FakeQueryable:
+    """Page-like object counting the protocol round-trips made on it"""
+
+    def __init__(self):
+        self.round_trips = 0
+
+    async def round_trip(self):
+        self.round_trips += 1
+        await asyncio.sleep(LATENCY)
+
+    def locator(self, selector):
+        return FakeLocator(self, selector)
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+class TestDetectionRoundTripsBenchmark:
+    """Protocol round-trips per captcha data detection"""
+
+    async def test_recaptcha_v2_detection_is_one_round_trip(self):
+        queryable = FakeQueryable()
+
+        data = await detect_recaptcha_v2_data(queryable)
+
+        print(f'\nreCAPTCHA v2 detection: {queryable.round_trips} round-trip(s) for 6 attributes')
+
+        assert data['site_key'] == 'sitekey'
+        assert data['_apply_captcha_callback_function'] == 'onSuccess'
+        assert queryable.round_trips == 1
+
+    async def test_page_and_container_scanned_concurrently(self):
+        page, container = FakeQueryable(), FakeQueryable()
+        solver = ClickSolver(framework=FrameworkType.PLAYWRIGHT, page=page)
+
+        start = time.perf_counter()
+        await solver.detect_captcha_data(container, CaptchaType.RECAPTCHA_V2)
+        elapsed = time.perf_counter() - start
+
+        print(f'\npage + container detection: {page.round_trips + container.round_trips} round-trips '
+              f'in {elapsed * 1000:.0f}ms ({LATENCY * 1000:.0f}ms per round-trip)')
+
+        assert page.round_trips == container.round_trips == 1
+        assert elapsed < LATENCY * 2
@@ -0,0 +1,56 @@
+import time
+
+import pytest
+
+from playwright_captcha.utils.js_script import load_js_script, preload_js_scripts, clear_js_script_cache
+
+SCRIPTS = [
+    'patches/unlockShadowRoot.js',
+    'patches/interceptCloudflareInterstitialData.js',
+    'appliers/applyCloudflareTurnstile.js',
+    'appliers/submitCloudflareTurnstile.js',
+]
+ITERATIONS = 200
+
+
+async def _measure_per_call(cached: bool) -> float:
+    """Average latency of a single load_js_script() call in microseconds"""
+
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        for script in SCRIPTS:
+            if not cached:
+                clear_js_script_cache()
+            await load_js_script(script)
+    elapsed = time.perf_counter() - start
+
+    return elapsed / (ITERATIONS * len(SCRIPTS)) * 1_000_000
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+class TestJsScriptCacheBenchmark:
+    """Per-call latency of load_js_script() with and without the in-memory cache"""
+
+    async def test_cached_load_is_faster(self):
+        uncached = await _measure_per_call(cached=False)
+
+        clear_js_script_cache()
+        await preload_js_scripts()
+        cached = await _measure_per_call(cached=True)
+
+        print(f'\nload_js_script per call: uncached {uncached:.1f}us, cached {cached:.1f}us '
+              f'({uncached / cached:.0f}x)')
+
+        assert cached < uncached
+
+    async def test_preload_covers_all_bundled_scripts(self):
+        clear_js_script_cache()
+        await preload_js_scripts()
+
+        for script in SCRIPTS:
+            assert await load_js_script(script)
+
+    async def test_missing_script_raises(self):
+        with pytest.raises(FileNotFoundError):
+            await load_js_script('patches/doesNotExist.js')
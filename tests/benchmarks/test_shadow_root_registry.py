@@ -0,0 +1,120 @@
+import time
+
+import pytest
+
+from playwright_captcha.solvers.click.common.shadow_root import get_shadow_roots, deep_query_selector_all, \
+    search_shadow_root_elements
+from playwright_captcha.types import FrameworkType
+from playwright_captcha.utils.js_script import load_js_script
+
+ELEMENTS = 10_000
+SHADOW_ROOTS = 500
+
+# the previous recursive full-DOM traversal
+LEGACY_GET_SHADOW_ROOTS_JS = """
+() => {
+    const roots = [];
+
+    function collectShadowRoots(node) {
+        if (!node) return;
+
+        const shadow = node.shadowRoot;
+        if (shadow) {
+            roots.push(shadow);
+            collectShadowRoots(shadow);
+        }
+
+        for (const el of node.querySelectorAll("*")) {
+            if (el.shadowRoot) {
+                collectShadowRoots(el);
+            }
+        }
+    }
+
+    collectShadowRoots(document);
+    return roots;
+}
+"""
+
+# 10k light DOM elements nested in groups, 500 closed shadow roots (every 5th nested in another root)
+BUILD_PAGE_JS = """
+([elements, shadowRoots]) => {
+    let parent = document.body;
+    for (let i = 0; i < elements; i++) {
+        const div = document.createElement('div');
+        (i % 20 === 0 ? document.body : parent).appendChild(div);
+        parent = div;
+    }
+
+    const all = document.body.querySelectorAll('div');
+    let lastRoot = null;
+    for (let i = 0; i < shadowRoots; i++) {
+        const host = document.createElement('span');
+        if (lastRoot && i % 5 === 0) {
+            lastRoot.appendChild(host);
+        } else {
+            all[Math.floor(i * all.length / shadowRoots)].appendChild(host);
+        }
+        lastRoot = host.attachShadow({ mode: 'closed' });
+        lastRoot.innerHTML = i === shadowRoots - 1 ? '<input type="checkbox">' : '<p>content</p>';
+    }
+}
+"""
+
+
+async def _timed(coroutine_factory, repeats: int = 5):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        result = await coroutine_factory()
+    return (time.perf_counter() - start) / repeats * 1000, result
+
+
+@pytest.mark.benchmark
+@pytest.mark.slow
+@pytest.mark.asyncio
+class TestShadowRootRegistryBenchmark:
+    """Shadow root lookups on a synthetic page with 10k elements and 500 shadow roots"""
+
+    async def test_registry_vs_traversal(self, chromium_context):
+        page = await chromium_context.new_page()
+        await page.add_init_script(await load_js_script('patches/unlockShadowRoot.js'))
+        await page.goto('about:blank')
+        await page.evaluate(BUILD_PAGE_JS, [ELEMENTS, SHADOW_ROOTS])
+
+        traversal_ms, traversal_roots = await _timed(lambda: page.evaluate(f'({LEGACY_GET_SHADOW_ROOTS_JS})().length'))
+        registry_ms, registry_roots = await _timed(lambda: get_shadow_roots(FrameworkType.PLAYWRIGHT, page))
+        query_ms, checkboxes = await _timed(
+            lambda: deep_query_selector_all(FrameworkType.PLAYWRIGHT, page, 'input[type="checkbox"]'))
+
+        print(f'\nlegacy traversal (in-page only) {traversal_ms:.1f}ms, registry roots {registry_ms:.1f}ms '
+              f'(with handles), deep query {query_ms:.1f}ms')
+
+        assert traversal_roots == len(registry_roots) == SHADOW_ROOTS
+        assert len(checkboxes) == 1
+        assert query_ms < traversal_ms
+
+    async def test_deep_waiter_resolves_on_late_element(self, chromium_context):
+        page = await chromium_context.new_page()
+        await page.add_init_script(await load_js_script('patches/unlockShadowRoot.js'))
+        await page.goto('about:blank')
+        await page.evaluate(BUILD_PAGE_JS, [ELEMENTS, SHADOW_ROOTS])
+
+        # the element shows up later in a root attached after the search started
+        await page.evaluate("""() => setTimeout(() => {
+            const root = document.body.appendChild(document.createElement('span')).attachShadow({ mode: 'closed' });
+            setTimeout(() => { root.innerHTML = '<div id="success"></div>'; }, 100);
+        }, 100)""")
+
+        start = time.perf_counter()
+        elements = await search_shadow_root_elements(FrameworkType.PLAYWRIGHT, page, 'div[id="success"]', timeout=5)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        print(f'\ndeep waiter resolved in {elapsed_ms:.1f}ms across {SHADOW_ROOTS + 1} shadow roots')
+
+        assert len(elements) == 1
+        assert elapsed_ms < 2000
+
+        # nothing matches - a single deadline, not one per root
+        start = time.perf_counter()
+        assert await search_shadow_root_elements(FrameworkType.PLAYWRIGHT, page, 'div[id="missing"]', timeout=0.5) == []
+        assert (time.perf_counter() - start) < 2
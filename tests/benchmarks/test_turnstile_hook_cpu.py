@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from playwright_captcha.utils.cdp_session import get_cdp_session_manager
+from playwright_captcha.utils.js_script import load_js_script
+
+TABS = 50
+IDLE_SECONDS = 5
+
+# the previous hook: polls for window.turnstile every 50ms in every document, forever on pages without turnstile
+LEGACY_INTERVAL_HOOK = """
+function setupIntercept() {
+  if (window.turnstile && !window._turnstileIntercepted) {
+    window._turnstileIntercepted = true;
+  }
+}
+const interval = setInterval(() => { setupIntercept() }, 50);
+window._turnstileInterval = interval;
+setupIntercept();
+"""
+
+# the init scripts run only on navigations, the idle page is served from this url
+IDLE_PAGE_URL = 'https://idle.test/'
+IDLE_PAGE_HTML = '<html><body><p>idle page without turnstile</p></body></html>'
+
+# whether each hook is installed in the page
+LEGACY_HOOK_INSTALLED_JS = "() => window._turnstileInterval !== undefined"
+TRAP_INSTALLED_JS = "() => typeof Object.getOwnPropertyDescriptor(window, 'turnstile')?.get === 'function'"
+
+
+async def _serve_idle_page(route):
+    await route.fulfill(status=200, content_type='text/html', body=IDLE_PAGE_HTML)
+
+
+async def _idle_renderer_cpu(context, init_script: str, installed_js: str) -> float:
+    """Total renderer script + task time (seconds) of TABS idle tabs with the init script"""
+
+    pages = [await context.new_page() for _ in range(TABS)]
+    for page in pages:
+        await page.add_init_script(init_script)
+        await page.route(IDLE_PAGE_URL, _serve_idle_page)
+        await page.goto(IDLE_PAGE_URL)
+        assert await page.evaluate(installed_js), 'the hook is not installed'
+
+    managers = [get_cdp_session_manager(page) for page in pages]
+    await asyncio.gather(*(manager.send('Performance.enable') for manager in managers))
+
+    async def task_duration() -> float:
+        metrics = await asyncio.gather(*(manager.send('Performance.getMetrics') for manager in managers))
+        return sum(metric['value'] for page_metrics in metrics for metric in page_metrics['metrics']
+                   if metric['name'] == 'TaskDuration')
+
+    before = await task_duration()
+    await asyncio.sleep(IDLE_SECONDS)
+    after = await task_duration()
+
+    for page in pages:
+        await page.close()
+
+    return after - before
+
+
+@pytest.mark.benchmark
+@pytest.mark.slow
+@pytest.mark.asyncio
+class TestTurnstileHookCpuBenchmark:
+    """Renderer CPU of idle tabs: 50ms polling hook vs accessor trap on window.turnstile"""
+
+    async def test_accessor_trap_is_idle(self, chromium_context):
+        legacy = await _idle_renderer_cpu(chromium_context, LEGACY_INTERVAL_HOOK, LEGACY_HOOK_INSTALLED_JS)
+        trap = await _idle_renderer_cpu(chromium_context,
+                                        await load_js_script('patches/interceptCloudflareInterstitialData.js'),
+                                        TRAP_INSTALLED_JS)
+
+        print(f'\nrenderer task time of {TABS} idle tabs over {IDLE_SECONDS}s: '
+              f'setInterval hook {legacy * 1000:.1f}ms, accessor trap {trap * 1000:.1f}ms')
+
+        assert trap < legacy
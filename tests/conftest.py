@@ -132,3 +132,6 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "requires_api_key: marks tests that require API key"
     )
+    config.addinivalue_line(
+        "markers", "benchmark: marks performance benchmarks"
+    )
@@ -0,0 +1,89 @@
+import asyncio
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from playwright_captcha.utils.camoufox_add_init_script import add_init_script as store
+from playwright_captcha.utils.camoufox_add_init_script.add_init_script import add_init_script, clean_scripts, \
+    get_addon_path
+
+
+def _register_in_process(addon_path: str, index: int) -> str:
+    return asyncio.run(add_init_script(f'console.log({index});', addon_path))
+
+
+def _read_registry(addon_path: str) -> list:
+    with open(os.path.join(addon_path, 'scripts', 'registry.json'), encoding='utf-8') as f:
+        return json.load(f)
+
+
+@pytest.mark.asyncio
+class TestCamoufoxScriptStore:
+    """Content-addressed, concurrency-safe scripts store of the Camoufox add_init_script workaround"""
+
+    async def test_concurrent_processes_keep_all_scripts(self, tmp_path):
+        addon_path = str(tmp_path)
+
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            filenames = list(executor.map(_register_in_process, [addon_path] * 20, range(20)))
+
+        assert sorted(_read_registry(addon_path)) == sorted(filenames)
+        assert all(os.path.exists(os.path.join(addon_path, 'scripts', filename)) for filename in filenames)
+
+    async def test_registered_script_is_not_rewritten(self, tmp_path, monkeypatch):
+        addon_path = str(tmp_path)
+        filename = await add_init_script('console.log(1);', addon_path)
+
+        def fail(*args, **kwargs):
+            raise AssertionError('registry must not be written again')
+
+        monkeypatch.setattr(store, '_register_script', fail)
+
+        assert await add_init_script('console.log(1);', addon_path) == filename
+
+    async def test_clean_keeps_registered_scripts(self, tmp_path):
+        addon_path = str(tmp_path)
+        filename = await add_init_script('console.log(1);', addon_path)
+        leftover_path = tmp_path / 'scripts' / '.tmp_leftover'
+        leftover_path.write_text('partial')
+
+        clean_scripts(addon_path)
+
+        assert os.path.exists(os.path.join(addon_path, 'scripts', filename))
+        assert not leftover_path.exists()
+
+    async def test_profiles_get_separate_addon_dirs(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(store, 'ADDON_PROFILES_DIR', tmp_path)
+
+        first, second = get_addon_path('first'), get_addon_path('second')
+
+        assert first != second
+        assert os.path.exists(os.path.join(first, 'manifest.json'))
+        assert os.path.exists(os.path.join(second, 'inject.js'))
+
+    async def test_stale_scripts_are_pruned(self, tmp_path, monkeypatch):
+        addon_path = str(tmp_path)
+        old_filename = await add_init_script('console.log("old version");', addon_path)
+
+        registry = _read_registry(addon_path)
+        registry[old_filename] -= store.SCRIPT_TTL + 1
+        (tmp_path / 'scripts' / 'registry.json').write_text(json.dumps(registry))
+
+        filename = await add_init_script('console.log("new version");', addon_path)
+
+        assert list(_read_registry(addon_path)) == [filename]
+        assert not os.path.exists(os.path.join(addon_path, 'scripts', old_filename))
+
+    async def test_script_removed_by_other_process_is_rewritten(self, tmp_path):
+        addon_path = str(tmp_path)
+        filename = await add_init_script('console.log(1);', addon_path)
+
+        # e.g. clean_scripts(reset=True) of another process
+        os.remove(os.path.join(addon_path, 'scripts', filename))
+        os.remove(os.path.join(addon_path, 'scripts', 'registry.json'))
+
+        assert await add_init_script('console.log(1);', addon_path) == filename
+        assert os.path.exists(os.path.join(addon_path, 'scripts', filename))
+        assert list(_read_registry(addon_path)) == [filename]
@@ -0,0 +1,54 @@
+import pytest
+
+from playwright_captcha.utils.cdp_session import get_cdp_session_manager
+
+
+class FakeSession:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, method, params=None):
+        self.sent.append((method, params))
+        return {'identifier': str(len(self.sent))}
+
+
+class FakeContext:
+    def __init__(self):
+        self.sessions = []
+
+    async def new_cdp_session(self, page):
+        session = FakeSession()
+        self.sessions.append(session)
+        return session
+
+
+class FakePage:
+    def __init__(self):
+        self.context = FakeContext()
+
+    def once(self, event, handler):
+        pass
+
+
+@pytest.mark.asyncio
+class TestCDPSessionManager:
+    """A single CDP session per page, init scripts sent as one command"""
+
+    async def test_session_is_reused(self):
+        page = FakePage()
+
+        await get_cdp_session_manager(page).send('Performance.enable')
+        await get_cdp_session_manager(page).send_many([('DOM.enable', None), ('Performance.getMetrics', None)])
+
+        assert len(page.context.sessions) == 1
+        assert len(page.context.sessions[0].sent) == 3
+
+    async def test_init_scripts_sent_in_one_command(self):
+        page = FakePage()
+
+        await get_cdp_session_manager(page).add_init_scripts(['window.a = 1;', 'window.b = 2;'])
+
+        sent = page.context.sessions[0].sent
+        assert len(sent) == 1
+        assert sent[0][0] == 'Page.addScriptToEvaluateOnNewDocument'
+        assert 'window.a = 1;' in sent[0][1]['source'] and 'window.b = 2;' in sent[0][1]['source']
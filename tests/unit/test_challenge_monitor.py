@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from playwright_captcha.utils.challenge_monitor import classify_challenge_response, watch_challenges, \
+    get_challenge_state
+
+
+class FakeFrame:
+    pass
+
+
+class FakeRequest:
+    def __init__(self, frame, navigation=True):
+        self.frame = frame
+        self.navigation = navigation
+
+    def is_navigation_request(self):
+        return self.navigation
+
+
+class FakeResponse:
+    def __init__(self, request, status, headers=None, url='https://example.com/'):
+        self.request = request
+        self.status = status
+        self.headers = headers or {}
+        self.url = url
+
+
+class FakePage:
+    def __init__(self):
+        self.main_frame = FakeFrame()
+        self.listeners = {}
+
+    def on(self, event, callback):
+        self.listeners.setdefault(event, []).append(callback)
+
+    def emit(self, event, arg):
+        for callback in self.listeners.get(event, []):
+            callback(arg)
+
+    def navigate(self, status, headers=None, frame=None):
+        request = FakeRequest(frame or self.main_frame)
+        self.emit('request', request)
+        self.emit('response', FakeResponse(request, status, headers))
+
+
+class TestClassifyChallengeResponse:
+    """Navigations are classified by status and the cf-mitigated header"""
+
+    def test_classification(self):
+        assert classify_challenge_response(403, {'cf-mitigated': 'challenge'}) is True
+        assert classify_challenge_response(200, {}) is False
+        assert classify_challenge_response(503, {'server': 'cloudflare'}) is None
+        assert classify_challenge_response(404, {}) is False
+
+
+@pytest.mark.asyncio
+class TestChallengeMonitor:
+    """The current document's classification follows the main-frame navigations"""
+
+    async def test_follows_navigations(self):
+        page = FakePage()
+        monitor = watch_challenges(page)
+        assert watch_challenges(page) is monitor
+        assert get_challenge_state(page) is None
+
+        page.navigate(403, {'cf-mitigated': 'challenge'})
+        assert get_challenge_state(page) is True
+
+        # subframes and redirects don't change the classification
+        page.navigate(200, frame=FakeFrame())
+        page.navigate(302)
+        assert get_challenge_state(page) is None
+
+        page.navigate(200)
+        assert get_challenge_state(page) is False
+
+    async def test_wait_classified(self):
+        page = FakePage()
+        monitor = watch_challenges(page)
+
+        asyncio.get_running_loop().call_later(0.05, page.navigate, 403, {'cf-mitigated': 'challenge'})
+
+        assert await monitor.wait_classified(timeout=2) is True
+        # already classified - returns immediately
+        assert await monitor.wait_classified(timeout=0.01) is True
+
+    async def test_unmonitored_page(self):
+        assert get_challenge_state(FakePage()) is None
@@ -0,0 +1,160 @@
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from twocaptcha import AsyncTwoCaptcha
+
+from playwright_captcha import ClickSolver, TwoCaptchaSolver, FrameworkType
+from playwright_captcha.solvers.base_solver import BaseSolver
+from playwright_captcha.clearance import MemoryClearanceStore, SqliteClearanceStore, extract_clearance
+from playwright_captcha.types import ClearanceKey, Clearance
+
+KEY = ClearanceKey(domain='example.com', user_agent='Mozilla/5.0 Test', proxy='http://proxy:8080')
+
+CLEARANCE_COOKIE = {'name': 'cf_clearance', 'value': 'abc', 'domain': '.example.com', 'path': '/',
+                    'expires': time.time() + 3600, 'httpOnly': True, 'secure': True, 'sameSite': 'None'}
+
+
+def _store_in_other_process(path: str) -> None:
+    asyncio.run(SqliteClearanceStore(path).set(KEY, Clearance(cookies=[CLEARANCE_COOKIE],
+                                                              expires_at=time.time() + 60)))
+
+
+class FakeContext:
+    def __init__(self, cookies=None):
+        self._cookies = list(cookies or [])
+
+    async def cookies(self, url=None):
+        return list(self._cookies)
+
+    async def add_cookies(self, cookies):
+        self._cookies.extend(cookies)
+
+
+class FakePage:
+    def __init__(self, context, url='https://example.com/protected'):
+        self.context = context
+        self.url = url
+        self.visited = []
+        self.listeners = {}
+
+    async def evaluate(self, expression, arg=None):
+        assert expression == 'navigator.userAgent'
+        return KEY.user_agent
+
+    async def goto(self, url):
+        self.visited.append(url)
+
+    def on(self, event, listener):
+        self.listeners.setdefault(event, []).append(listener)
+
+    def remove_listener(self, event, listener):
+        self.listeners[event].remove(listener)
+
+
+@pytest.mark.asyncio
+class TestClearanceStores:
+    """Clearances are keyed by domain, user agent and proxy and expire"""
+
+    async def test_memory_store_expiry(self):
+        store = MemoryClearanceStore()
+        await store.set(KEY, Clearance(cookies=[CLEARANCE_COOKIE], expires_at=time.time() + 60))
+        await store.set(ClearanceKey('other.com', KEY.user_agent), Clearance(cookies=[], expires_at=time.time() - 1))
+
+        assert (await store.get(KEY)).cookies == [CLEARANCE_COOKIE]
+        assert await store.get(ClearanceKey(KEY.domain, KEY.user_agent)) is None  # different proxy
+        assert await store.get(ClearanceKey('other.com', KEY.user_agent)) is None
+
+        await store.delete(KEY)
+        assert await store.get(KEY) is None
+
+    async def test_sqlite_store_shared_across_processes(self, tmp_path):
+        path = str(tmp_path / 'clearances.sqlite')
+
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            await asyncio.get_running_loop().run_in_executor(executor, _store_in_other_process, path)
+
+        store = SqliteClearanceStore(path)
+        assert (await store.get(KEY)).cookies == [CLEARANCE_COOKIE]
+
+        await store.set(ClearanceKey('old.com', KEY.user_agent), Clearance(cookies=[], expires_at=time.time() - 1))
+        assert await store.get(ClearanceKey('old.com', KEY.user_agent)) is None
+
+        await store.delete(KEY)
+        assert await store.get(KEY) is None
+
+    async def test_extract_clearance_expiry(self):
+        context = FakeContext([CLEARANCE_COOKIE, {'name': '__cf_bm', 'value': 'x', 'expires': -1}])
+
+        clearance = await extract_clearance(context, 'https://example.com/', ttl=60)
+
+        assert clearance.cookies == [CLEARANCE_COOKIE]
+        assert clearance.expires_at <= time.time() + 60
+        assert await extract_clearance(FakeContext(), 'https://example.com/') is None
+
+
+@pytest.mark.asyncio
+class TestSolverClearance:
+    """Solvers reuse the clearances stored by other contexts"""
+
+    async def test_store_and_restore(self):
+        store = MemoryClearanceStore()
+
+        solved_page = FakePage(FakeContext([CLEARANCE_COOKIE]))
+        solver = ClickSolver(FrameworkType.PLAYWRIGHT, solved_page, clearance_store=store, proxy=KEY.proxy)
+        assert await solver.store_clearance()
+
+        new_page = FakePage(FakeContext(), url='about:blank')
+        solver = ClickSolver(FrameworkType.PLAYWRIGHT, new_page, clearance_store=store, proxy=KEY.proxy)
+        assert await solver.restore_clearance('https://example.com/other')
+        assert await new_page.context.cookies() == [CLEARANCE_COOKIE]
+
+        # another proxy (IP) can't use it
+        solver = ClickSolver(FrameworkType.PLAYWRIGHT, FakePage(FakeContext()), clearance_store=store)
+        assert not await solver.restore_clearance()
+
+    async def test_no_clearance_wait_without_store(self, monkeypatch):
+        async def solve_with_retries(self, captcha_container, captcha_type, solver_data, **kwargs):
+            return 'token'
+
+        monkeypatch.setattr(BaseSolver, '_solve_captcha_with_retries', solve_with_retries)
+
+        page = FakePage(FakeContext())
+        solver = TwoCaptchaSolver(FrameworkType.PLAYWRIGHT, page, AsyncTwoCaptcha('key'))
+
+        started = time.monotonic()
+        assert await solver._solve_interstitial(page, {}) == ('token', None)
+        assert time.monotonic() - started < 1
+        assert not page.listeners
+
+    async def test_api_solver_stores_clearance_arriving_after_solve(self, monkeypatch):
+        store = MemoryClearanceStore()
+        page = FakePage(FakeContext())
+
+        class ClearanceResponse:
+            async def header_value(self, name):
+                return 'cf_clearance=abc; Path=/; HttpOnly' if name == 'set-cookie' else None
+
+        async def deliver_clearance():
+            # the page submits the token and gets the cookie with the next response
+            await asyncio.sleep(0.05)
+            await page.context.add_cookies([CLEARANCE_COOKIE])
+            for listener in list(page.listeners.get('response', [])):
+                listener(ClearanceResponse())
+
+        async def solve_with_retries(self, captcha_container, captcha_type, solver_data, **kwargs):
+            asyncio.ensure_future(deliver_clearance())
+            return 'token'  # the API solvers return once the token is applied
+
+        monkeypatch.setattr(BaseSolver, '_solve_captcha_with_retries', solve_with_retries)
+
+        solver = TwoCaptchaSolver(FrameworkType.PLAYWRIGHT, page, AsyncTwoCaptcha('key'), clearance_store=store,
+                                  proxy=KEY.proxy)
+        result, clearance = await solver._solve_interstitial(page, {})
+
+        assert result == 'token'
+        assert clearance.cookies == [CLEARANCE_COOKIE]
+        assert (await store.get(KEY)).cookies == [CLEARANCE_COOKIE]
+
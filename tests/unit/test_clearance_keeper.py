@@ -0,0 +1,158 @@
+import asyncio
+import time
+
+import pytest
+
+from playwright_captcha.clearance import ClearanceKeeper, MemoryClearanceStore
+from playwright_captcha.types import CaptchaType, ClearanceKey
+
+USER_AGENT = 'Mozilla/5.0 Test'
+
+
+def clearance_cookie(domain, value, lifetime):
+    return {'name': 'cf_clearance', 'value': value, 'domain': f'.{domain}', 'path': '/',
+            'expires': time.time() + lifetime, 'httpOnly': True, 'secure': True, 'sameSite': 'None'}
+
+
+class FakeContext:
+    def __init__(self):
+        self.cookie_jar = []
+
+    async def cookies(self, url=None):
+        return [cookie for cookie in self.cookie_jar if url is None or cookie['domain'].lstrip('.') in url]
+
+    async def add_cookies(self, cookies):
+        for cookie in cookies:
+            self.cookie_jar = [existing for existing in self.cookie_jar
+                               if (existing['name'], existing['domain']) != (cookie['name'], cookie['domain'])]
+            self.cookie_jar.append(cookie)
+
+    async def clear_cookies(self, name=None, domain=None):
+        self.cookie_jar = [cookie for cookie in self.cookie_jar
+                           if not (cookie['name'] == name and cookie['domain'] == domain)]
+
+    async def new_page(self):
+        return FakePage(self)
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+        self.url = 'about:blank'
+        self.closed = False
+
+    async def goto(self, url):
+        self.url = url
+
+    async def evaluate(self, expression, arg=None):
+        return USER_AGENT
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeSolver:
+    """Solves the interstitial by setting a new short-lived clearance cookie"""
+
+    lifetime = 60
+    solves = []
+    running = 0
+    max_running = 0
+
+    def __init__(self, page):
+        self.page = page
+        self.prepared = False
+
+    async def prepare(self):
+        self.prepared = True
+
+    async def cleanup(self):
+        pass
+
+    async def solve_captcha(self, captcha_container, captcha_type):
+        assert self.prepared and captcha_type == CaptchaType.CLOUDFLARE_INTERSTITIAL
+        # the previous clearance was dropped, so the page is challenged
+        assert not await self.page.context.cookies(self.page.url)
+
+        FakeSolver.running += 1
+        FakeSolver.max_running = max(FakeSolver.max_running, FakeSolver.running)
+        await asyncio.sleep(0.02)
+        FakeSolver.running -= 1
+
+        domain = self.page.url.split('/')[2]
+        FakeSolver.solves.append(domain)
+        await self.page.context.add_cookies([clearance_cookie(domain, str(len(FakeSolver.solves)), self.lifetime)])
+        return True
+
+
+@pytest.fixture(autouse=True)
+def reset_fake_solver():
+    FakeSolver.solves, FakeSolver.running, FakeSolver.max_running = [], 0, 0
+
+
+@pytest.mark.asyncio
+class TestClearanceKeeper:
+    """Clearances of hot domains are refreshed in a warm page and pushed into the active contexts"""
+
+    async def test_refresh_pushes_into_contexts(self):
+        store = MemoryClearanceStore()
+        keeper = ClearanceKeeper(FakeContext(), FakeSolver, clearance_store=store)
+        active = FakeContext()
+        keeper.add_context(active)
+
+        clearance = await keeper.refresh('https://example.com/')
+
+        assert await active.cookies() == clearance.cookies
+        assert keeper.get_clearance('https://example.com/other') is clearance
+        assert (await store.get(ClearanceKey('example.com', USER_AGENT))).cookies == clearance.cookies
+
+        # a context added later gets the current clearance too
+        late = FakeContext()
+        keeper.add_context(late)
+        await asyncio.sleep(0)
+        assert await late.cookies() == clearance.cookies
+
+        # the next refresh reuses the warm page and replaces the cookie
+        await keeper.refresh('https://example.com/')
+        assert [cookie['value'] for cookie in await active.cookies()] == ['2']
+        assert len(keeper._warm_pages) == 1
+
+        await keeper.stop()
+        assert not keeper._warm_pages
+
+    async def test_warm_context_is_not_an_active_context(self):
+        keeper = ClearanceKeeper(FakeContext(), FakeSolver)
+
+        with pytest.raises(ValueError):
+            keeper.add_context(keeper.context)
+
+    async def test_stop_cancels_pending_pushes(self):
+        keeper = ClearanceKeeper(FakeContext(), FakeSolver)
+        await keeper.refresh('https://example.com/')
+
+        keeper.add_context(FakeContext())
+        assert keeper._push_tasks
+
+        await keeper.stop()
+        assert not keeper._push_tasks
+
+    async def test_refreshes_before_expiry_with_bounded_concurrency(self):
+        FakeSolver.lifetime = 0.3
+        try:
+            keeper = ClearanceKeeper(FakeContext(), FakeSolver, refresh_before=0.2, retry_delay=0.01,
+                                     max_concurrency=2)
+            for index in range(4):
+                keeper.add_domain(f'https://site{index}.com/')
+
+            async with keeper:
+                await asyncio.sleep(0.3)
+        finally:
+            FakeSolver.lifetime = 60
+
+        # every domain was refreshed again before its 0.3s clearance expired
+        for index in range(4):
+            assert FakeSolver.solves.count(f'site{index}.com') >= 2
+        assert FakeSolver.max_running == 2
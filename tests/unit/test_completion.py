@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+
+from playwright_captcha.solvers.click.cloudflare.utils import completion
+from playwright_captcha.solvers.click.cloudflare.utils.completion import wait_for_challenge_completion, \
+    SIGNAL_CLEARANCE_COOKIE, SIGNAL_NAVIGATION, SIGNAL_TURNSTILE_RESPONSE
+from playwright_captcha.types import FrameworkType
+
+
+class FakeResponse:
+    def __init__(self, set_cookie=None):
+        self.set_cookie = set_cookie
+
+    async def header_value(self, name):
+        return self.set_cookie if name == 'set-cookie' else None
+
+
+class FakePage:
+    def __init__(self, token_after: float = None):
+        self.listeners = {}
+        self.challenge_present = True
+        self.token_after = token_after
+
+    def on(self, event, callback):
+        self.listeners.setdefault(event, []).append(callback)
+
+    def remove_listener(self, event, callback):
+        self.listeners[event].remove(callback)
+
+    def emit(self, event, arg):
+        for callback in list(self.listeners.get(event, [])):
+            callback(arg)
+
+    async def wait_for_function(self, expression, polling=None, timeout=None):
+        if self.token_after is None or self.token_after * 1000 > timeout:
+            await asyncio.sleep(timeout / 1000)
+            raise TimeoutError('no token')
+        await asyncio.sleep(self.token_after)
+
+
+@pytest.fixture(autouse=True)
+def fake_detection(monkeypatch):
+    async def detect_cloudflare_challenge(page, challenge_type='turnstile'):
+        return page.challenge_present
+
+    monkeypatch.setattr(completion, 'detect_cloudflare_challenge', detect_cloudflare_challenge)
+
+
+async def _wait(page, challenge_type, timeout=2):
+    return await wait_for_challenge_completion(FrameworkType.PLAYWRIGHT, page, page, None, challenge_type, timeout)
+
+
+@pytest.mark.asyncio
+class TestChallengeCompletion:
+    """The first definitive completion signal wins"""
+
+    async def test_clearance_cookie(self):
+        page = FakePage()
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.02, page.emit, 'response', FakeResponse('__cf_bm=1; path=/'))
+        loop.call_later(0.05, page.emit, 'response', FakeResponse('cf_clearance=abc; path=/; HttpOnly'))
+
+        assert await _wait(page, 'interstitial') == SIGNAL_CLEARANCE_COOKIE
+        assert all(not callbacks for callbacks in page.listeners.values())
+
+    async def test_navigation_away_from_challenge(self):
+        page = FakePage()
+        loop = asyncio.get_running_loop()
+
+        # the challenge is served again first, then the target page
+        loop.call_later(0.02, page.emit, 'domcontentloaded', page)
+
+        def load_target_page():
+            page.challenge_present = False
+            page.emit('domcontentloaded', page)
+
+        loop.call_later(0.1, load_target_page)
+
+        start = loop.time()
+        assert await _wait(page, 'interstitial') == SIGNAL_NAVIGATION
+        assert loop.time() - start >= 0.1
+
+    async def test_turnstile_response(self):
+        page = FakePage(token_after=0.05)
+
+        assert await _wait(page, 'turnstile') == SIGNAL_TURNSTILE_RESPONSE
+
+    async def test_no_signal(self):
+        page = FakePage()
+
+        assert await _wait(page, 'turnstile', timeout=0.1) is None
+        assert all(not callbacks for callbacks in page.listeners.values())
+
+    async def test_timeout_starts_when_armed(self):
+        page = FakePage()
+        armed = asyncio.Event()
+        loop = asyncio.get_running_loop()
+
+        # e.g. slow click retries, then Cloudflare needs most of the timeout after the click
+        loop.call_later(0.15, armed.set)
+        loop.call_later(0.2, page.emit, 'response', FakeResponse('cf_clearance=abc; path=/; HttpOnly'))
+
+        assert await wait_for_challenge_completion(FrameworkType.PLAYWRIGHT, page, page, None, 'interstitial',
+                                                   timeout=0.1, armed=armed) == SIGNAL_CLEARANCE_COOKIE
+
+    async def test_signal_before_armed(self):
+        page = FakePage()
+        armed = asyncio.Event()
+        asyncio.get_running_loop().call_later(0.02, page.emit, 'response', FakeResponse('cf_clearance=abc'))
+
+        assert await wait_for_challenge_completion(FrameworkType.PLAYWRIGHT, page, page, None, 'interstitial',
+                                                   timeout=0.1, armed=armed) == SIGNAL_CLEARANCE_COOKIE
@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from playwright_captcha.solvers.click.common.frames import wait_for_frames_by_url, match_frames_by_url
+
+CHALLENGE_URL = 'https://challenges.cloudflare.com/cdn-cgi/challenge-platform/h/b/turnstile/if/ov2/'
+CHALLENGE_FILTER = 'challenges.cloudflare.com/cdn-cgi/challenge-platform/'
+
+
+class FakeFrame:
+    def __init__(self, page, url='about:blank', parent_frame=None):
+        self.page = page
+        self.url = url
+        self.parent_frame = parent_frame
+        self.child_frames = []
+
+    def is_detached(self):
+        return False
+
+
+class FakePage:
+    def __init__(self):
+        self.listeners = {}
+        self.main_frame = FakeFrame(self, 'https://example.com/')
+        self.frames = [self.main_frame]
+
+    def on(self, event, callback):
+        self.listeners.setdefault(event, []).append(callback)
+
+    def remove_listener(self, event, callback):
+        self.listeners[event].remove(callback)
+
+    def emit(self, event, frame):
+        for callback in list(self.listeners.get(event, [])):
+            callback(frame)
+
+    def attach(self, url, parent_frame=None):
+        frame = FakeFrame(self, 'about:blank', parent_frame or self.main_frame)
+        self.frames.append(frame)
+        self.emit('frameattached', frame)
+        frame.url = url
+        self.emit('framenavigated', frame)
+        return frame
+
+
+@pytest.mark.asyncio
+class TestFramesByUrl:
+    """Challenge frames are found in the frame tree and awaited by events"""
+
+    async def test_existing_frame_without_waiting(self):
+        page = FakePage()
+        frame = page.attach(CHALLENGE_URL)
+
+        assert await wait_for_frames_by_url(page, CHALLENGE_FILTER) == [frame]
+        assert not page.listeners
+
+    async def test_waits_for_frame_navigation(self):
+        page = FakePage()
+        asyncio.get_running_loop().call_later(0.05, page.attach, CHALLENGE_URL)
+
+        frames = await wait_for_frames_by_url(page, CHALLENGE_FILTER, timeout=5)
+
+        assert [frame.url for frame in frames] == [CHALLENGE_URL]
+        assert all(not callbacks for callbacks in page.listeners.values())
+
+    async def test_timeout_without_frames(self):
+        page = FakePage()
+        page.attach('https://example.com/ads')
+
+        assert await wait_for_frames_by_url(page, CHALLENGE_FILTER, timeout=0.05) == []
+
+    async def test_frame_scope(self):
+        page = FakePage()
+        widget_host = page.attach('https://example.com/widget')
+        nested = page.attach(CHALLENGE_URL, parent_frame=widget_host)
+        page.attach(CHALLENGE_URL)
+
+        assert match_frames_by_url(widget_host, CHALLENGE_FILTER) == [nested]
+        assert len(match_frames_by_url(page, CHALLENGE_FILTER)) == 2
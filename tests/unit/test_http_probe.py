@@ -0,0 +1,106 @@
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+from playwright_captcha.captchas.http_probe import probe_url, probe_urls
+from playwright_captcha.types import CaptchaType
+
+PAGES = {
+    '/plain': (200, {}, '<html><head><script src="/cdn-cgi/challenge-platform/scripts/jsd/main.js"></script>'
+                        '</head><body>content</body></html>'),
+    '/interstitial': (403, {'cf-mitigated': 'challenge'},
+                      '<html><script>window._cf_chl_opt = {cType: "managed"};</script></html>'),
+    '/turnstile': (200, {}, '<script src="https://challenges.cloudflare.com/turnstile/v0/api.js" async></script>'
+                            '<div class="cf-turnstile" data-sitekey="0x4AAAAAAAturnstile"></div>'),
+    '/recaptcha-v2': (200, {}, '<div class="g-recaptcha" data-sitekey="6LeIxAcTAAAAAJcZVRqyHh71UMIEGNQ_MXjiZKhI"></div>'),
+    '/recaptcha-v3': (200, {}, '<script src="https://www.google.com/recaptcha/api.js?render='
+                               '6LfB5_IbAAAAAMCtsjEHEHKqcB9iQocwwxTiihJu"></script>'),
+    '/error': (503, {}, 'Service Unavailable'),
+}
+
+
+class ProbeHandler(BaseHTTPRequestHandler):
+    active = 0
+    max_active = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with ProbeHandler.lock:
+            ProbeHandler.active += 1
+            ProbeHandler.max_active = max(ProbeHandler.max_active, ProbeHandler.active)
+        try:
+            if self.path.startswith('/slow'):
+                time.sleep(0.1)
+                status, headers, body = PAGES['/plain']
+            else:
+                status, headers, body = PAGES[self.path]
+
+            self.send_response(status)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body.encode())
+        finally:
+            with ProbeHandler.lock:
+                ProbeHandler.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope='module')
+def server_url():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ProbeHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.asyncio
+class TestHttpProbe:
+    """URLs are classified without a browser against a local HTTP server"""
+
+    async def test_plain_page(self, server_url):
+        result = await probe_url(f'{server_url}/plain')
+
+        assert result.status == 200
+        assert result.challenged is False
+        assert result.captcha_types == []
+        assert not result.needs_browser
+
+    async def test_interstitial(self, server_url):
+        result = await probe_url(f'{server_url}/interstitial')
+
+        assert result.challenged is True
+        assert result.captcha_types == [CaptchaType.CLOUDFLARE_INTERSTITIAL]
+        assert result.needs_browser
+
+    async def test_widgets(self, server_url):
+        turnstile, recaptcha_v2, recaptcha_v3 = await probe_urls(
+            [f'{server_url}/turnstile', f'{server_url}/recaptcha-v2', f'{server_url}/recaptcha-v3'])
+
+        assert turnstile.captcha_types == [CaptchaType.CLOUDFLARE_TURNSTILE]
+        assert turnstile.site_keys == ['0x4AAAAAAAturnstile']
+        assert recaptcha_v2.captcha_types == [CaptchaType.RECAPTCHA_V2]
+        assert recaptcha_v3.captcha_types == [CaptchaType.RECAPTCHA_V3]
+        assert recaptcha_v3.site_keys == ['6LfB5_IbAAAAAMCtsjEHEHKqcB9iQocwwxTiihJu']
+
+    async def test_unknown_and_failed(self, server_url):
+        unknown, failed = await probe_urls([f'{server_url}/error', 'http://127.0.0.1:9/'])
+
+        # a 503 without cf-mitigated can't be told apart from an older challenge page
+        assert unknown.challenged is None and unknown.needs_browser
+        assert failed.error and failed.needs_browser
+
+    async def test_concurrency_limit(self, server_url):
+        ProbeHandler.max_active = 0
+
+        results = await probe_urls([f'{server_url}/slow/{i}' for i in range(8)], concurrency=2)
+
+        assert [result.url for result in results] == [f'{server_url}/slow/{i}' for i in range(8)]
+        assert ProbeHandler.max_active <= 2
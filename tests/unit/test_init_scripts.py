@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from playwright_captcha.utils.init_scripts import add_init_script_once, is_init_script_registered
+
+
+class FakeContext:
+    def __init__(self, failures=0):
+        self.scripts = []
+        self.failures = failures
+
+    async def add_init_script(self, script):
+        await asyncio.sleep(0.01)
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError('Target closed')
+        self.scripts.append(script)
+
+
+class FakePage(FakeContext):
+    def __init__(self, context):
+        super().__init__()
+        self.context = context
+
+
+@pytest.mark.asyncio
+class TestAddInitScriptOnce:
+    """Init scripts are registered once per context/page, regardless of the number of solvers"""
+
+    async def test_registered_once_per_context(self):
+        context = FakeContext()
+        pages = [FakePage(context) for _ in range(5)]
+
+        for page in pages:
+            await add_init_script_once(page, 'patch.js', 'console.log(1)')
+
+        assert context.scripts == ['console.log(1)']
+        assert all(not page.scripts for page in pages)
+        assert all(is_init_script_registered(page, 'patch.js') for page in pages)
+
+    async def test_concurrent_solvers_on_same_page(self):
+        context = FakeContext()
+        page = FakePage(context)
+
+        async def add():
+            result = await add_init_script_once(page, 'patch.js', 'x', context_level=False)
+            # no one goes on before the script is installed
+            assert page.scripts == ['x']
+            return result
+
+        results = await asyncio.gather(*(add() for _ in range(3)))
+
+        assert results.count(True) == 1
+        assert page.scripts == ['x']
+        assert not context.scripts
+
+    async def test_retried_after_failure(self):
+        context = FakeContext(failures=1)
+        pages = [FakePage(context) for _ in range(2)]
+
+        results = await asyncio.gather(*(add_init_script_once(page, 'patch.js', 'x') for page in pages),
+                                       return_exceptions=True)
+
+        assert isinstance(results[0], RuntimeError)
+        assert results[1] is True
+        assert context.scripts == ['x']
+        assert await add_init_script_once(pages[0], 'patch.js', 'x') is False
+
+    async def test_page_level_does_not_leak_to_other_pages(self):
+        context = FakeContext()
+        page, other_page = FakePage(context), FakePage(context)
+
+        await add_init_script_once(page, 'patch.js', 'x', context_level=False)
+
+        assert not is_init_script_registered(other_page, 'patch.js')
@@ -0,0 +1,72 @@
+import asyncio
+import json
+
+import pytest
+
+from playwright_captcha.utils.intercepted_params import watch_intercepted_params, INTERCEPTED_PARAMS_PREFIX
+
+
+class FakeConsoleMessage:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeRequest:
+    def __init__(self, frame, navigation=True):
+        self.frame = frame
+        self._navigation = navigation
+
+    def is_navigation_request(self):
+        return self._navigation
+
+
+class FakePage:
+    def __init__(self):
+        self.main_frame = object()
+        self.handlers = {}
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    def emit(self, event, payload):
+        self.handlers[event](payload)
+
+
+PARAMS = {'sitekey': '0x4AAAA', 'pageurl': 'https://site.test/', 'action': 'managed'}
+
+
+@pytest.mark.asyncio
+class TestInterceptedParamsWatcher:
+    """Cloudflare params pushed via console events resolve waiters immediately"""
+
+    async def test_push_resolves_waiter_immediately(self):
+        page = FakePage()
+        watcher = watch_intercepted_params(page)
+
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.05, page.emit, 'console', FakeConsoleMessage(INTERCEPTED_PARAMS_PREFIX + json.dumps(PARAMS)))
+
+        start = loop.time()
+        params = await watcher.wait_params(timeout=5)
+
+        assert params == PARAMS
+        assert loop.time() - start < 1
+
+    async def test_unrelated_messages_and_timeout(self):
+        page = FakePage()
+        watcher = watch_intercepted_params(page)
+
+        page.emit('console', FakeConsoleMessage('hello'))
+
+        assert await watcher.wait_params(timeout=0.05) is None
+
+    async def test_new_document_forgets_params(self):
+        page = FakePage()
+        watcher = watch_intercepted_params(page)
+        page.emit('console', FakeConsoleMessage(INTERCEPTED_PARAMS_PREFIX + json.dumps(PARAMS)))
+
+        page.emit('request', FakeRequest(page.main_frame, navigation=False))
+        assert watcher.get_params() == PARAMS
+
+        page.emit('request', FakeRequest(page.main_frame))
+        assert watcher.get_params() is None
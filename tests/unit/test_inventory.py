@@ -0,0 +1,133 @@
+import re
+
+import pytest
+
+from playwright_captcha import CaptchaType
+from playwright_captcha.captchas.inventory import detect_captchas
+
+
+class FakeFrame:
+    def __init__(self, url, found=None):
+        self.url = url
+        self.found = found or []
+        self.probed_types = None
+
+    def is_detached(self):
+        return False
+
+    async def evaluate(self, script, indicators):
+        self.probed_types = list(indicators)
+        return [item for item in self.found if item['captchaType'] in indicators]
+
+    def locator(self, selector):
+        return FakeLocator(selector)
+
+
+def _matches(element, selector):
+    """Matches the simple selectors of the indicators: tag, #id, .class, [attr="v"], [attr*="v"] and :not([...])"""
+
+    tag = re.match(r'[\w-]*', selector).group()
+    if tag and element.get('tag') != tag:
+        return False
+
+    for negated, attribute, operator, value in re.findall(r'(:not\()?\[([\w-]+)(\*?=)"([^"]*)"\]\)?', selector):
+        actual = element.get(attribute)
+        matched = actual is not None and (value in actual if operator == '*=' else value == actual)
+        if matched == bool(negated):
+            return False
+
+    for kind, name in re.findall(r'([#.])([\w-]+)', re.sub(r'\[[^\]]*\]', '', selector)):
+        if kind == '#' and element.get('id') != name:
+            return False
+        if kind == '.' and name not in element.get('class', '').split():
+            return False
+
+    return True
+
+
+class FakeDomFrame(FakeFrame):
+    """Runs the probe's logic on a list of elements (dicts of the tag and attributes)"""
+
+    def __init__(self, url, elements):
+        super().__init__(url)
+        self.elements = elements
+
+    async def evaluate(self, script, indicators):
+        found = []
+        for captcha_type, selectors in indicators.items():
+            entries = [_item(CaptchaType(captcha_type), selector, index)
+                       for selector in selectors['containers']
+                       for index, _ in enumerate(e for e in self.elements if _matches(e, selector))]
+            if not entries and any(_matches(e, selector) for selector in selectors['indicators'] for e in self.elements):
+                entries.append(_item(CaptchaType(captcha_type)))
+            found.extend(entries)
+        return found
+
+
+class FakeLocator:
+    def __init__(self, selector, index=None):
+        self.selector, self.index = selector, index
+
+    def nth(self, index):
+        return FakeLocator(self.selector, index)
+
+
+class FakePage:
+    def __init__(self, frames):
+        self.frames = frames
+        self.main_frame = frames[0]
+
+
+def _item(captcha_type, selector=None, index=None, site_key=None):
+    return {'captchaType': captcha_type.value, 'selector': selector, 'index': index, 'siteKey': site_key,
+            'action': None}
+
+
+@pytest.mark.asyncio
+class TestDetectCaptchas:
+    """Captcha inventory built from one probe per frame"""
+
+    async def test_empty_page_is_falsy(self):
+        inventory = await detect_captchas(FakePage([FakeFrame('https://site.test/')]))
+
+        assert not inventory
+        assert inventory.types == []
+
+    async def test_inventory_collects_all_frames(self):
+        main_frame = FakeFrame('https://site.test/', [_item(CaptchaType.RECAPTCHA_V3, site_key='v3key')])
+        child_frame = FakeFrame('https://site.test/form', [
+            _item(CaptchaType.CLOUDFLARE_TURNSTILE, '.cf-turnstile', 0, '0xkey'),
+        ])
+        widget_frame = FakeFrame('https://challenges.cloudflare.com/cdn-cgi/challenge-platform/h/b/turnstile')
+
+        inventory = await detect_captchas(FakePage([main_frame, child_frame, widget_frame]))
+
+        assert inventory.types == [CaptchaType.CLOUDFLARE_TURNSTILE, CaptchaType.RECAPTCHA_V3]
+        turnstile = inventory.get(CaptchaType.CLOUDFLARE_TURNSTILE)[0]
+        assert turnstile.frame is child_frame
+        assert turnstile.site_key == '0xkey'
+        assert (turnstile.container.selector, turnstile.container.index) == ('.cf-turnstile', 0)
+        assert widget_frame.probed_types is None
+
+    async def test_interstitial_probed_in_main_frame_only(self):
+        main_frame, child_frame = FakeFrame('https://site.test/'), FakeFrame('https://site.test/child')
+
+        await detect_captchas(FakePage([main_frame, child_frame]))
+
+        assert CaptchaType.CLOUDFLARE_INTERSTITIAL.value in main_frame.probed_types
+        assert CaptchaType.CLOUDFLARE_INTERSTITIAL.value not in child_frame.probed_types
+
+    async def test_bot_management_script_is_not_interstitial(self):
+        bot_management = {'tag': 'script', 'src': '/cdn-cgi/challenge-platform/scripts/jsd/main.js'}
+        turnstile_page = FakeDomFrame('https://site.test/', [
+            bot_management,
+            {'tag': 'script', 'src': 'https://challenges.cloudflare.com/turnstile/v0/api.js'},
+            {'tag': 'div', 'class': 'cf-turnstile', 'data-sitekey': '0xkey'},
+        ])
+        challenge_page = FakeDomFrame('https://site.test/', [
+            bot_management,
+            {'tag': 'script', 'src': '/cdn-cgi/challenge-platform/h/g/orchestrate/chl_page/v1?ray=1'},
+        ])
+
+        assert (await detect_captchas(FakePage([turnstile_page]))).types == [CaptchaType.CLOUDFLARE_TURNSTILE]
+        assert (await detect_captchas(FakePage([challenge_page]))).types == [CaptchaType.CLOUDFLARE_INTERSTITIAL]
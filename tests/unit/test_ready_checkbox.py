@@ -0,0 +1,83 @@
+import asyncio
+import time
+
+import pytest
+
+from playwright_captcha.solvers.click.cloudflare.utils import dom_helpers
+from playwright_captcha.solvers.click.cloudflare.utils.dom_helpers import get_ready_checkbox
+from playwright_captcha.types import FrameworkType
+
+
+class FakeIframe:
+    def __init__(self, ready_after: float = None):
+        self.page = object()
+        self.ready_after = ready_after
+
+    def is_detached(self):
+        return False
+
+
+async def fake_wait_for_ready_element(framework, iframe, selector, timeout=10):
+    if iframe.ready_after is None or iframe.ready_after > timeout:
+        await asyncio.sleep(timeout)
+        return None
+    await asyncio.sleep(iframe.ready_after)
+    return f'checkbox in {id(iframe)}'
+
+
+async def no_selector_engine(page):
+    return False
+
+
+async def selector_engine(page):
+    return True
+
+
+class FakeLocator:
+    """Never becomes visible, a timeout of 0 waits forever like in Playwright"""
+
+    def __init__(self):
+        self.first = self
+        self.timeouts = []
+
+    async def wait_for(self, state, timeout):
+        self.timeouts.append(timeout)
+        await asyncio.sleep(timeout / 1000 if timeout else 3600)
+        raise TimeoutError('Timeout exceeded')
+
+
+@pytest.fixture(autouse=True)
+def fake_dom(monkeypatch):
+    monkeypatch.setattr(dom_helpers, 'wait_for_ready_element', fake_wait_for_ready_element)
+    monkeypatch.setattr(dom_helpers, 'is_deep_selector_engine_available', no_selector_engine)
+
+
+@pytest.mark.asyncio
+class TestGetReadyCheckbox:
+    """All iframes are probed concurrently under one deadline"""
+
+    async def test_first_visible_checkbox_wins(self):
+        iframes = [FakeIframe(), FakeIframe(), FakeIframe(ready_after=0.2)]
+
+        start = time.perf_counter()
+        iframe, checkbox = await get_ready_checkbox(FrameworkType.PLAYWRIGHT, iframes, timeout=10)
+
+        assert iframe is iframes[2]
+        assert time.perf_counter() - start < 1
+
+    async def test_single_deadline(self):
+        iframes = [FakeIframe(), FakeIframe(ready_after=5), FakeIframe()]
+
+        start = time.perf_counter()
+        assert await get_ready_checkbox(FrameworkType.PLAYWRIGHT, iframes, timeout=0.3) is None
+        assert time.perf_counter() - start < 1
+
+    async def test_expired_deadline_with_locators(self, monkeypatch):
+        locator = FakeLocator()
+        monkeypatch.setattr(dom_helpers, 'is_deep_selector_engine_available', selector_engine)
+        monkeypatch.setattr(dom_helpers, 'deep_locator', lambda iframe, selector: locator)
+
+        result = await asyncio.wait_for(get_ready_checkbox(FrameworkType.PLAYWRIGHT, [FakeIframe()], timeout=0), 1)
+
+        assert result is None
+        assert locator.timeouts[0] >= 1
@@ -0,0 +1,83 @@
+import pytest
+
+from playwright_captcha.solvers.click.common.selector_engine import register_deep_selector_engine, \
+    is_deep_selector_engine_available, deep_locator, DEEP_SELECTOR_ENGINE_NAME
+
+
+class FakeSelectors:
+    def __init__(self):
+        self.engines = {}
+
+    async def register(self, name, script=None):
+        if name in self.engines:
+            raise Exception(f'"{name}" selector engine has been already registered')
+        self.engines[name] = script
+
+
+class FakeLocator:
+    def __init__(self, selector, supported, error=None):
+        self.selector = selector
+        self.supported = supported
+        self.error = error
+
+    async def count(self):
+        if self.error:
+            raise self.error
+        if not self.supported:
+            raise Exception(f'Unknown engine "{DEEP_SELECTOR_ENGINE_NAME}"')
+        return 1
+
+
+class FakeContext:
+    pass
+
+
+class FakePage:
+    def __init__(self, context, supported):
+        self.context = context
+        self.supported = supported
+        self.probes = 0
+        self.errors = []
+
+    def locator(self, selector):
+        self.probes += 1
+        return FakeLocator(selector, self.supported, self.errors.pop(0) if self.errors else None)
+
+
+@pytest.mark.asyncio
+class TestDeepSelectorEngine:
+    """The shadow-piercing selector engine is registered once and probed once per context"""
+
+    async def test_register_is_idempotent(self):
+        selectors = FakeSelectors()
+
+        await register_deep_selector_engine(selectors)
+        await register_deep_selector_engine(selectors)
+
+        assert list(selectors.engines) == [DEEP_SELECTOR_ENGINE_NAME]
+        assert 'query' in selectors.engines[DEEP_SELECTOR_ENGINE_NAME]
+
+    async def test_availability_probed_once_per_context(self):
+        context = FakeContext()
+        pages = [FakePage(context, supported=True) for _ in range(3)]
+
+        assert all([await is_deep_selector_engine_available(page) for page in pages])
+        assert sum(page.probes for page in pages) == 1
+
+    async def test_unavailable_engine(self):
+        page = FakePage(FakeContext(), supported=False)
+
+        assert not await is_deep_selector_engine_available(page)
+
+    async def test_probe_error_is_not_cached(self):
+        page = FakePage(FakeContext(), supported=True)
+        page.errors.append(Exception('Execution context was destroyed, most likely because of a navigation'))
+
+        assert not await is_deep_selector_engine_available(page)
+        assert await is_deep_selector_engine_available(page)
+        assert page.probes == 2
+
+    async def test_deep_locator_selector(self):
+        page = FakePage(FakeContext(), supported=True)
+
+        assert deep_locator(page, 'input').selector == f'{DEEP_SELECTOR_ENGINE_NAME}=input'
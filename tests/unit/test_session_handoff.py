@@ -0,0 +1,130 @@
+import json
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+from playwright.async_api import async_playwright
+
+from playwright_captcha.clearance import SessionHandoff, is_challenge_response
+from playwright_captcha.types import BrowserSession
+
+USER_AGENT = 'Mozilla/5.0 Test'
+
+HEADERS = {'user-agent': USER_AGENT, 'accept-language': 'en-US,en;q=0.9', 'sec-ch-ua-platform': '"Linux"'}
+
+INTERSTITIAL_BODY = '<html><script>window._cf_chl_opt = {cType: "managed"};</script></html>'
+
+
+def session_with_clearance(value='valid'):
+    cookie = {'name': 'cf_clearance', 'value': value, 'domain': '127.0.0.1', 'path': '/', 'expires': -1,
+              'httpOnly': True, 'secure': False, 'sameSite': 'Lax'}
+    return BrowserSession(cookies=[cookie], user_agent=USER_AGENT, headers=dict(HEADERS))
+
+
+class ClearanceHandler(BaseHTTPRequestHandler):
+    """Serves the page only with a valid cf_clearance, the challenge otherwise"""
+
+    def do_GET(self):
+        cleared = 'cf_clearance=valid' in (self.headers.get('Cookie') or '')
+        if self.path == '/error':
+            status, headers, body = 503, {}, 'Service Unavailable'
+        elif not cleared and self.path == '/old-challenge':
+            status, headers, body = 403, {}, INTERSTITIAL_BODY  # no cf-mitigated header
+        elif not cleared:
+            status, headers, body = 403, {'cf-mitigated': 'challenge'}, INTERSTITIAL_BODY
+        else:
+            status, headers = 200, {'Content-Type': 'application/json'}
+            body = json.dumps({'user-agent': self.headers.get('User-Agent'),
+                               'accept-language': self.headers.get('Accept-Language')})
+
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope='module')
+def server_url():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ClearanceHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+
+
+class FakePage:
+    def __init__(self, session):
+        self.context = self
+        self._session = session
+
+    async def evaluate(self, expression, arg=None):
+        return self._session.headers
+
+    async def cookies(self, urls=None):
+        return self._session.cookies
+
+
+def test_is_challenge_response():
+    assert is_challenge_response(403, {'cf-mitigated': 'challenge'})
+    assert is_challenge_response(503, {}, INTERSTITIAL_BODY)
+    assert not is_challenge_response(503, {}, 'Service Unavailable')
+    assert not is_challenge_response(200, {}, INTERSTITIAL_BODY)
+
+
+@pytest.mark.asyncio
+class TestSessionHandoff:
+    """Solved sessions continue in HTTP clients until they get re-challenged"""
+
+    async def test_httpx_client(self, server_url):
+        handoff = SessionHandoff(session_with_clearance())
+
+        async with handoff.create_client() as client:
+            response = await client.get(f'{server_url}/data')
+            assert response.json() == {'user-agent': USER_AGENT, 'accept-language': 'en-US,en;q=0.9'}
+
+            await client.get(f'{server_url}/error')
+            assert not handoff.needs_resolve
+
+            # the clearance got revoked
+            client.cookies.clear()
+            await client.get(f'{server_url}/data')
+            await client.get(f'{server_url}/old-challenge')
+            assert handoff.challenged_urls == [f'{server_url}/data', f'{server_url}/old-challenge']
+
+            # after the re-solve the client gets the new cookies
+            await handoff.refresh(FakePage(session_with_clearance()))
+            assert not handoff.needs_resolve
+            assert (await client.get(f'{server_url}/data')).status_code == 200
+
+    async def test_httpx_client_options(self):
+        handoff = SessionHandoff(session_with_clearance())
+
+        async with handoff.create_client(follow_redirects=False, timeout=5) as client:
+            assert not client.follow_redirects
+        async with handoff.create_client() as client:
+            assert client.follow_redirects
+
+    async def test_api_request_context(self, server_url):
+        handoff = SessionHandoff(session_with_clearance())
+
+        async with async_playwright() as playwright:
+            request_context = await handoff.create_request_context(playwright.request)
+            try:
+                response = await request_context.get(f'{server_url}/data')
+                assert (await response.json())['user-agent'] == USER_AGENT
+                assert not await handoff.check_response(response)
+            finally:
+                await request_context.dispose()
+
+            request_context = await SessionHandoff(session_with_clearance('expired')).create_request_context(
+                playwright.request)
+            try:
+                response = await request_context.get(f'{server_url}/old-challenge')
+                assert await handoff.check_response(response)
+                assert handoff.needs_resolve
+            finally:
+                await request_context.dispose()
@@ -0,0 +1,178 @@
+import asyncio
+import time
+
+import pytest
+
+from playwright_captcha import ClickSolver, FrameworkType
+from playwright_captcha.clearance import SingleFlight
+from playwright_captcha.solvers.base_solver import BaseSolver
+from playwright_captcha.types import ClearanceKey
+from playwright_captcha.utils.exceptions import CaptchaSolvingCancelledError
+
+KEY = ClearanceKey(domain='example.com', user_agent='Mozilla/5.0 Test')
+
+CLEARANCE_COOKIE = {'name': 'cf_clearance', 'value': 'abc', 'domain': '.example.com', 'path': '/',
+                    'expires': time.time() + 3600, 'httpOnly': True, 'secure': True, 'sameSite': 'None'}
+
+
+class FakeContext:
+    def __init__(self):
+        self._cookies = []
+
+    async def cookies(self, url=None):
+        return list(self._cookies)
+
+    async def add_cookies(self, cookies):
+        self._cookies.extend(cookies)
+
+
+class FakePage:
+    def __init__(self):
+        self.context = FakeContext()
+        self.url = 'https://example.com/protected'
+        self.visited = []
+        self.listeners = {}
+
+    async def evaluate(self, expression, arg=None):
+        return KEY.user_agent
+
+    async def goto(self, url):
+        self.visited.append(url)
+
+    def on(self, event, listener):
+        self.listeners.setdefault(event, []).append(listener)
+
+    def remove_listener(self, event, listener):
+        self.listeners[event].remove(listener)
+
+
+@pytest.mark.asyncio
+class TestSingleFlight:
+    """Concurrent calls of the same key share one run"""
+
+    async def test_coalesces_concurrent_calls(self):
+        group = SingleFlight()
+        calls = []
+
+        async def solve():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return 'token'
+
+        results = await asyncio.gather(*(group.do(KEY, solve) for _ in range(20)))
+
+        assert len(calls) == 1
+        assert [result for result, _ in results] == ['token'] * 20
+        assert sum(leader for _, leader in results) == 1
+        assert not group.in_flight(KEY)
+
+        # the next call after the flight has landed runs again
+        await group.do(KEY, solve)
+        assert len(calls) == 2
+
+    async def test_error_and_timeout_release_followers(self):
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise RuntimeError('leader failed')
+
+        group = SingleFlight()
+        results = await asyncio.gather(group.do(KEY, fail), group.do(KEY, fail), return_exceptions=True)
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+        group = SingleFlight(timeout=0.05)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.gather(group.do(KEY, lambda: asyncio.sleep(10)), group.do(KEY, lambda: asyncio.sleep(10)))
+        assert not group.in_flight(KEY)
+
+    async def test_cancel_key(self):
+        group = SingleFlight()
+        other = ClearanceKey(domain='other.com', user_agent=KEY.user_agent)
+
+        stuck = [asyncio.ensure_future(group.do(KEY, lambda: asyncio.sleep(10))) for _ in range(3)]
+        running = asyncio.ensure_future(group.do(other, lambda: asyncio.sleep(0.05, 'done')))
+        await asyncio.sleep(0)
+
+        assert group.cancel(KEY)
+        assert not group.cancel(KEY)
+
+        for waiter in stuck:
+            with pytest.raises(CaptchaSolvingCancelledError):
+                await waiter
+        assert await running == ('done', True)  # other keys are not affected
+
+
+@pytest.mark.asyncio
+class TestSolverSingleFlight:
+    """Solvers of the same domain solve the interstitial once and share the clearance"""
+
+    async def test_followers_reuse_leader_clearance(self, monkeypatch):
+        solves = []
+
+        async def solve_with_retries(self, captcha_container, captcha_type, solver_data, **kwargs):
+            solves.append(self.page)
+            await asyncio.sleep(0.05)
+            await self.page.context.add_cookies([CLEARANCE_COOKIE])
+            return True
+
+        async def is_challenged(self):
+            return False
+
+        monkeypatch.setattr(BaseSolver, '_solve_captcha_with_retries', solve_with_retries)
+        monkeypatch.setattr(BaseSolver, '_is_interstitial_challenged', is_challenged)
+
+        group = SingleFlight()
+        pages = [FakePage() for _ in range(5)]
+        solvers = [ClickSolver(FrameworkType.PLAYWRIGHT, page, single_flight=group) for page in pages]
+
+        results = await asyncio.gather(*(solver._solve_interstitial_single_flight(solver.page, {})
+                                         for solver in solvers))
+
+        assert results == [True] * 5
+        assert len(solves) == 1
+        for page in pages:
+            assert await page.context.cookies() == [CLEARANCE_COOKIE]
+            # only the followers reload
+            assert page.visited == ([] if page is solves[0] else [page.url])
+
+    async def test_new_leader_after_cancel(self, monkeypatch):
+        solves = []
+
+        async def solve_with_retries(self, captcha_container, captcha_type, solver_data, **kwargs):
+            solves.append(self.page)
+            if len(solves) == 1:
+                await asyncio.sleep(10)  # stuck leader
+            await self.page.context.add_cookies([CLEARANCE_COOKIE])
+            return True
+
+        async def is_challenged(self):
+            return False
+
+        monkeypatch.setattr(BaseSolver, '_solve_captcha_with_retries', solve_with_retries)
+        monkeypatch.setattr(BaseSolver, '_is_interstitial_challenged', is_challenged)
+
+        group = SingleFlight()
+        pages = [FakePage() for _ in range(3)]
+        solvers = [ClickSolver(FrameworkType.PLAYWRIGHT, page, single_flight=group) for page in pages]
+
+        tasks = [asyncio.ensure_future(solver._solve_interstitial_single_flight(solver.page, {}))
+                 for solver in solvers]
+        await asyncio.sleep(0.01)
+        group.cancel(KEY)
+
+        assert await asyncio.gather(*tasks) == [True] * 3
+        # one new leader solved it for everyone
+        assert len(solves) == 2
+        for page in pages:
+            assert await page.context.cookies() == [CLEARANCE_COOKIE]
+
+    async def test_gives_up_after_max_attempts(self, monkeypatch):
+        async def solve_with_retries(self, captcha_container, captcha_type, solver_data, **kwargs):
+            await asyncio.sleep(10)
+
+        monkeypatch.setattr(BaseSolver, '_solve_captcha_with_retries', solve_with_retries)
+
+        group = SingleFlight(timeout=0.02)
+        solver = ClickSolver(FrameworkType.PLAYWRIGHT, FakePage(), max_attempts=2, single_flight=group)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await solver._solve_interstitial_single_flight(solver.page, {})
@@ -0,0 +1,87 @@
+import asyncio
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+from playwright_captcha.solvers.api.tencaptcha.tencaptcha.async_solver import AsyncTenCaptcha
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    """Fake 10captcha API, records the client connection of every request"""
+
+    protocol_version = 'HTTP/1.1'  # keep-alive
+    connections = set()
+
+    def _reply(self, body=b''):
+        ApiHandler.connections.add(self.client_address)
+        time.sleep(0.02)
+
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def do_HEAD(self):
+        self._reply()
+
+    def do_GET(self):
+        self._reply(b'\x89PNG' if self.path.endswith('.png') else b'OK|token')
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        self._reply(b'OK|123')
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope='module')
+def server_url():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ApiHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+
+
+@pytest.fixture(autouse=True)
+def reset_connections():
+    ApiHandler.connections = set()
+
+
+@pytest.mark.asyncio
+class TestPooledClient:
+    """All requests of a client instance share one keep-alive connection pool"""
+
+    async def test_requests_reuse_connections(self, server_url):
+        async with AsyncTenCaptcha('key', server=server_url, warmupConnections=0) as client:
+            for _ in range(5):
+                assert await client.send(method='userrecaptcha', googlekey='sitekey', pageurl='https://a.com') == '123'
+                assert await client.get_result('123') == 'token'
+            assert (await client.get_method(f'{server_url}/image.png'))['method'] == 'base64'
+
+        assert len(ApiHandler.connections) == 1
+        assert client.api_client.client.is_closed
+
+    async def test_connection_limit_and_warmup(self, server_url):
+        client = AsyncTenCaptcha('key', server=server_url, maxConnections=3, maxKeepaliveConnections=3,
+                                 warmupConnections=3)
+        try:
+            assert await client.warmup() == 3
+            assert len(ApiHandler.connections) == 3
+
+            await asyncio.gather(*(client.get_result(str(index)) for index in range(12)))
+
+            # the warm connections were reused and the limit was kept
+            assert len(ApiHandler.connections) == 3
+        finally:
+            await client.aclose()
+
+    async def test_warmup_capped_by_keepalive_connections(self, server_url):
+        async with AsyncTenCaptcha('key', server=server_url, maxKeepaliveConnections=2, keepaliveExpiry=60,
+                                   warmupConnections=5) as client:
+            assert await client.warmup() == 2
+            assert len(ApiHandler.connections) == 2
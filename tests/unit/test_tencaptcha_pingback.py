@@ -0,0 +1,165 @@
+import asyncio
+import itertools
+import socket
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from urllib.request import urlopen
+
+import pytest
+
+from playwright_captcha.solvers.api.tencaptcha.tencaptcha.async_solver import AsyncTenCaptcha
+from playwright_captcha.solvers.api.tencaptcha.tencaptcha.exceptions.solver import ApiException, ValidationException
+from playwright_captcha.solvers.api.tencaptcha.tencaptcha.pingback import PingbackReceiver
+from playwright_captcha.solvers.api.tencaptcha.tencaptcha.polling import PollingSchedule
+
+SOLVE_TIME = 0.1
+
+
+class ProviderHandler(BaseHTTPRequestHandler):
+    """
+    Fake provider: every captcha is solved SOLVE_TIME after its submit and the result is sent to the pingback URL,
+    except for the "silent" site key (its pingback is lost, only polling gets the result)
+    """
+
+    protocol_version = 'HTTP/1.1'
+    ids = itertools.count(1)
+    submitted = {}
+    polls = 0
+
+    def _reply(self, body):
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def do_POST(self):
+        params = parse_qs(self.rfile.read(int(self.headers['Content-Length'])).decode())
+        id_ = str(next(ProviderHandler.ids))
+        sitekey = params['googlekey'][0]
+        ProviderHandler.submitted[id_] = (time.monotonic(), sitekey)
+
+        code = 'ERROR_CAPTCHA_UNSOLVABLE' if sitekey == 'unsolvable' else f'token-{sitekey}'
+        if sitekey != 'silent':
+            pingback = f'{params["pingback"][0]}?id={id_}&code={code}'
+            threading.Timer(SOLVE_TIME, lambda: urlopen(pingback, data=b'').read()).start()
+
+        self._reply(f'OK|{id_}')
+
+    def do_GET(self):
+        ProviderHandler.polls += 1
+        results = []
+        for id_ in parse_qs(urlparse(self.path).query)['ids'][0].split(','):
+            submitted_at, sitekey = ProviderHandler.submitted[id_]
+            results.append('CAPCHA_NOT_READY' if time.monotonic() - submitted_at < SOLVE_TIME else f'token-{sitekey}')
+        self._reply('|'.join(results))
+
+    def log_message(self, *args):
+        pass
+
+
+class ProviderServer(ThreadingHTTPServer):
+    request_queue_size = 128  # all the concurrent submits connect at once
+
+
+@pytest.fixture(scope='module')
+def provider_url():
+    server = ProviderServer(('127.0.0.1', 0), ProviderHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+
+
+@pytest.fixture(autouse=True)
+def reset_polls():
+    ProviderHandler.polls = 0
+
+
+def local_receiver():
+    # the fake provider runs locally, so the loopback address is the public one
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    return PingbackReceiver(port=port, publicUrl=f'http://127.0.0.1:{port}')
+
+
+def create_client(provider_url, receiver, grace_period=5):
+    schedule = PollingSchedule(initial_delay=0.05, expected_time=0.2, interval=0.05, max_interval=0.1)
+    client = AsyncTenCaptcha('key', server=provider_url, warmupConnections=0, pingbackReceiver=receiver,
+                             pingbackGracePeriod=grace_period, pollingSchedules={'default': schedule})
+    client.result_poller.tick = 0.01
+    return client
+
+
+@pytest.mark.asyncio
+class TestPingback:
+    """Results are pushed to the embedded receiver, polling is only the fallback"""
+
+    async def test_pingback_resolves_without_polling(self, provider_url):
+        async with local_receiver() as receiver, create_client(provider_url, receiver) as client:
+            started = time.monotonic()
+            results = await asyncio.gather(*(client.recaptcha(sitekey=f'site{index}', url='https://a.com')
+                                             for index in range(10)))
+
+            assert [result['code'] for result in results] == [f'token-site{index}' for index in range(10)]
+            assert time.monotonic() - started < 1
+            assert ProviderHandler.polls == 0
+
+            with pytest.raises(ApiException):
+                await client.recaptcha(sitekey='unsolvable', url='https://a.com')
+
+    async def test_falls_back_to_polling_after_grace_period(self, provider_url):
+        async with local_receiver() as receiver, \
+                create_client(provider_url, receiver, grace_period=0.2) as client:
+            result = await client.recaptcha(sitekey='silent', url='https://a.com')
+
+            assert result['code'] == 'token-silent'
+            assert ProviderHandler.polls >= 1
+            assert not receiver._waiters
+
+    async def test_receiver_rejects_unknown_requests(self):
+        async with local_receiver() as receiver:
+            base_url = receiver.url.rsplit('/', 1)[0]
+
+            def request(url):
+                try:
+                    return urlopen(url, data=b'').status
+                except Exception as e:
+                    return e.code
+
+            assert await asyncio.to_thread(request, f'{base_url}/other?id=1&code=x') == 404
+            # wrong secret - nobody else can post answers
+            assert await asyncio.to_thread(request, f'{base_url}/guessed?id=8&code=fake') == 404
+            assert not receiver._early
+            assert await asyncio.to_thread(request, f'{receiver.url}?id=1') == 400
+
+            # a pingback arriving before its waiter is kept for it
+            assert await asyncio.to_thread(request, f'{receiver.url}?id=7&code=token') == 200
+            assert await receiver.expect('7') == 'token'
+
+    async def test_stalled_requests_time_out(self):
+        async with local_receiver() as receiver:
+            receiver.read_timeout = 0.1
+
+            # declares a body it never sends
+            reader, writer = await asyncio.open_connection('127.0.0.1', receiver.port)
+            writer.write(f'POST {receiver.callback_path} HTTP/1.1\r\nContent-Length: 10\r\n\r\n'.encode())
+            await writer.drain()
+
+            response = await asyncio.wait_for(reader.read(), 1)
+            assert response.startswith(b'HTTP/1.1 408')
+            writer.close()
+
+    async def test_unreachable_callback_url_is_rejected(self):
+        for host in ('127.0.0.1', '0.0.0.0', '::'):
+            receiver = PingbackReceiver(host=host)
+            with pytest.raises(ValidationException):
+                await receiver.start()
+            with pytest.raises(ValidationException):
+                receiver.url
+
+        receiver = PingbackReceiver(publicUrl='https://example.com/')
+        assert receiver.url == f'https://example.com/pingback/{receiver.secret}'
+
@@ -0,0 +1,101 @@
+import asyncio
+import itertools
+import time
+
+import pytest
+
+from playwright_captcha.solvers.api.tencaptcha.tencaptcha.async_solver import AsyncTenCaptcha
+from playwright_captcha.solvers.api.tencaptcha.tencaptcha.exceptions.solver import NetworkException, TimeoutException
+from playwright_captcha.solvers.api.tencaptcha.tencaptcha.polling import PollingSchedule
+
+
+class FakeTenCaptcha(AsyncTenCaptcha):
+    """Result is ready `solve_time` seconds after wait_result starts"""
+
+    def __init__(self, solve_time, **kwargs):
+        super().__init__('key', **kwargs)
+        self.solve_time = solve_time
+        self.polls = 0
+        self.ready_at = None
+
+    async def get_result(self, id_):
+        self.polls += 1
+        if time.monotonic() < self.ready_at:
+            raise NetworkException
+        return 'token'
+
+    async def wait_result(self, id_, timeout, polling_interval):
+        self.ready_at = time.monotonic() + self.solve_time
+        return await super().wait_result(id_, timeout, polling_interval)
+
+
+def test_schedule_by_captcha_type():
+    client = AsyncTenCaptcha('key')
+
+    schedule = client.get_polling_schedule({'method': 'userrecaptcha', 'version': 'v2'})
+    assert schedule is client.polling_schedules['recaptcha_v2']
+    assert client.get_polling_schedule({'method': 'userrecaptcha', 'version': 'v3'}) is \
+           client.polling_schedules['recaptcha_v3']
+    assert client.get_polling_schedule({'method': 'base64'}) is client.polling_schedules['default']
+
+    # waits, then tight intervals until the expected time, then backs off to pollingInterval
+    delays = list(itertools.islice(schedule.delays(), 16))
+    assert delays[:11] == [15] + [3] * 10
+    assert delays[11:] == [4.5, 6.75, 10, 10, 10]
+
+
+def test_schedule_adapts_to_observed_latencies():
+    schedule = PollingSchedule(initial_delay=15, expected_time=45, min_samples=10)
+    for latency in range(20, 30):
+        schedule.observe(latency)
+
+    delays = schedule.delays()
+    assert next(delays) == 20  # 10th percentile
+    assert schedule.percentile(90) == 28
+
+
+def test_schedule_keeps_polling_tightly_for_alike_latencies():
+    schedule = PollingSchedule(initial_delay=15, expected_time=45, interval=3, min_samples=10)
+    for _ in range(20):
+        schedule.observe_polls(12, 18)
+
+    assert list(itertools.islice(schedule.delays(), 4)) == [15, 3, 3, 3]
+
+
+@pytest.mark.asyncio
+class TestWaitResult:
+    """The adaptive schedule gets the token sooner with fewer polls than the fixed interval"""
+
+    async def test_adaptive_vs_fixed(self):
+        fixed = FakeTenCaptcha(solve_time=0.32)
+        started = time.monotonic()
+        assert await fixed.wait_result('1', timeout=5, polling_interval=0.1) == 'token'
+        fixed_latency = time.monotonic() - started
+
+        schedule = PollingSchedule(initial_delay=0.25, expected_time=0.45, interval=0.03, max_interval=0.2)
+        adaptive = FakeTenCaptcha(solve_time=0.32, pollingSchedules={'default': schedule})
+        started = time.monotonic()
+        assert await adaptive.wait_result('1', timeout=5, polling_interval=schedule) == 'token'
+        adaptive_latency = time.monotonic() - started
+
+        assert adaptive_latency < fixed_latency
+        assert adaptive.polls < fixed.polls
+        assert len(schedule.latencies) == 1
+
+    async def test_deadline(self):
+        client = FakeTenCaptcha(solve_time=10)
+        schedule = PollingSchedule(initial_delay=0.05, expected_time=0.1, interval=0.05, max_interval=1)
+
+        started = time.monotonic()
+        with pytest.raises(TimeoutException):
+            await client.wait_result('1', timeout=0.3, polling_interval=schedule)
+
+        assert 0.3 <= time.monotonic() - started < 0.5
+
+    async def test_lowers_initial_delay_for_early_results(self):
+        schedule = PollingSchedule(initial_delay=0.2, expected_time=0.4, interval=0.05, min_samples=3)
+        solver = FakeTenCaptcha(solve_time=0.01, pollingSchedules={'default': schedule})
+        for _ in range(5):
+            assert await solver.wait_result('1', timeout=5, polling_interval=schedule) == 'token'
+
+        assert next(schedule.delays()) < 0.1
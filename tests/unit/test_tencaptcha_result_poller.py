@@ -0,0 +1,143 @@
+import asyncio
+import itertools
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+
+from playwright_captcha.solvers.api.tencaptcha.tencaptcha.async_solver import AsyncTenCaptcha
+from playwright_captcha.solvers.api.tencaptcha.tencaptcha.exceptions.solver import ApiException, TimeoutException
+from playwright_captcha.solvers.api.tencaptcha.tencaptcha.exceptions import api as api_exceptions
+from playwright_captcha.solvers.api.tencaptcha.tencaptcha.polling import PollingSchedule
+from playwright_captcha.solvers.api.tencaptcha.tencaptcha.result_poller import ResultPoller
+
+SOLVE_TIME = 0.2
+
+
+class BulkApiHandler(BaseHTTPRequestHandler):
+    """Fake 10captcha API supporting bulk result requests, every captcha is solved SOLVE_TIME after its submit"""
+
+    protocol_version = 'HTTP/1.1'
+    ids = itertools.count(1)
+    submitted = {}
+    result_requests = []
+
+    def _reply(self, body):
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def do_POST(self):
+        params = parse_qs(self.rfile.read(int(self.headers['Content-Length'])).decode())
+        id_ = str(next(BulkApiHandler.ids))
+        BulkApiHandler.submitted[id_] = (time.monotonic(), params['googlekey'][0])
+        self._reply(f'OK|{id_}')
+
+    def do_GET(self):
+        ids = parse_qs(urlparse(self.path).query)['ids'][0].split(',')
+        BulkApiHandler.result_requests.append(ids)
+
+        results = []
+        for id_ in ids:
+            submitted_at, sitekey = BulkApiHandler.submitted[id_]
+            if sitekey == 'unsolvable':
+                results.append('ERROR_CAPTCHA_UNSOLVABLE')
+            elif time.monotonic() - submitted_at < SOLVE_TIME:
+                results.append('CAPCHA_NOT_READY')
+            else:
+                results.append(f'token-{sitekey}')
+        self._reply('|'.join(results))
+
+    def log_message(self, *args):
+        pass
+
+
+class BulkApiServer(ThreadingHTTPServer):
+    request_queue_size = 128  # all the concurrent submits connect at once
+
+
+@pytest.fixture(scope='module')
+def server_url():
+    server = BulkApiServer(('127.0.0.1', 0), BulkApiHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+
+
+@pytest.fixture(autouse=True)
+def reset_requests():
+    BulkApiHandler.result_requests = []
+
+
+def create_client(server_url):
+    schedule = PollingSchedule(initial_delay=0.1, expected_time=0.3, interval=0.05, max_interval=0.1)
+    client = AsyncTenCaptcha('key', server=server_url, warmupConnections=0,
+                             pollingSchedules={'default': schedule, 'recaptcha_v2': schedule})
+    client.result_poller.tick = 0.05
+    return client
+
+
+@pytest.mark.asyncio
+class TestResultPoller:
+    """In-flight captchas are polled together with bulk requests"""
+
+    async def test_requests_grow_with_ticks_not_concurrency(self, server_url):
+        async with create_client(server_url) as client:
+            results = await asyncio.gather(*(client.recaptcha(sitekey=f'site{index}', url='https://a.com')
+                                             for index in range(50)))
+
+        assert [result['code'] for result in results] == [f'token-site{index}' for index in range(50)]
+
+        # 50 solves polled one by one would take ~150 requests
+        assert len(BulkApiHandler.result_requests) <= 10
+        assert max(len(ids) for ids in BulkApiHandler.result_requests) >= 20
+
+    async def test_errors_and_timeouts_are_per_id(self, server_url):
+        async with create_client(server_url) as client:
+            solved, unsolvable, timed_out = await asyncio.gather(
+                client.recaptcha(sitekey='ok', url='https://a.com'),
+                client.recaptcha(sitekey='unsolvable', url='https://a.com'),
+                client.solve(timeout=0.05, method='userrecaptcha', googlekey='slow', pageurl='https://a.com'),
+                return_exceptions=True
+            )
+
+            assert solved['code'] == 'token-ok'
+            assert isinstance(unsolvable, ApiException)
+            assert isinstance(timed_out, TimeoutException)
+            assert not client.result_poller._pending
+
+
+class FlakyApiClient:
+    """res_batch fails once with a network error, then answers with a response that can't be split by ID"""
+
+    def __init__(self):
+        self.batch_requests = 0
+        self.single_requests = []
+
+    async def res_batch(self, ids, **kwargs):
+        self.batch_requests += 1
+        if self.batch_requests == 1:
+            raise api_exceptions.NetworkException('bad response: 502')
+        return None
+
+    async def res(self, **kwargs):
+        self.single_requests.append(kwargs['id'])
+        return f'OK|token|{kwargs["id"]}'
+
+
+@pytest.mark.asyncio
+async def test_transient_errors_are_retried():
+    client = FlakyApiClient()
+    poller = ResultPoller(client, 'key', tick=0.01)
+    schedule = PollingSchedule(initial_delay=0.01, expected_time=0.1, interval=0.02, max_interval=0.05)
+
+    results = await asyncio.gather(*(poller.wait(str(index), 5, schedule) for index in range(3)))
+
+    # the failed bulk request is retried, the unsplittable response is fetched per ID
+    assert results == ['token|0', 'token|1', 'token|2']
+    assert client.batch_requests == 2
+    assert sorted(client.single_requests) == ['0', '1', '2']